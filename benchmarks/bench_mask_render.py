@@ -0,0 +1,86 @@
+"""Per-frame render time of a reference mask scene before and after Mask Render Mode.
+
+The "before" state is what mask scenes often end up with: Cycles at 128
+samples with denoising. The scene is a grid of randomly colored emission
+tiles drifting over the frame range.
+
+    blender -b --factory-startup -P benchmarks/bench_mask_render.py -- [--frames 5] [--tiles 2500] [--resolution 1024] [--json out.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+from common import Timer, print_table, reset_scene, script_args
+
+
+def build_reference_scene(tiles, resolution):
+    scene = reset_scene()
+    side = max(1, int(tiles ** 0.5))
+    bpy.ops.mesh.primitive_plane_add(size=side)
+    scene.random_duplicate_props.split_mode = 'OBJECTS'
+    bpy.ops.object.mode_set(mode='EDIT')
+    bpy.ops.mesh.subdivide(number_cuts=side - 1)
+    bpy.ops.object.mode_set(mode='OBJECT')
+    bpy.ops.object.split_faces()
+    bpy.ops.object.add_random_material_with_emission()
+    for obj in bpy.context.selected_objects:
+        obj.keyframe_insert("location", frame=1)
+        obj.location.z += 0.5
+        obj.keyframe_insert("location", frame=100)
+
+    camera = bpy.data.objects.new("Camera", bpy.data.cameras.new("Camera"))
+    camera.location = (0, 0, side * 1.2)
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+    scene.render.resolution_x = scene.render.resolution_y = resolution
+    return scene
+
+
+def time_frames(scene, frames, label):
+    rows = []
+    for frame in frames:
+        scene.frame_set(frame)
+        with Timer() as timer:
+            bpy.ops.render.render(write_still=True)
+        rows.append({"profile": label, "frame": frame, "render_s": round(timer.elapsed, 3)})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=5)
+    parser.add_argument("--tiles", type=int, default=2500)
+    parser.add_argument("--resolution", type=int, default=1024)
+    parser.add_argument("--json")
+    args = parser.parse_args(script_args())
+
+    scene = build_reference_scene(args.tiles, args.resolution)
+    scene.render.engine = 'CYCLES'
+    scene.cycles.samples = 128
+    scene.cycles.use_denoising = True
+    frames = list(range(1, args.frames + 1))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scene.render.filepath = os.path.join(tmp, "before_")
+        rows = time_frames(scene, frames, "cycles-128")
+        for engine in ('WORKBENCH', 'EEVEE'):
+            bpy.ops.render.mask_render_mode(engine=engine)
+            scene.render.filepath = os.path.join(tmp, engine.lower() + "_")
+            rows += time_frames(scene, frames, f"mask-{engine.lower()}")
+            bpy.ops.render.restore_render_settings()
+
+    print_table(rows, ["profile", "frame", "render_s"])
+    for profile in dict.fromkeys(row["profile"] for row in rows):
+        times = [row["render_s"] for row in rows if row["profile"] == profile]
+        print(f"{profile}: {sum(times) / len(times):.3f}s per frame")
+    if args.json:
+        with open(args.json, "w") as out:
+            json.dump(rows, out, indent=2)
+
+
+main()
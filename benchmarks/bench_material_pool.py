@@ -0,0 +1,86 @@
+"""Material count and shader compile time before/after Clean Up Materials.
+
+Builds a grid of split faces, gives each tile its own emission material the
+way earlier versions did, then runs Clean Up Materials. Each state is saved
+and rendered once with EEVEE in a fresh Blender process, so the render time
+is dominated by shader compilation.
+
+    blender -b --factory-startup -P benchmarks/bench_material_pool.py -- [--tiles 10000] [--json out.json]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+from common import Timer, print_table, reset_scene, script_args
+
+
+def legacy_material(addon, color, color_name):
+    # One brand-new material per call, like add_material_with_emission used to do
+    return addon.build_emission_material(bpy.data.materials.new(name=f"{color_name}Material"), color)
+
+
+def build_scene(addon, tiles):
+    reset_scene()
+    side = max(1, int(tiles ** 0.5))
+    mesh = bpy.data.meshes.new("Tile")
+    mesh.from_pydata([(-0.5, -0.5, 0), (0.5, -0.5, 0), (0.5, 0.5, 0), (-0.5, 0.5, 0)], [], [(0, 1, 2, 3)])
+    scene = bpy.context.scene
+    for i in range(side * side):
+        obj = bpy.data.objects.new(f"Tile_{i}", mesh.copy())
+        obj.location = (i % side, i // side, 0)
+        scene.collection.objects.link(obj)
+        color_name, color = random.choice(addon.MASK_COLORS)
+        obj.data.materials.append(legacy_material(addon, color, color_name))
+
+    camera = bpy.data.objects.new("Camera", bpy.data.cameras.new("Camera"))
+    camera.location = (side / 2, side / 2, side * 1.5)
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+    scene.render.resolution_x = scene.render.resolution_y = 512
+    scene.render.engine = 'BLENDER_EEVEE_NEXT' if bpy.app.version >= (4, 2, 0) and bpy.app.version < (5, 0, 0) else 'BLENDER_EEVEE'
+
+
+def render_time(blend_path):
+    with Timer() as timer:
+        subprocess.run([bpy.app.binary_path, "-b", blend_path, "-f", "1"], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return round(timer.elapsed, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tiles", type=int, default=10000)
+    parser.add_argument("--json")
+    args = parser.parse_args(script_args())
+
+    import random_object_duplicate_plus as addon
+    build_scene(addon, args.tiles)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        bpy.context.scene.render.filepath = os.path.join(tmp, "frame_")
+        before = os.path.join(tmp, "before.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=before)
+        rows.append({"state": "before", "materials": len(bpy.data.materials), "cleanup_s": "", "render_s": render_time(before)})
+
+        with Timer() as cleanup:
+            bpy.ops.object.purge_duplicate_materials()
+        after = os.path.join(tmp, "after.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=after)
+        rows.append({"state": "after", "materials": len(bpy.data.materials),
+                     "cleanup_s": round(cleanup.elapsed, 2), "render_s": render_time(after)})
+
+    print_table(rows, ["state", "materials", "cleanup_s", "render_s"])
+    if args.json:
+        with open(args.json, "w") as out:
+            json.dump(rows, out, indent=2)
+
+
+main()
@@ -0,0 +1,81 @@
+"""Time No Overlap placement for Randomize Location and Random Resize as the object count grows.
+
+    blender -b --factory-startup -P benchmarks/bench_placement.py -- [--counts 1000 10000 50000] [--json out.json]
+
+The ranges grow with the count so the density stays the same; with a linear
+sampler the time per object should stay flat. The "mixed" rows make one cube
+in 200 sixteen times larger, which should cost about the same per object.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+import numpy as np
+from common import Timer, print_table, reset_scene, script_args
+
+
+def cube_mesh(size):
+    mesh = bpy.data.meshes.new("Cube")
+    half = 0.5 * size
+    mesh.from_pydata([(x, y, z) for x in (-half, half) for y in (-half, half) for z in (-half, half)], [],
+                     [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)])
+    return mesh
+
+
+def add_cubes(count, mixed=False):
+    mesh = cube_mesh(1.0)
+    big_mesh = cube_mesh(16.0)
+    collection = bpy.context.scene.collection
+    for index in range(count):
+        obj = bpy.data.objects.new(f"Cube{index}", big_mesh if mixed and index % 200 == 0 else mesh)
+        collection.objects.link(obj)
+        obj.select_set(True)
+
+
+def count_overlaps(objects):
+    # Brute force on a sample so the check itself stays cheap
+    positions = np.array([obj.location for obj in objects[:2000]])
+    radii = np.array([0.5 * obj.dimensions.length for obj in objects[:2000]])
+    distance = np.linalg.norm(positions[:, None] - positions[None], axis=2)
+    np.fill_diagonal(distance, np.inf)
+    return int((distance < radii[:, None] + radii[None] - 1e-6).sum() // 2)
+
+
+def run(mode, count, mixed=False):
+    scene = reset_scene()
+    add_cubes(count, mixed)
+    props = scene.random_duplicate_props
+    props.placement_mode = mode
+    props.placement_seed = 1
+    props.x_range = props.y_range = (count ** 0.5) * 1.5
+    props.use_z_range = False
+    with Timer() as locate:
+        bpy.ops.object.randomize_location()
+    with Timer() as resize:
+        bpy.ops.object.random_resize()
+    objects = list(bpy.context.selected_objects)
+    return {"mode": mode, "sizes": "mixed" if mixed else "same", "count": count,
+            "location_s": round(locate.elapsed, 3), "resize_s": round(resize.elapsed, 3),
+            "us_per_object": round(1e6 * locate.elapsed / count, 1),
+            "overlaps_in_sample": count_overlaps(objects)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--json")
+    args = parser.parse_args(script_args())
+
+    rows = [run(mode, count) for count in args.counts for mode in ('UNIFORM', 'POISSON')]
+    rows += [run('POISSON', count, mixed=True) for count in args.counts]
+    print_table(rows, ["mode", "sizes", "count", "location_s", "resize_s", "us_per_object", "overlaps_in_sample"])
+    if args.json:
+        with open(args.json, "w") as out:
+            json.dump(rows, out, indent=2)
+
+
+main()
@@ -0,0 +1,66 @@
+"""Compare Random Duplicate memory use and run time between Full Copy and Linked Data,
+and time re-rolling the same group in place.
+
+    blender -b --factory-startup -P benchmarks/bench_random_duplicate.py -- [--counts 1000 10000 50000] [--json out.json]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+from common import Timer, print_table, reset_scene, rss_mb, script_args
+
+
+def run(mode, count, subdivisions):
+    scene = reset_scene()
+    bpy.ops.mesh.primitive_grid_add(x_subdivisions=subdivisions, y_subdivisions=subdivisions)
+    props = scene.random_duplicate_props
+    props.num_duplicates = count
+    props.duplicate_mode = mode
+    gc.collect()
+
+    rss_before = rss_mb()
+    with Timer() as duplicate:
+        bpy.ops.object.random_duplicate()
+    rss_after = rss_mb()
+    with Timer() as reroll:
+        bpy.ops.object.reroll_duplicates()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.blend")
+        with Timer() as save:
+            bpy.ops.wm.save_as_mainfile(filepath=path, compress=False)
+        size_mb = os.path.getsize(path) / (1024.0 * 1024.0)
+
+    return {
+        "mode": mode,
+        "count": count,
+        "duplicate_s": round(duplicate.elapsed, 3),
+        "reroll_s": round(reroll.elapsed, 3),
+        "save_s": round(save.elapsed, 3),
+        "rss_delta_mb": round(rss_after - rss_before, 1),
+        "blend_mb": round(size_mb, 1),
+        "meshes": len(bpy.data.meshes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--subdivisions", type=int, default=16)
+    parser.add_argument("--json")
+    args = parser.parse_args(script_args())
+
+    rows = [run(mode, count, args.subdivisions) for count in args.counts for mode in ('COPY', 'LINKED')]
+    print_table(rows, ["mode", "count", "duplicate_s", "reroll_s", "save_s", "rss_delta_mb", "blend_mb", "meshes"])
+    if args.json:
+        with open(args.json, "w") as out:
+            json.dump(rows, out, indent=2)
+
+
+main()
@@ -0,0 +1,76 @@
+"""Time Split Faces on square grids, optionally against the old bpy.ops based path.
+
+    blender -b --factory-startup -P benchmarks/bench_split_faces.py -- [--faces 1024 10000 65536] [--legacy] [--json out.json]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+import numpy as np
+from common import Timer, print_table, reset_scene, script_args
+
+
+def add_grid(faces):
+    side = max(1, int(round(faces ** 0.5)))
+    xs, ys = np.meshgrid(np.arange(side + 1, dtype=np.float32), np.arange(side + 1, dtype=np.float32))
+    verts = np.column_stack([xs.ravel(), ys.ravel(), np.zeros(xs.size, dtype=np.float32)])
+    i, j = np.meshgrid(np.arange(side), np.arange(side))
+    first = (j * (side + 1) + i).ravel()
+    quads = np.column_stack([first, first + 1, first + side + 2, first + side + 1])
+    mesh = bpy.data.meshes.new("Grid")
+    mesh.from_pydata(verts.tolist(), [], quads.tolist())
+    obj = bpy.data.objects.new("Grid", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+    obj.select_set(True)
+    return side * side
+
+
+def legacy_split(context):
+    # The pre-mesh-data implementation: one operator dispatch per resulting object
+    bpy.ops.object.mode_set(mode='EDIT')
+    bpy.ops.mesh.select_all(action='SELECT')
+    bpy.ops.mesh.edge_split(type='EDGE')
+    bpy.ops.object.mode_set(mode='OBJECT')
+    bpy.ops.mesh.separate(type='LOOSE')
+    for obj in context.selected_objects:
+        context.view_layer.objects.active = obj
+        bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='MEDIAN')
+        obj["original_location"] = obj.location.copy()
+
+
+def run(faces, legacy):
+    reset_scene()
+    actual = add_grid(faces)
+    with Timer() as timer:
+        if legacy:
+            legacy_split(bpy.context)
+        else:
+            bpy.ops.object.split_faces()
+    return {"path": "legacy" if legacy else "mesh-data", "faces": actual,
+            "objects": len(bpy.data.objects), "split_s": round(timer.elapsed, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--faces", type=int, nargs="+", default=[1024, 10000, 65536])
+    parser.add_argument("--legacy", action="store_true", help="also time the old bpy.ops path")
+    parser.add_argument("--json")
+    args = parser.parse_args(script_args())
+
+    rows = []
+    for faces in args.faces:
+        rows.append(run(faces, legacy=False))
+        if args.legacy:
+            rows.append(run(faces, legacy=True))
+    print_table(rows, ["path", "faces", "objects", "split_s"])
+    if args.json:
+        with open(args.json, "w") as out:
+            json.dump(rows, out, indent=2)
+
+
+main()
@@ -0,0 +1,69 @@
+"""Shared helpers for the background Blender benchmarks.
+
+Run a benchmark with ``blender -b --factory-startup -P benchmarks/<script>.py -- [args]``.
+"""
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+
+def script_args():
+    """Return the arguments passed after ``--`` on the Blender command line."""
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return []
+
+
+def load_addon():
+    import random_object_duplicate_plus as addon
+    try:
+        addon.register()
+    except ValueError:
+        # Already registered from the user's preferences
+        pass
+    return addon
+
+
+def reset_scene():
+    import bpy
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    load_addon()
+    return bpy.context.scene
+
+
+def rss_mb():
+    """Current resident set size of this process in MiB."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    import resource
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB elsewhere
+    return usage / (1024.0 * 1024.0) if sys.platform == "darwin" else usage / 1024.0
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        return False
+
+
+def print_table(rows, columns):
+    widths = [max(len(str(col)), *(len(str(row.get(col, ""))) for row in rows)) for col in columns]
+    print("  ".join(str(col).ljust(width) for col, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row.get(col, "")).ljust(width) for col, width in zip(columns, widths)))
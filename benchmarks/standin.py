@@ -0,0 +1,1315 @@
+"""Pure-Python stand-in for the parts of bpy, mathutils and bmesh the add-on uses.
+
+    import standin
+    bpy = standin.install()
+    import random_object_duplicate_plus
+
+install() puts fake ``bpy``, ``mathutils`` and ``bmesh`` modules into
+sys.modules. Data lives in plain Python objects and numpy arrays, operators are
+called straight through ``bpy.ops``, and foreach_get/foreach_set copy arrays the
+way Blender does, so the Python-side cost of every operator can be measured
+(and scaling regressions caught) on any machine with numpy.
+
+This is not a Blender emulator. Nothing is evaluated, drawn or rendered:
+frame_set only moves the current frame, no depsgraph updates are sent, and
+bmesh, mesh attributes and Geometry Nodes are missing, so face island code
+paths only run in real Blender. Timings only compare with other stand-in runs.
+"""
+import itertools
+import math
+import os
+import re
+import sys
+import types
+
+import numpy as np
+
+# Reports of the last operator call, as (type set, message) tuples
+reports = []
+
+# Source of ID.session_uid, unique for the life of the process like Blender's
+_session_uids = itertools.count(1)
+
+
+class Vector(list):
+    def __init__(self, values=(0.0, 0.0, 0.0)):
+        super().__init__(float(value) for value in values)
+
+    def _axis(index):
+        return property(lambda self: self[index], lambda self, value: self.__setitem__(index, float(value)))
+
+    x, y, z = _axis(0), _axis(1), _axis(2)
+    del _axis
+
+    @property
+    def length(self):
+        return math.sqrt(sum(value * value for value in self))
+
+    def copy(self):
+        return Vector(self)
+
+    def to_tuple(self):
+        return tuple(self)
+
+
+class Matrix(list):
+    def __init__(self, rows=None):
+        super().__init__(list(map(float, row)) for row in (rows if rows is not None else np.identity(4).tolist()))
+
+    @property
+    def translation(self):
+        return Vector(row[3] for row in self[:3])
+
+    def inverted(self):
+        return Matrix(np.linalg.inv(np.array(self)).tolist())
+
+    def __matmul__(self, other):
+        result = np.array(self) @ np.array(other)
+        return Matrix(result.tolist()) if result.ndim == 2 else Vector(result.tolist())
+
+
+def compose_matrix(location, rotation, scale):
+    """Location @ rotation (XYZ Euler) @ scale, like Object.matrix_basis."""
+    cx, cy, cz = (math.cos(angle) for angle in rotation)
+    sx, sy, sz = (math.sin(angle) for angle in rotation)
+    rotation_matrix = (
+        (cy * cz, sx * sy * cz - cx * sz, cx * sy * cz + sx * sz),
+        (cy * sz, sx * sy * sz + cx * cz, cx * sy * sz - sx * cz),
+        (-sy, sx * cy, cx * cy),
+    )
+    rows = [[rotation_matrix[i][j] * scale[j] for j in range(3)] + [location[i]] for i in range(3)]
+    return Matrix(rows + [[0.0, 0.0, 0.0, 1.0]])
+
+
+def _copy_value(value):
+    if isinstance(value, (list, dict, np.ndarray)):
+        return value.copy()
+    return value
+
+
+class ID:
+    def __init__(self, name=""):
+        self.session_uid = next(_session_uids)
+        self._name = name
+        self._owner = None
+        self._props = {}
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        if self._owner is not None:
+            self._owner._rename(self, value)
+        else:
+            self._name = value
+
+    @property
+    def original(self):
+        return self
+
+    is_evaluated = False
+    library = None
+
+    def as_pointer(self):
+        return id(self)
+
+    def __getitem__(self, key):
+        return self._props[key]
+
+    def __setitem__(self, key, value):
+        self._props[key] = value
+
+    def __delitem__(self, key):
+        del self._props[key]
+
+    def __contains__(self, key):
+        return key in self._props
+
+    def get(self, key, default=None):
+        return self._props.get(key, default)
+
+    def keys(self):
+        return self._props.keys()
+
+    def items(self):
+        return self._props.items()
+
+    def user_remap(self, new):
+        for obj in data.objects:
+            if obj._data is self:
+                obj.data = new
+            obj._slot_materials = [new if material is self else material for material in obj._slot_materials]
+        for mesh in data.meshes:
+            mesh.materials._items = [new if material is self else material for material in mesh.materials._items]
+
+    def _removed(self):
+        pass
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self._name!r}>"
+
+
+class IDCollection:
+    """bpy.data.<type>: unique names with .001 suffixes, lookup by name or index."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._items = {}
+        self._suffix = {}
+
+    def _unique(self, name):
+        if name not in self._items:
+            return name
+        base = re.sub(r"\.\d{3,}$", "", name)
+        number = self._suffix.get(base, 0)
+        while True:
+            number += 1
+            candidate = f"{base}.{number:03d}"
+            if candidate not in self._items:
+                self._suffix[base] = number
+                return candidate
+
+    def _add(self, id_data, name):
+        id_data._name = self._unique(name)
+        id_data._owner = self
+        self._items[id_data._name] = id_data
+        return id_data
+
+    def _rename(self, id_data, name):
+        if name == id_data._name:
+            return
+        del self._items[id_data._name]
+        id_data._name = self._unique(name)
+        self._items[id_data._name] = id_data
+
+    def new(self, name, *args, **kwargs):
+        return self._add(self._factory(name, *args, **kwargs), name)
+
+    def remove(self, id_data, do_unlink=True):
+        self._items.pop(id_data._name, None)
+        id_data._owner = None
+        id_data._removed()
+
+    def get(self, name, default=None):
+        return self._items.get(name, default)
+
+    def keys(self):
+        return list(self._items.keys())
+
+    def values(self):
+        return list(self._items.values())
+
+    def items(self):
+        return list(self._items.items())
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return list(self._items.values())[key]
+        return self._items[key]
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return key in self._items
+        return self._items.get(getattr(key, "name", None)) is key
+
+    def __iter__(self):
+        return iter(list(self._items.values()))
+
+    def __len__(self):
+        return len(self._items)
+
+
+class _Element:
+    """One item of an array-backed collection (a vertex, polygon, keyframe point...)."""
+
+    def __init__(self, owner, index):
+        object.__setattr__(self, "_owner", owner)
+        object.__setattr__(self, "_index", index)
+
+    def __getattr__(self, attr):
+        if attr not in self._owner._fields:
+            raise AttributeError(attr)
+        value = self._owner._arrays[attr][self._index]
+        return value.tolist() if isinstance(value, np.ndarray) else value.item()
+
+    def __setattr__(self, attr, value):
+        if attr not in self._owner._fields:
+            raise AttributeError(attr)
+        self._owner._arrays[attr][self._index] = value
+        self._owner._changed()
+
+
+class ArrayCollection:
+    """Fixed set of per-item fields stored as numpy arrays, with foreach_get/foreach_set."""
+
+    def __init__(self, fields):
+        # field -> (width, dtype)
+        self._fields = fields
+        self._arrays = {}
+        self._resize(0)
+
+    def _resize(self, count):
+        old = self._arrays
+        self._arrays = {}
+        for attr, (width, dtype) in self._fields.items():
+            shape = (count, width) if width > 1 else (count,)
+            array = np.zeros(shape, dtype=dtype)
+            if attr in old:
+                keep = min(count, len(old[attr]))
+                array[:keep] = old[attr][:keep]
+            self._arrays[attr] = array
+        self._changed()
+
+    def _changed(self):
+        pass
+
+    def add(self, count=1):
+        self._resize(len(self) + count)
+
+    def clear(self):
+        self._resize(0)
+
+    def foreach_get(self, attr, seq):
+        values = self._arrays[attr].ravel()
+        if len(seq) != len(values):
+            raise RuntimeError(f"foreach_get('{attr}'): expected a sequence of {len(values)}, got {len(seq)}")
+        seq[:] = values if isinstance(seq, np.ndarray) else values.tolist()
+
+    def foreach_set(self, attr, seq):
+        array = self._arrays[attr]
+        values = np.asarray(seq, dtype=array.dtype)
+        if values.size != array.size:
+            raise RuntimeError(f"foreach_set('{attr}'): expected a sequence of {array.size}, got {values.size}")
+        array[...] = values.reshape(array.shape)
+        self._changed()
+
+    def __len__(self):
+        return len(next(iter(self._arrays.values())))
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return _Element(self, index)
+
+    def __iter__(self):
+        return (_Element(self, index) for index in range(len(self)))
+
+
+class _MeshVertices(ArrayCollection):
+    def __init__(self, mesh):
+        self._mesh = mesh
+        super().__init__({"co": (3, np.float32)})
+
+    def _changed(self):
+        self._mesh._bounds = None
+
+
+class _MeshMaterials:
+    def __init__(self):
+        self._items = []
+
+    def append(self, material):
+        self._items.append(material)
+
+    def clear(self):
+        self._items.clear()
+
+    def pop(self, index=-1):
+        return self._items.pop(index)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __setitem__(self, index, material):
+        self._items[index] = material
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return any(material is not None and material.name == key for material in self._items)
+        return key in self._items
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+
+class _UVLayer:
+    def __init__(self, name, loop_count):
+        self.name = name
+        self.data = ArrayCollection({"uv": (2, np.float32)})
+        self.data._resize(loop_count)
+
+
+class _UVLayers:
+    def __init__(self, mesh):
+        self._mesh = mesh
+        self._layers = []
+
+    def new(self, name="UVMap", do_init=True):
+        layer = _UVLayer(name, len(self._mesh.loops))
+        self._layers.append(layer)
+        return layer
+
+    def get(self, name, default=None):
+        return next((layer for layer in self._layers if layer.name == name), default)
+
+    def __iter__(self):
+        return iter(list(self._layers))
+
+    def __len__(self):
+        return len(self._layers)
+
+
+class _Attributes(dict):
+    def new(self, name, type, domain):
+        raise NotImplementedError("Mesh attributes are not part of the bpy stand-in")
+
+
+class Mesh(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.vertices = _MeshVertices(self)
+        self.edges = ArrayCollection({"vertices": (2, np.int32)})
+        self.loops = ArrayCollection({"vertex_index": (1, np.int32)})
+        self.polygons = ArrayCollection({
+            "loop_start": (1, np.int32),
+            "loop_total": (1, np.int32),
+            "material_index": (1, np.int32),
+            "use_smooth": (1, bool),
+        })
+        self.materials = _MeshMaterials()
+        self.uv_layers = _UVLayers(self)
+        self.attributes = _Attributes()
+        self.shape_keys = None
+        self.animation_data = None
+        self.is_editmode = False
+        self.has_custom_normals = False
+        self.users = 0
+        self._bounds = None
+
+    def from_pydata(self, vertices, edges, faces):
+        faces = [list(face) for face in faces]
+        self.vertices._resize(len(vertices))
+        self.vertices.foreach_set("co", np.asarray(vertices, dtype=np.float32).ravel())
+        self.edges._resize(len(edges))
+        if edges:
+            self.edges.foreach_set("vertices", np.asarray(edges, dtype=np.int32).ravel())
+        totals = np.array([len(face) for face in faces], dtype=np.int32)
+        self.polygons._resize(len(faces))
+        self.polygons.foreach_set("loop_total", totals)
+        self.polygons.foreach_set("loop_start", np.concatenate([[0], np.cumsum(totals)[:-1]]) if len(faces) else totals)
+        self.loops._resize(int(totals.sum()))
+        if faces:
+            self.loops.foreach_set("vertex_index", np.concatenate([np.asarray(face, dtype=np.int32) for face in faces]))
+
+    def copy(self):
+        mesh = data.meshes._add(Mesh(self.name), self.name)
+        for attr in ("vertices", "edges", "loops", "polygons"):
+            source, target = getattr(self, attr), getattr(mesh, attr)
+            target._arrays = {key: array.copy() for key, array in source._arrays.items()}
+        mesh.materials._items = list(self.materials._items)
+        for layer in self.uv_layers:
+            copied = mesh.uv_layers.new(name=layer.name)
+            copied.data._arrays["uv"] = layer.data._arrays["uv"].copy()
+        mesh._props = {key: _copy_value(value) for key, value in self._props.items()}
+        return mesh
+
+    def bounds(self):
+        if self._bounds is None:
+            co = self.vertices._arrays["co"]
+            self._bounds = (co.min(axis=0).tolist(), co.max(axis=0).tolist()) if len(co) else ([0.0] * 3, [0.0] * 3)
+        return self._bounds
+
+    def update(self, *args, **kwargs):
+        pass
+
+    def validate(self, *args, **kwargs):
+        return False
+
+
+class Camera(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.lens = 50.0
+        self.sensor_width = 36.0
+        self.clip_start = 0.1
+        self.clip_end = 1000.0
+        self.users = 0
+
+
+class _Socket:
+    def __init__(self, name, default_value=None):
+        self.name = name
+        self.default_value = default_value
+        self.is_linked = False
+
+
+class _Sockets:
+    def __init__(self, sockets):
+        self._sockets = [_Socket(name, _copy_value(default)) for name, default in sockets]
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._sockets[key]
+        for socket in self._sockets:
+            if socket.name == key:
+                return socket
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        return next((socket for socket in self._sockets if socket.name == key), default)
+
+    def __iter__(self):
+        return iter(self._sockets)
+
+    def __len__(self):
+        return len(self._sockets)
+
+
+# Shader node bl_idname -> (node type, inputs with defaults, outputs)
+SHADER_NODES = {
+    "ShaderNodeEmission": ("EMISSION", (("Color", [1.0, 1.0, 1.0, 1.0]), ("Strength", 1.0)), ("Emission",)),
+    "ShaderNodeOutputMaterial": ("OUTPUT_MATERIAL", (("Surface", None), ("Volume", None), ("Displacement", None)), ()),
+    "ShaderNodeBsdfPrincipled": ("BSDF_PRINCIPLED", (("Base Color", [0.8, 0.8, 0.8, 1.0]), ("Roughness", 0.5)), ("BSDF",)),
+    "ShaderNodeAttribute": ("ATTRIBUTE", (), ("Color", "Vector", "Fac", "Alpha")),
+    "ShaderNodeObjectInfo": ("OBJECT_INFO", (), ("Location", "Color", "Alpha", "Object Index", "Material Index", "Random")),
+}
+
+
+class _Node:
+    def __init__(self, bl_idname):
+        node_type, inputs, outputs = SHADER_NODES.get(bl_idname, (bl_idname.upper(), (), ()))
+        self.bl_idname = bl_idname
+        self.type = node_type
+        self.name = bl_idname
+        self.location = (0.0, 0.0)
+        self.attribute_name = ""
+        self.inputs = _Sockets(inputs)
+        self.outputs = _Sockets((name, None) for name in outputs)
+
+
+class _Nodes:
+    def __init__(self):
+        self._nodes = []
+
+    def new(self, type):
+        node = _Node(type)
+        self._nodes.append(node)
+        return node
+
+    def remove(self, node):
+        self._nodes.remove(node)
+
+    def get(self, name, default=None):
+        return next((node for node in self._nodes if node.name == name), default)
+
+    def __iter__(self):
+        return iter(list(self._nodes))
+
+    def __len__(self):
+        return len(self._nodes)
+
+
+class _Links(list):
+    def new(self, from_socket, to_socket):
+        from_socket.is_linked = to_socket.is_linked = True
+        link = types.SimpleNamespace(from_socket=from_socket, to_socket=to_socket)
+        self.append(link)
+        return link
+
+
+class NodeTree(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.nodes = _Nodes()
+        self.links = _Links()
+        self.animation_data = None
+
+
+class Material(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.diffuse_color = [0.8, 0.8, 0.8, 1.0]
+        self.node_tree = None
+        self.animation_data = None
+        self._use_nodes = False
+
+    @property
+    def use_nodes(self):
+        return self._use_nodes
+
+    @use_nodes.setter
+    def use_nodes(self, value):
+        self._use_nodes = bool(value)
+        if value and self.node_tree is None:
+            self.node_tree = NodeTree("Shader Nodetree")
+            principled = self.node_tree.nodes.new("ShaderNodeBsdfPrincipled")
+            output = self.node_tree.nodes.new("ShaderNodeOutputMaterial")
+            self.node_tree.links.new(principled.outputs["BSDF"], output.inputs["Surface"])
+
+
+class KeyframePoints(ArrayCollection):
+    def __init__(self):
+        super().__init__({
+            "co": (2, np.float32),
+            "handle_left": (2, np.float32),
+            "handle_right": (2, np.float32),
+            "handle_left_type": (1, np.int32),
+            "handle_right_type": (1, np.int32),
+            "interpolation": (1, np.int32),
+            "easing": (1, np.int32),
+            "type": (1, np.int32),
+            "amplitude": (1, np.float32),
+            "back": (1, np.float32),
+            "period": (1, np.float32),
+        })
+
+    def insert(self, frame, value, options=set(), keyframe_type='KEYFRAME'):
+        frames = self._arrays["co"][:, 0]
+        existing = np.flatnonzero(frames == frame)
+        index = int(existing[0]) if len(existing) else len(self)
+        if not len(existing):
+            self.add(1)
+        for attr, point in (("co", (frame, value)), ("handle_left", (frame - 1.0, value)),
+                            ("handle_right", (frame + 1.0, value))):
+            self._arrays[attr][index] = point
+        self._sort()
+        return self[int(np.flatnonzero(self._arrays["co"][:, 0] == frame)[0])]
+
+    def _sort(self):
+        order = np.argsort(self._arrays["co"][:, 0], kind="stable")
+        for attr in self._arrays:
+            self._arrays[attr] = self._arrays[attr][order]
+
+
+class FCurve:
+    def __init__(self, data_path, index=0, action_group=""):
+        self.data_path = data_path
+        self.array_index = index
+        self.group = action_group
+        self.keyframe_points = KeyframePoints()
+
+    def update(self):
+        self.keyframe_points._sort()
+
+    def evaluate(self, frame):
+        co = self.keyframe_points._arrays["co"]
+        return float(np.interp(frame, co[:, 0], co[:, 1])) if len(co) else 0.0
+
+
+class _FCurves(list):
+    def new(self, data_path, index=0, action_group=""):
+        if self.find(data_path, index=index) is not None:
+            raise RuntimeError(f"F-Curve '{data_path}[{index}]' already exists in action")
+        fcurve = FCurve(data_path, index, action_group)
+        self.append(fcurve)
+        return fcurve
+
+    def find(self, data_path, index=0):
+        return next((fcurve for fcurve in self if fcurve.data_path == data_path and fcurve.array_index == index), None)
+
+
+class Action(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.fcurves = _FCurves()
+        self.users = 0
+
+    def copy(self):
+        action = data.actions._add(Action(self.name), self.name)
+        for fcurve in self.fcurves:
+            copied = action.fcurves.new(fcurve.data_path, index=fcurve.array_index, action_group=fcurve.group)
+            copied.keyframe_points._arrays = {attr: array.copy()
+                                              for attr, array in fcurve.keyframe_points._arrays.items()}
+        return action
+
+    def update_tag(self):
+        pass
+
+
+class AnimData:
+    def __init__(self):
+        self._action = None
+
+    @property
+    def action(self):
+        return self._action
+
+    @action.setter
+    def action(self, value):
+        if self._action is not None:
+            self._action.users -= 1
+        self._action = value
+        if value is not None:
+            value.users += 1
+
+
+class MaterialSlot:
+    def __init__(self, obj, index):
+        self._obj = obj
+        self._index = index
+
+    @property
+    def link(self):
+        return self._obj._slot_links[self._index]
+
+    @link.setter
+    def link(self, value):
+        self._obj._slot_links[self._index] = value
+
+    @property
+    def material(self):
+        if self.link == 'OBJECT':
+            return self._obj._slot_materials[self._index]
+        return self._obj.data.materials[self._index]
+
+    @material.setter
+    def material(self, material):
+        if self.link == 'OBJECT':
+            self._obj._slot_materials[self._index] = material
+        else:
+            self._obj.data.materials[self._index] = material
+
+
+class Object(ID):
+    def __init__(self, name, object_data=None):
+        super().__init__(name)
+        self._data = None
+        self.data = object_data
+        self._location = Vector()
+        self._rotation_euler = Vector()
+        self._rotation_quaternion = Vector((1.0, 0.0, 0.0, 0.0))
+        self._rotation_axis_angle = Vector((0.0, 0.0, 1.0, 0.0))
+        self.rotation_mode = 'XYZ'
+        self._scale = Vector((1.0, 1.0, 1.0))
+        self.color = [1.0, 1.0, 1.0, 1.0]
+        self.hide_render = False
+        self.hide_viewport = False
+        self.animation_data = None
+        self.users_collection = []
+        self.vertex_groups = []
+        self._slot_links = []
+        self._slot_materials = []
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        if self._data is not None:
+            self._data.users -= 1
+        self._data = value
+        if value is not None:
+            value.users += 1
+
+    @property
+    def type(self):
+        if isinstance(self._data, Mesh):
+            return 'MESH'
+        if isinstance(self._data, Camera):
+            return 'CAMERA'
+        return 'EMPTY'
+
+    def _vector_property(attr):
+        return property(lambda self: getattr(self, attr), lambda self, value: setattr(self, attr, Vector(value)))
+
+    location = _vector_property("_location")
+    rotation_euler = _vector_property("_rotation_euler")
+    rotation_quaternion = _vector_property("_rotation_quaternion")
+    rotation_axis_angle = _vector_property("_rotation_axis_angle")
+    scale = _vector_property("_scale")
+    del _vector_property
+
+    @property
+    def matrix_basis(self):
+        return compose_matrix(self._location, self._rotation_euler, self._scale)
+
+    matrix_world = matrix_basis
+
+    @property
+    def bound_box(self):
+        if not isinstance(self._data, Mesh):
+            return [(0.0, 0.0, 0.0)] * 8
+        (x0, y0, z0), (x1, y1, z1) = self._data.bounds()
+        return [(x0, y0, z0), (x0, y0, z1), (x0, y1, z1), (x0, y1, z0),
+                (x1, y0, z0), (x1, y0, z1), (x1, y1, z1), (x1, y1, z0)]
+
+    @property
+    def dimensions(self):
+        if not isinstance(self._data, Mesh):
+            return Vector()
+        low, high = self._data.bounds()
+        return Vector(abs((h - l) * s) for l, h, s in zip(low, high, self._scale))
+
+    @property
+    def material_slots(self):
+        count = len(self._data.materials) if isinstance(self._data, Mesh) else 0
+        while len(self._slot_links) < count:
+            self._slot_links.append('DATA')
+            self._slot_materials.append(None)
+        return [MaterialSlot(self, index) for index in range(count)]
+
+    @property
+    def active_material(self):
+        slots = self.material_slots
+        return slots[0].material if slots else None
+
+    def copy(self):
+        obj = data.objects._add(Object(self.name, self._data), self.name)
+        obj._location = self._location.copy()
+        obj._rotation_euler = self._rotation_euler.copy()
+        obj._rotation_quaternion = self._rotation_quaternion.copy()
+        obj._rotation_axis_angle = self._rotation_axis_angle.copy()
+        obj.rotation_mode = self.rotation_mode
+        obj._scale = self._scale.copy()
+        obj.color = list(self.color)
+        obj.hide_render = self.hide_render
+        obj.hide_viewport = self.hide_viewport
+        obj._slot_links = list(self._slot_links)
+        obj._slot_materials = list(self._slot_materials)
+        obj._props = {key: _copy_value(value) for key, value in self._props.items()}
+        if self.animation_data is not None:
+            obj.animation_data = AnimData()
+            obj.animation_data.action = self.animation_data.action
+        return obj
+
+    def select_set(self, state):
+        selected = context.view_layer._selected
+        if state:
+            selected[id(self)] = self
+        else:
+            selected.pop(id(self), None)
+
+    def select_get(self):
+        return id(self) in context.view_layer._selected
+
+    def visible_get(self):
+        return not self.hide_viewport and bool(self.users_collection)
+
+    def hide_get(self):
+        return self.hide_viewport
+
+    def animation_data_create(self):
+        if self.animation_data is None:
+            self.animation_data = AnimData()
+        return self.animation_data
+
+    def keyframe_insert(self, data_path, index=-1, frame=None, group=""):
+        frame = context.scene.frame_current if frame is None else frame
+        value = getattr(self, data_path)
+        values = list(value) if isinstance(value, (list, tuple)) else [value]
+        animation_data = self.animation_data_create()
+        if animation_data.action is None:
+            animation_data.action = data.actions.new(name=f"{self.name}Action")
+        fcurves = animation_data.action.fcurves
+        for array_index, component in enumerate(values):
+            if index >= 0 and array_index != index:
+                continue
+            fcurve = fcurves.find(data_path, index=array_index) or fcurves.new(data_path, index=array_index)
+            fcurve.keyframe_points.insert(frame, float(component))
+        return True
+
+    def keyframe_delete(self, data_path, index=-1, frame=None, group=""):
+        frame = context.scene.frame_current if frame is None else frame
+        action = self.animation_data.action if self.animation_data else None
+        if action is None:
+            raise RuntimeError(f"Object '{self.name}' has no animation data")
+        for fcurve in action.fcurves:
+            if fcurve.data_path == data_path and index in (-1, fcurve.array_index):
+                points = fcurve.keyframe_points
+                keep = points._arrays["co"][:, 0] != frame
+                points._arrays = {attr: array[keep] for attr, array in points._arrays.items()}
+        return True
+
+    def calc_matrix_camera(self, depsgraph, x=1, y=1, scale_x=1.0, scale_y=1.0):
+        camera = self._data
+        near, far = camera.clip_start, camera.clip_end
+        focal = 2.0 * camera.lens / camera.sensor_width
+        aspect = (x * scale_x) / (y * scale_y)
+        # Sensor fit AUTO: the sensor width spans the longer side
+        fx, fy = (focal, focal * aspect) if aspect >= 1.0 else (focal / aspect, focal)
+        return Matrix([
+            [fx, 0.0, 0.0, 0.0],
+            [0.0, fy, 0.0, 0.0],
+            [0.0, 0.0, -(far + near) / (far - near), -2.0 * far * near / (far - near)],
+            [0.0, 0.0, -1.0, 0.0],
+        ])
+
+    def _removed(self):
+        for collection in list(self.users_collection):
+            collection.objects.unlink(self)
+        self.select_set(False)
+        if context.view_layer.objects.active is self:
+            context.view_layer.objects.active = None
+        self.data = None
+
+
+class _CollectionObjects:
+    def __init__(self, collection):
+        self._collection = collection
+        self._objects = {}
+
+    def link(self, obj):
+        if id(obj) in self._objects:
+            raise RuntimeError(f"Object '{obj.name}' already in collection '{self._collection.name}'")
+        self._objects[id(obj)] = obj
+        obj.users_collection.append(self._collection)
+
+    def unlink(self, obj):
+        if self._objects.pop(id(obj), None) is not None:
+            obj.users_collection.remove(self._collection)
+
+    def get(self, name, default=None):
+        return next((obj for obj in self._objects.values() if obj.name == name), default)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return self.get(key) is not None
+        return id(key) in self._objects
+
+    def __getitem__(self, index):
+        return list(self._objects.values())[index]
+
+    def __iter__(self):
+        return iter(list(self._objects.values()))
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __bool__(self):
+        return bool(self._objects)
+
+
+class _CollectionChildren(list):
+    def link(self, collection):
+        self.append(collection)
+
+    def unlink(self, collection):
+        self.remove(collection)
+
+
+class Collection(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.objects = _CollectionObjects(self)
+        self.children = _CollectionChildren()
+        self.hide_render = False
+        self.hide_viewport = False
+
+    @property
+    def children_recursive(self):
+        found = []
+        for child in self.children:
+            found.append(child)
+            found.extend(child.children_recursive)
+        return found
+
+    @property
+    def all_objects(self):
+        objects = {id(obj): obj for obj in self.objects}
+        for child in self.children_recursive:
+            objects.update((id(obj), obj) for obj in child.objects)
+        return list(objects.values())
+
+
+class LayerObjects:
+    """The objects of the (only) view layer: every object linked to some collection."""
+
+    def __init__(self, view_layer):
+        self._view_layer = view_layer
+        self.active = None
+
+    @property
+    def selected(self):
+        return list(self._view_layer._selected.values())
+
+    def get(self, name, default=None):
+        obj = data.objects.get(name)
+        return obj if obj is not None and obj.users_collection else default
+
+    def __iter__(self):
+        return (obj for obj in data.objects if obj.users_collection)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class ViewLayer:
+    def __init__(self):
+        self.name = "ViewLayer"
+        self._selected = {}
+        self.objects = LayerObjects(self)
+
+    def update(self):
+        pass
+
+
+def _settings(**values):
+    return types.SimpleNamespace(**values)
+
+
+class Scene(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.frame_current = 1
+        self.frame_start = 1
+        self.frame_end = 250
+        self.timeline_markers = []
+        self.camera = None
+        self.collection = Collection("Scene Collection")
+        self.render = _settings(
+            engine='BLENDER_EEVEE', resolution_x=1920, resolution_y=1080, resolution_percentage=100,
+            pixel_aspect_x=1.0, pixel_aspect_y=1.0, use_motion_blur=False, use_compositing=True,
+            use_sequencer=True, film_transparent=False, dither_intensity=1.0, filter_size=1.5,
+            filepath="/tmp/", use_file_extension=True,
+            image_settings=_settings(file_format='PNG', color_mode='RGBA', color_depth='8'),
+        )
+        self.view_settings = _settings(view_transform='Filmic', look='None', exposure=0.0, gamma=1.0)
+        self.display = _settings(render_aa='8', shading=_settings(
+            light='STUDIO', color_type='MATERIAL', show_shadows=False, show_cavity=False,
+            show_object_outline=False, show_specular_highlight=True, show_xray=False, use_dof=False))
+        self.eevee = _settings(taa_render_samples=64, use_bloom=False, use_gtao=False, use_ssr=False,
+                               use_motion_blur=False, use_shadows=True)
+
+    def frame_set(self, frame, subframe=0.0):
+        self.frame_current = int(frame)
+
+
+class WindowManager(ID):
+    def fileselect_add(self, operator):
+        pass
+
+
+class Depsgraph:
+    updates = ()
+
+    def id_type_updated(self, id_type):
+        return False
+
+
+class Context:
+    mode = 'OBJECT'
+
+    def __init__(self):
+        self.scene = Scene("Scene")
+        self.view_layer = ViewLayer()
+        self.window_manager = WindowManager("WinMan")
+
+    @property
+    def selected_objects(self):
+        return self.view_layer.objects.selected
+
+    @property
+    def active_object(self):
+        return self.view_layer.objects.active
+
+    @property
+    def collection(self):
+        return self.scene.collection
+
+    def evaluated_depsgraph_get(self):
+        return Depsgraph()
+
+
+class BlendData:
+    def __init__(self):
+        self.filepath = ""
+        self.objects = IDCollection(Object)
+        self.meshes = IDCollection(Mesh)
+        self.materials = IDCollection(Material)
+        self.collections = IDCollection(Collection)
+        self.actions = IDCollection(Action)
+        self.cameras = IDCollection(Camera)
+        self.node_groups = IDCollection(NodeTree)
+        self.images = IDCollection(ID)
+
+    def user_map(self, subset=None):
+        users = {id_data: set() for id_data in subset} if subset is not None else {}
+        for obj in self.objects:
+            for used in [obj._data, *obj._slot_materials]:
+                if used in users:
+                    users[used].add(obj)
+        for mesh in self.meshes:
+            for material in mesh.materials:
+                if material in users:
+                    users[material].add(mesh)
+        return users
+
+    def batch_remove(self, ids):
+        for id_data in list(ids):
+            if id_data._owner is not None:
+                id_data._owner.remove(id_data)
+
+
+data = BlendData()
+context = Context()
+
+
+# --- RNA properties -------------------------------------------------------------
+
+class Property:
+    """Descriptor standing in for bpy.props.*: per-instance values, defaults and update callbacks."""
+
+    def __init__(self, kind, default=None, type=None, update=None, items=None, **options):
+        self.kind = kind
+        self.type = type
+        self.update = update
+        if default is None and kind == 'ENUM' and items:
+            default = items[0][0]
+        self.default = default
+        self.options = options
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        values = instance.__dict__.setdefault("_rna_values", {})
+        if id(self) not in values:
+            values[id(self)] = self.type() if self.kind == 'POINTER' else _copy_value(self.default)
+        return values[id(self)]
+
+    def __set__(self, instance, value):
+        instance.__dict__.setdefault("_rna_values", {})[id(self)] = value
+        if self.update is not None:
+            self.update(instance, context)
+
+
+def _property_factory(kind, default):
+    def factory(**kwargs):
+        kwargs.setdefault("default", default)
+        return Property(kind, **kwargs)
+    return factory
+
+
+props = types.ModuleType("bpy.props")
+props.BoolProperty = _property_factory('BOOL', False)
+props.IntProperty = _property_factory('INT', 0)
+props.FloatProperty = _property_factory('FLOAT', 0.0)
+props.StringProperty = _property_factory('STRING', "")
+props.EnumProperty = _property_factory('ENUM', None)
+props.FloatVectorProperty = _property_factory('FLOAT_VECTOR', (0.0, 0.0, 0.0))
+props.IntVectorProperty = _property_factory('INT_VECTOR', (0, 0, 0))
+props.PointerProperty = _property_factory('POINTER', None)
+props.CollectionProperty = _property_factory('COLLECTION', [])
+
+
+# --- Registration, operators and bpy.ops -----------------------------------------
+
+class bpy_struct:
+    pass
+
+
+class Operator(bpy_struct):
+    bl_options = set()
+
+    def report(self, type, message):
+        reports.append((set(type), message))
+
+
+class Panel(bpy_struct):
+    pass
+
+
+class PropertyGroup(bpy_struct):
+    pass
+
+
+class _MenuType:
+    _draw_funcs = []
+
+    @classmethod
+    def append(cls, func):
+        cls._draw_funcs.append(func)
+
+    @classmethod
+    def remove(cls, func):
+        cls._draw_funcs.remove(func)
+
+
+_registered = {}
+_operators = {}
+
+
+def register_class(cls):
+    if cls.__name__ in _registered:
+        raise ValueError(f"register_class(...): already registered as a subclass '{cls.__name__}'")
+    for name, value in vars(cls).get("__annotations__", {}).items():
+        if isinstance(value, Property):
+            setattr(cls, name, value)
+    _registered[cls.__name__] = cls
+    if issubclass(cls, Operator):
+        _operators[cls.bl_idname] = cls
+
+
+def unregister_class(cls):
+    _registered.pop(cls.__name__, None)
+    if issubclass(cls, Operator):
+        _operators.pop(cls.bl_idname, None)
+
+
+def call_operator(idname, *args, **kwargs):
+    """Run a registered operator's execute like bpy.ops does with EXEC_DEFAULT."""
+    cls = _operators.get(idname)
+    if cls is None:
+        raise AttributeError(f"Calling operator \"bpy.ops.{idname}\" error, could not be found")
+    if hasattr(cls, "poll") and not cls.poll(context):
+        raise RuntimeError(f"Operator bpy.ops.{idname}.poll() failed, context is incorrect")
+    operator = cls()
+    for name, value in kwargs.items():
+        setattr(operator, name, value)
+    reports.clear()
+    return operator.execute(context)
+
+
+def read_factory_settings(use_empty=True, **kwargs):
+    global data, context
+    data = BlendData()
+    context = Context()
+    _bpy.data, _bpy.context = data, context
+    for handler in list(_handlers.load_post):
+        handler(None)
+    return {'FINISHED'}
+
+
+def _select_all(action='TOGGLE'):
+    select = action == 'SELECT' or (action == 'TOGGLE' and not context.selected_objects)
+    for obj in context.view_layer.objects:
+        obj.select_set(select)
+    return {'FINISHED'}
+
+
+BUILTIN_OPERATORS = {
+    "wm.read_factory_settings": read_factory_settings,
+    "wm.read_homefile": read_factory_settings,
+    "object.mode_set": lambda mode='OBJECT', **kwargs: {'FINISHED'},
+    "object.select_all": _select_all,
+}
+
+
+class _OpsCategory:
+    def __init__(self, category):
+        self._category = category
+
+    def __getattr__(self, name):
+        idname = f"{self._category}.{name}"
+        if idname in BUILTIN_OPERATORS:
+            return BUILTIN_OPERATORS[idname]
+        return lambda *args, **kwargs: call_operator(idname, *args, **kwargs)
+
+
+class _Ops(types.ModuleType):
+    def __getattr__(self, category):
+        if category.startswith("__"):
+            raise AttributeError(category)
+        return _OpsCategory(category)
+
+
+# --- Module assembly --------------------------------------------------------------
+
+def _module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+def persistent(func):
+    return func
+
+
+_handlers = _module(
+    "bpy.app.handlers",
+    persistent=persistent,
+    **{name: [] for name in ("depsgraph_update_pre", "depsgraph_update_post", "load_pre", "load_post",
+                             "save_pre", "save_post", "undo_pre", "undo_post", "redo_pre", "redo_post",
+                             "frame_change_pre", "frame_change_post")},
+)
+
+_app = _module("bpy.app", handlers=_handlers, version=(4, 2, 0), version_string="4.2.0 (stand-in)",
+               background=True, binary_path="")
+
+
+class _EnumItems(dict):
+    pass
+
+
+_render_settings_rna = types.SimpleNamespace(properties={
+    "engine": types.SimpleNamespace(enum_items=_EnumItems.fromkeys(
+        ("BLENDER_EEVEE_NEXT", "BLENDER_WORKBENCH", "CYCLES"))),
+})
+
+_types = _module(
+    "bpy.types",
+    bpy_struct=bpy_struct,
+    ID=ID,
+    Operator=Operator,
+    Panel=Panel,
+    PropertyGroup=PropertyGroup,
+    Object=Object,
+    Mesh=Mesh,
+    Material=Material,
+    Camera=Camera,
+    Collection=Collection,
+    Action=Action,
+    NodeTree=NodeTree,
+    Scene=Scene,
+    WindowManager=WindowManager,
+    LayerObjects=LayerObjects,
+    ViewLayer=ViewLayer,
+    Context=Context,
+    OUTLINER_MT_collection=type("OUTLINER_MT_collection", (_MenuType,), {"_draw_funcs": []}),
+    VIEW3D_MT_object=type("VIEW3D_MT_object", (_MenuType,), {"_draw_funcs": []}),
+    RenderSettings=type("RenderSettings", (), {"bl_rna": _render_settings_rna}),
+)
+
+
+def _abspath(path, start=None):
+    if path.startswith("//"):
+        base = os.path.dirname(data.filepath) if data.filepath else os.getcwd()
+        return os.path.join(start or base, path[2:])
+    return path
+
+
+def _ensure_ext(filepath, ext, case_sensitive=False):
+    return filepath if filepath.lower().endswith(ext.lower()) else filepath + ext
+
+
+_bpy = _module(
+    "bpy",
+    data=data,
+    context=context,
+    props=props,
+    types=_types,
+    app=_app,
+    ops=_Ops("bpy.ops"),
+    utils=_module("bpy.utils", register_class=register_class, unregister_class=unregister_class),
+    path=_module("bpy.path", abspath=_abspath, ensure_ext=_ensure_ext),
+    msgbus=_module("bpy.msgbus", subscribe_rna=lambda **kwargs: None, clear_by_owner=lambda owner: None,
+                   publish_rna=lambda **kwargs: None),
+    STANDIN=True,
+)
+
+
+def install():
+    """Register the stand-in modules in sys.modules and return the fake bpy."""
+    if "bpy" in sys.modules and not getattr(sys.modules["bpy"], "STANDIN", False):
+        raise RuntimeError("The real bpy is already imported")
+    sys.modules.update({
+        "bpy": _bpy,
+        "bpy.app": _app,
+        "bpy.app.handlers": _handlers,
+        "bpy.types": _types,
+        "bpy.props": props,
+        "bpy.utils": _bpy.utils,
+        "bpy.path": _bpy.path,
+        "bpy.msgbus": _bpy.msgbus,
+        "bpy.ops": _bpy.ops,
+        "mathutils": _module("mathutils", Vector=Vector, Matrix=Matrix),
+        "bmesh": _module("bmesh"),
+    })
+    return _bpy
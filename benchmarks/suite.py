@@ -0,0 +1,655 @@
+"""Run every operator of the add-on against synthetic scenes of growing size and check how each one scales.
+
+    blender -b --factory-startup -P benchmarks/suite.py -- [--sizes 100 1000 10000] [--output results.json]
+    python benchmarks/suite.py [--sizes 100 1000 10000] [--output results.json]
+
+Inside Blender the real bpy is used. Plain Python (or --standin) runs the same
+cases against the bpy stand-in in standin.py, which only needs numpy, so the
+Python-side loops can be checked in CI.
+
+Size means objects, duplicates, faces, keyframes, materials or timings depending
+on the case. For every case the scaling exponent between the smallest size that
+takes at least min_seconds and the largest size is compared with
+thresholds.json: 1.0 is linear, 2.0 quadratic. With --baseline the time per item
+is also compared with an earlier results file from the same backend. Some cases
+also check the scene the operator left behind. The exit code is 1 when any check
+fails.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from common import BENCH_DIR, Timer, print_table, reset_scene, script_args
+
+# Set by main() once the backend is chosen
+bpy = None
+addon = None
+
+CASES = {}
+# Operators that have no case, with the reason
+SKIPPED = {}
+
+
+def case(name, operator, unit="objects", blender_only=False, check=None):
+    """Register a setup function: it builds the scene for a size and returns the operator's keyword arguments.
+
+    check, if given, runs after the operator and returns a failure message or None.
+    """
+    def decorator(setup):
+        CASES[name] = {"operator": operator, "unit": unit, "blender_only": blender_only, "setup": setup,
+                       "check": check}
+        return setup
+    return decorator
+
+
+def shared_mesh_slots_empty():
+    """Check: coloring Linked Data duplicates only touches their object slots, never the shared mesh."""
+    colored = [mesh.name for mesh in bpy.data.meshes
+               if mesh.users > 1 and any(material is not None for material in mesh.materials)]
+    if colored:
+        return f"shared mesh(es) got a data material: {', '.join(colored[:5])}"
+    return None
+
+
+def no_duplicate_tags():
+    """Check: objects split off a Random Duplicate copy don't inherit its source tag."""
+    tagged = [obj.name for obj in bpy.data.objects if addon.DUPLICATE_SOURCE_PROP in obj]
+    if tagged:
+        return f"split object(s) still tagged as duplicates: {', '.join(tagged[:5])}"
+    return None
+
+
+# --- Scene builders ---------------------------------------------------------------
+
+CUBE_VERTICES = [(x, y, z) for x in (-0.5, 0.5) for y in (-0.5, 0.5) for z in (-0.5, 0.5)]
+CUBE_FACES = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+
+
+def add_cubes(count, spread=None, collection=None, select=True, shared_mesh=True):
+    """Add count cubes at random spots within +-spread (default: about one cube per 4 units squared)."""
+    spread = 2.0 * math.sqrt(count) if spread is None else spread
+    collection = collection or bpy.context.scene.collection
+    rng = np.random.default_rng(0)
+    locations = rng.uniform((-spread, -spread, 0.0), (spread, spread, 0.0), size=(count, 3)).tolist()
+    mesh = None
+    objects = []
+    for index, location in enumerate(locations):
+        if mesh is None or not shared_mesh:
+            mesh = bpy.data.meshes.new("Cube")
+            mesh.from_pydata(CUBE_VERTICES, [], CUBE_FACES)
+        obj = bpy.data.objects.new(f"Cube{index}", mesh)
+        collection.objects.link(obj)
+        obj.location = location
+        obj.select_set(select)
+        objects.append(obj)
+    if objects:
+        bpy.context.view_layer.objects.active = objects[0]
+    return objects
+
+
+def add_mixed_cubes(count, big_every=200, big_size=16.0):
+    """add_cubes, with every big_every-th cube swapped for one big_size times as large."""
+    objects = add_cubes(count)
+    big_mesh = bpy.data.meshes.new("BigCube")
+    big_mesh.from_pydata([tuple(big_size * value for value in vertex) for vertex in CUBE_VERTICES], [], CUBE_FACES)
+    for obj in objects[::big_every]:
+        obj.data = big_mesh
+    return objects
+
+
+def add_grid(face_count):
+    """Add one selected mesh with face_count quads."""
+    columns = max(1, math.ceil(math.sqrt(face_count)))
+    rows = math.ceil(face_count / columns)
+    xs, ys = np.meshgrid(np.arange(columns + 1), np.arange(rows + 1))
+    vertices = np.column_stack([xs.ravel(), ys.ravel(), np.zeros(xs.size)]).tolist()
+    faces = []
+    for index in range(face_count):
+        row, column = divmod(index, columns)
+        first = row * (columns + 1) + column
+        faces.append((first, first + 1, first + columns + 2, first + columns + 1))
+    mesh = bpy.data.meshes.new("Grid")
+    mesh.from_pydata(vertices, [], faces)
+    obj = bpy.data.objects.new("Grid", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    obj.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+    return obj
+
+
+def add_camera(height):
+    """Camera looking straight down at the XY plane from height."""
+    camera = bpy.data.objects.new("Camera", bpy.data.cameras.new("Camera"))
+    bpy.context.scene.collection.objects.link(camera)
+    camera.location = (0.0, 0.0, height)
+    scene = bpy.context.scene
+    scene.camera = camera
+    scene.frame_start, scene.frame_end = 1, 10
+    return camera
+
+
+def add_keyframes(key_count, keys_per_curve=100):
+    """Add selected objects whose location F-curves hold key_count keys in total, written in bulk."""
+    keys_per_curve = min(keys_per_curve, key_count)
+    curve_count = max(1, key_count // keys_per_curve)
+    frames = np.arange(1, keys_per_curve + 1, dtype=np.float32)
+    co = np.column_stack([frames, np.sin(frames * 0.1)]).ravel()
+    objects = add_cubes(math.ceil(curve_count / 3))
+    curves = 0
+    for obj in objects:
+        action = bpy.data.actions.new(name=f"{obj.name}Action")
+        obj.animation_data_create().action = action
+        for index in range(min(3, curve_count - curves)):
+            fcurve = action.fcurves.new("location", index=index)
+            fcurve.keyframe_points.add(keys_per_curve)
+            fcurve.keyframe_points.foreach_set("co", co)
+            fcurve.update()
+            curves += 1
+    bpy.context.scene.frame_set(keys_per_curve // 2)
+    return objects
+
+
+def duplicate_props(size, mode='UNIFORM'):
+    props = bpy.context.scene.random_duplicate_props
+    props.placement_mode = mode
+    props.placement_seed = 1
+    props.use_z_range = False
+    props.x_range = props.y_range = 1.5 * math.sqrt(size) + 5.0
+    return props
+
+
+# --- Cases ---------------------------------------------------------------------------
+
+@case("random_duplicate", "object.random_duplicate", unit="duplicates")
+def setup_random_duplicate(size):
+    add_cubes(1)
+    duplicate_props(size).num_duplicates = size
+
+
+@case("random_duplicate_no_overlap", "object.random_duplicate", unit="duplicates")
+def setup_random_duplicate_no_overlap(size):
+    add_cubes(1)
+    duplicate_props(size, 'POISSON').num_duplicates = size
+
+
+@case("reroll_duplicates", "object.reroll_duplicates", unit="duplicates")
+def setup_reroll_duplicates(size):
+    add_cubes(1)
+    duplicate_props(size).num_duplicates = size
+    bpy.ops.object.random_duplicate()
+    return {"reroll_scale": True, "reroll_colors": True}
+
+
+@case("randomize_location", "object.randomize_location")
+def setup_randomize_location(size):
+    add_cubes(size)
+    duplicate_props(size)
+
+
+@case("randomize_location_no_overlap", "object.randomize_location")
+def setup_randomize_location_no_overlap(size):
+    add_cubes(size)
+    duplicate_props(size, 'POISSON')
+
+
+@case("randomize_location_mixed_sizes", "object.randomize_location")
+def setup_randomize_location_mixed_sizes(size):
+    add_mixed_cubes(size)
+    duplicate_props(size, 'POISSON')
+
+
+@case("random_resize", "object.random_resize")
+def setup_random_resize(size):
+    add_cubes(size)
+    duplicate_props(size)
+
+
+@case("random_resize_no_overlap", "object.random_resize")
+def setup_random_resize_no_overlap(size):
+    add_cubes(size)
+    duplicate_props(size, 'POISSON')
+
+
+@case("random_resize_mixed_sizes", "object.random_resize")
+def setup_random_resize_mixed_sizes(size):
+    add_mixed_cubes(size)
+    duplicate_props(size, 'POISSON')
+
+
+@case("split_faces", "object.split_faces", unit="faces", check=no_duplicate_tags)
+def setup_split_faces(size):
+    # The grid is a Random Duplicate copy of an object outside the view layer
+    source = bpy.data.objects.new("GridSource", bpy.data.meshes.new("GridSource"))
+    add_grid(size)[addon.DUPLICATE_SOURCE_PROP] = source
+
+
+@case("split_faces_islands", "object.split_faces", unit="faces", blender_only=True)
+def setup_split_faces_islands(size):
+    add_grid(size)
+    bpy.context.scene.random_duplicate_props.split_mode = 'ISLANDS'
+
+
+@case("move_to_origin", "object.move_to_origin")
+def setup_move_to_origin(size):
+    for obj in add_cubes(size):
+        obj["original_location"] = (0.0, 0.0, 0.0)
+
+
+@case("set_new_origin", "object.set_new_origin")
+def setup_set_new_origin(size):
+    add_cubes(size)
+
+
+@case("add_material_with_emission", "object.add_material_with_emission")
+def setup_add_material_with_emission(size):
+    add_cubes(size, shared_mesh=False)
+    return {"color": (1.0, 0.0, 0.0, 1.0), "color_name": "Red"}
+
+
+@case("select_by_color", "object.add_material_with_emission")
+def setup_select_by_color(size):
+    material = addon.get_emission_material((1.0, 0.0, 0.0, 1.0), "Red")
+    for obj in add_cubes(size, shared_mesh=False, select=False):
+        addon.assign_material(obj, material)
+    return {"color": (1.0, 0.0, 0.0, 1.0), "color_name": "Red"}
+
+
+@case("add_random_material_with_emission", "object.add_random_material_with_emission")
+def setup_add_random_material_with_emission(size):
+    add_cubes(size, shared_mesh=False)
+
+
+@case("add_random_color_linked", "object.add_random_material_with_emission", check=shared_mesh_slots_empty)
+def setup_add_random_color_linked(size):
+    add_cubes(size)
+
+
+@case("add_random_object_color_keyed", "object.add_random_material_with_emission", check=shared_mesh_slots_empty)
+def setup_add_random_object_color_keyed(size):
+    add_cubes(size)
+    props = bpy.context.scene.random_duplicate_props
+    props.color_mode = 'OBJECT'
+    props.color_keyframe = True
+
+
+def arrange_in_grid(objects):
+    """Move the objects onto a grid with unit spacing, so neighbouring unit cubes touch like split faces."""
+    columns = max(1, math.ceil(math.sqrt(len(objects))))
+    for index, obj in enumerate(objects):
+        row, column = divmod(index, columns)
+        obj.location = (float(column), float(row), 0.0)
+
+
+@case("add_random_color_dsatur", "object.add_random_material_with_emission")
+def setup_add_random_color_dsatur(size):
+    arrange_in_grid(add_cubes(size))
+    props = bpy.context.scene.random_duplicate_props
+    props.color_assignment = 'DSATUR'
+    props.color_seed = 1
+
+
+@case("add_random_color_greedy_camera", "object.add_random_material_with_emission")
+def setup_add_random_color_greedy_camera(size):
+    arrange_in_grid(add_cubes(size))
+    add_camera(2.0 * math.sqrt(size) + 10.0)
+    props = bpy.context.scene.random_duplicate_props
+    props.color_assignment = 'GREEDY'
+    props.color_use_camera = True
+
+
+@case("purge_duplicate_materials", "object.purge_duplicate_materials", unit="materials")
+def setup_purge_duplicate_materials(size):
+    # The materials older versions made: one suffixed copy per object
+    for index, obj in enumerate(add_cubes(size, shared_mesh=False, select=False)):
+        color_name, color = addon.MASK_COLORS[index % len(addon.MASK_COLORS)]
+        material = addon.build_emission_material(bpy.data.materials.new(name=f"{color_name}Material"), color)
+        obj.data.materials.append(material)
+
+
+@case("dedupe_meshes", "object.dedupe_meshes", unit="meshes")
+def setup_dedupe_meshes(size):
+    # What Full Copy duplicates leave behind: one identical cube mesh per object
+    add_cubes(size, shared_mesh=False, select=False)
+
+
+@case("capture_snapshot", "object.capture_snapshot")
+def setup_capture_snapshot(size):
+    # Every other cube in quaternion mode
+    for obj in add_cubes(size)[::2]:
+        obj.rotation_mode = 'QUATERNION'
+    bpy.context.scene.random_duplicate_props.snapshot_name = "Bench"
+
+
+@case("restore_snapshot", "object.restore_snapshot")
+def setup_restore_snapshot(size):
+    setup_capture_snapshot(size)
+    bpy.ops.object.capture_snapshot()
+    bpy.ops.object.randomize_location()
+    bpy.context.scene.random_duplicate_props.snapshot_keyframe = True
+    return {"snapshot_name": "Bench"}
+
+
+@case("remove_snapshot", "object.remove_snapshot")
+def setup_remove_snapshot(size):
+    setup_capture_snapshot(size)
+    bpy.ops.object.capture_snapshot()
+    return {"snapshot_name": "Bench"}
+
+
+@case("set_resolution", "render.set_resolution", unit="calls")
+def setup_set_resolution(size):
+    return {"resolution": 512}
+
+
+@case("fix_color", "render.fix_color", unit="calls")
+def setup_fix_color(size):
+    pass
+
+
+@case("mask_render_mode", "render.mask_render_mode", unit="calls")
+def setup_mask_render_mode(size):
+    return {"engine": 'WORKBENCH'}
+
+
+@case("restore_render_settings", "render.restore_render_settings", unit="calls")
+def setup_restore_render_settings(size):
+    bpy.ops.render.mask_render_mode(engine='EEVEE')
+
+
+@case("hide_offscreen", "render.hide_offscreen")
+def setup_hide_offscreen(size):
+    add_cubes(size, select=False)
+    add_camera(2.0 * math.sqrt(size) + 10.0)
+
+
+@case("unhide_offscreen", "render.unhide_offscreen")
+def setup_unhide_offscreen(size):
+    setup_hide_offscreen(size)
+    bpy.ops.render.hide_offscreen()
+
+
+@case("export_mask_metadata", "render.export_mask_metadata")
+def setup_export_mask_metadata(size):
+    add_cubes(size, select=False)
+    add_camera(2.0 * math.sqrt(size) + 10.0)
+    return {"filepath": os.path.join(tempfile.gettempdir(), "bench_mask_metadata.npz"), "file_format": 'NPZ'}
+
+
+@case("export_layout", "object.export_layout")
+def setup_export_layout(size):
+    # Split-face style: one mesh per tile, all with an original location
+    for obj in add_cubes(size, shared_mesh=False):
+        obj["original_location"] = obj.location.copy()
+    return {"filepath": os.path.join(tempfile.gettempdir(), "bench_layout.json")}
+
+
+def stored_layout(size):
+    """Write a layout of size cubes and delete the objects again, so importing has to recreate them."""
+    filepath = os.path.join(tempfile.gettempdir(), "bench_layout_import.json")
+    objects = add_cubes(size)
+    addon.write_layout(filepath, "", objects)
+    bpy.data.batch_remove(objects)
+    return filepath
+
+
+@case("import_layout", "object.import_layout")
+def setup_import_layout(size):
+    return {"filepath": stored_layout(size)}
+
+
+@case("import_layout_camera", "object.import_layout")
+def setup_import_layout_camera(size):
+    filepath = stored_layout(size)
+    # Looks at about a quarter of the layout
+    add_camera(math.sqrt(size) + 5.0)
+    return {"filepath": filepath, "load": 'CAMERA', "frame": 1}
+
+
+@case("remove_past_keyframes", "anim.remove_past_keyframes", unit="keys")
+def setup_remove_past_keyframes(size):
+    add_keyframes(size)
+
+
+@case("remove_future_keyframes", "anim.remove_future_keyframes", unit="keys")
+def setup_remove_future_keyframes(size):
+    add_keyframes(size)
+
+
+@case("keyframe_handoff", "anim.keyframe_handoff", check=shared_mesh_slots_empty)
+def setup_keyframe_handoff(size):
+    # Objects with 100 keys on each location channel, handed off at three frames
+    add_keyframes(300 * size)
+    return {"frames": "25, 50, 75"}
+
+
+@case("keyframe_handoff_shared", "anim.keyframe_handoff")
+def setup_keyframe_handoff_shared(size):
+    # Linked duplicates playing one action: trimmed once per segment, not once per object
+    objects = add_keyframes(300 * size)
+    action = objects[0].animation_data.action
+    for obj in objects[1:]:
+        obj.animation_data.action = action
+    return {"frames": "25, 50, 75"}
+
+
+@case("bake_random_motion", "anim.bake_random_motion")
+def setup_bake_random_motion(size):
+    # Drift on X and Y over 500 frames, with key reduction
+    add_cubes(size)
+    duplicate_props(size)
+    scene = bpy.context.scene
+    scene.frame_start, scene.frame_end = 1, 500
+    return {"motion": 'NOISE'}
+
+
+@case("bake_random_motion_scatter", "anim.bake_random_motion")
+def setup_bake_random_motion_scatter(size):
+    add_cubes(size)
+    duplicate_props(size)
+    scene = bpy.context.scene
+    scene.frame_start, scene.frame_end = 1, 500
+    return {"motion": 'SCATTER', "use_scale": True, "reduce_keys": False}
+
+
+@case("select_all_in_groups", "object.select_all_in_groups", unit="calls")
+def setup_select_all_in_groups(size):
+    pass
+
+
+@case("select_group_objects", "outliner.select_group_objects")
+def setup_select_group_objects(size):
+    collection = bpy.data.collections.new("BenchGroup")
+    bpy.context.scene.collection.children.link(collection)
+    add_cubes(size, collection=collection, select=False)
+    bpy.context.scene.select_all_in_groups = True
+    return {"group_name": collection.name}
+
+
+def fill_timing_history(size):
+    bpy.context.window_manager.mask_timing = True
+    for _ in range(min(size, 50)):
+        bpy.ops.render.fix_color()
+
+
+@case("export_operator_timings", "wm.export_operator_timings", unit="timings")
+def setup_export_operator_timings(size):
+    fill_timing_history(size)
+    return {"filepath": os.path.join(tempfile.gettempdir(), "bench_operator_timings.json")}
+
+
+@case("clear_operator_timings", "wm.clear_operator_timings", unit="timings")
+def setup_clear_operator_timings(size):
+    fill_timing_history(size)
+
+
+# --- Running and checking ---------------------------------------------------------------
+
+def load_bpy(use_standin):
+    """Return (bpy, backend name), falling back to the stand-in when bpy can't be imported."""
+    if not use_standin:
+        try:
+            import bpy as real_bpy
+            return real_bpy, "blender"
+        except ImportError:
+            pass
+    import standin
+    return standin.install(), "standin"
+
+
+def check_coverage():
+    """Every operator in the add-on's classes needs a case or a reason to skip it."""
+    covered = {spec["operator"] for spec in CASES.values()} | set(SKIPPED)
+    missing = [cls.bl_idname for cls in addon.classes
+               if issubclass(cls, bpy.types.Operator) and cls.bl_idname not in covered]
+    if missing:
+        raise SystemExit(f"No benchmark case for: {', '.join(missing)}")
+
+
+def run_case(name, size):
+    spec = CASES[name]
+    reset_scene()
+    # Start every run cold, like the first export after opening a file
+    addon._metadata_cache.clear()
+    addon._visibility_cache.clear()
+    kwargs = spec["setup"](size) or {}
+    category, operator = spec["operator"].split(".")
+    with Timer() as timer:
+        result = getattr(getattr(bpy.ops, category), operator)(**kwargs)
+    problem = spec["check"]() if spec["check"] is not None else None
+    return timer.elapsed, sorted(result), problem
+
+
+def scaling_exponent(rows, min_seconds):
+    """log-log slope of time over size between the smallest measurable size and the largest one."""
+    rows = sorted((row for row in rows if row["seconds"] >= min_seconds), key=lambda row: row["size"])
+    if len(rows) < 2 or rows[0]["size"] == rows[-1]["size"]:
+        return None
+    first, last = rows[0], rows[-1]
+    return math.log(last["seconds"] / first["seconds"]) / math.log(last["size"] / first["size"])
+
+
+def check_results(report, thresholds, baseline=None, tolerance=1.5):
+    """Return a list of failure messages for scaling above the thresholds or slowdowns against the baseline."""
+    failures = []
+    min_seconds = thresholds.get("min_seconds", 0.005)
+    for name, exponent in report["scaling"].items():
+        limit = thresholds.get("cases", {}).get(name, thresholds.get("max_exponent", 1.25))
+        if exponent is not None and exponent > limit:
+            failures.append(f"{name}: scales as size^{exponent:.2f}, limit {limit}")
+
+    if baseline is not None and baseline.get("backend") == report["backend"]:
+        previous = {(row["case"], row["size"]): row for row in baseline["results"]}
+        for row in report["results"]:
+            old = previous.get((row["case"], row["size"]))
+            if old is None or row["seconds"] < min_seconds:
+                continue
+            if row["us_per_item"] > old["us_per_item"] * tolerance:
+                failures.append(f"{row['case']} @ {row['size']}: {row['us_per_item']} us/item, "
+                                f"baseline {old['us_per_item']} us/item")
+    return failures
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Scaling benchmarks for every add-on operator")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="scene sizes to run every case at, up to 100000")
+    parser.add_argument("--cases", nargs="+", help="only run these cases")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per size, the fastest one counts")
+    parser.add_argument("--standin", action="store_true", help="use the bpy stand-in even if bpy can be imported")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--thresholds", default=os.path.join(BENCH_DIR, "thresholds.json"))
+    parser.add_argument("--baseline", help="results JSON of an earlier run to compare time per item with")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor against the baseline")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args(argv)
+
+    global bpy, addon
+    bpy, backend = load_bpy(args.standin)
+    from common import load_addon
+    addon = load_addon()
+    check_coverage()
+
+    if args.list:
+        print_table([{"case": name, "operator": spec["operator"], "unit": spec["unit"]}
+                     for name, spec in CASES.items()], ["case", "operator", "unit"])
+        return 0
+
+    names = args.cases or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    with open(args.thresholds) as stream:
+        thresholds = json.load(stream)
+
+    results, skipped = [], {}
+    for name in names:
+        spec = CASES[name]
+        if spec["blender_only"] and backend != "blender":
+            skipped[name] = "needs Blender"
+            continue
+        for size in sorted(args.sizes):
+            runs = [run_case(name, size) for _ in range(max(1, args.repeat))]
+            seconds = min(elapsed for elapsed, _, _ in runs)
+            # Settings operators do the same work at every size
+            items = 1 if spec["unit"] == "calls" else size
+            row = {
+                "case": name,
+                "operator": spec["operator"],
+                "unit": spec["unit"],
+                "size": size,
+                "seconds": round(seconds, 6),
+                "us_per_item": round(1e6 * seconds / items, 3),
+                "result": runs[0][1],
+            }
+            if runs[0][2] is not None:
+                row["problem"] = runs[0][2]
+            results.append(row)
+            print(f"{name:<34} {size:>7} {spec['unit']:<10} {seconds:9.4f}s  {row['us_per_item']:9.2f} us/item",
+                  flush=True)
+
+    min_seconds = thresholds.get("min_seconds", 0.005)
+    report = {
+        "backend": backend,
+        "blender": bpy.app.version_string,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "addon_version": list(addon.bl_info["version"]),
+        "sizes": sorted(args.sizes),
+        "results": results,
+        "skipped": skipped,
+        "scaling": {name: scaling_exponent([row for row in results if row["case"] == name], min_seconds)
+                    for name in names if name not in skipped},
+    }
+    not_finished = [f"{row['case']} @ {row['size']}: returned {row['result']}"
+                    for row in results if row["result"] != ["FINISHED"]]
+    not_finished += [f"{row['case']} @ {row['size']}: {row['problem']}" for row in results if "problem" in row]
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as stream:
+            baseline = json.load(stream)
+    report["failures"] = not_finished + check_results(report, thresholds, baseline, args.tolerance)
+
+    print()
+    print_table([{"case": name, "exponent": "n/a" if exponent is None else round(exponent, 2)}
+                 for name, exponent in report["scaling"].items()], ["case", "exponent"])
+    for name, reason in skipped.items():
+        print(f"skipped {name}: {reason}")
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(report, out, indent=2)
+    for failure in report["failures"]:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(script_args() if "--" in sys.argv else sys.argv[1:]))
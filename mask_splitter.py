@@ -0,0 +1,174 @@
+"""Split rendered RGB CMY K W mask frames into one binary mask per palette color.
+
+    python mask_splitter.py renders/ --output masks/ [--format png|npz] [--workers 8]
+
+Frames are streamed through a process pool with a bounded number of frames in
+flight, so memory stays flat no matter how long the sequence is. Each pixel is
+matched against the add-on's palette with the same per-channel tolerance as
+compare_colors; pixels that match no palette color end up in no mask.
+
+PNG output writes masks/<Color>/<frame>.png as 1-bit images. npz output writes
+masks/<frame>.npz holding a bit-packed array per color plus the frame shape.
+Reading and writing PNGs needs Pillow.
+"""
+import argparse
+import concurrent.futures
+import glob
+import math
+import os
+import sys
+
+import numpy as np
+
+# Keep in sync with MASK_COLORS and COLOR_TOLERANCE in random_object_duplicate_plus.py
+PALETTE = (
+    ("Red", (1.0, 0.0, 0.0)),
+    ("Green", (0.0, 1.0, 0.0)),
+    ("Blue", (0.0, 0.0, 1.0)),
+    ("Cyan", (0.0, 1.0, 1.0)),
+    ("Magenta", (1.0, 0.0, 1.0)),
+    ("Yellow", (1.0, 1.0, 0.0)),
+    ("Black", (0.0, 0.0, 0.0)),
+    ("White", (1.0, 1.0, 1.0)),
+)
+COLOR_TOLERANCE = 0.01
+UNMATCHED = 255
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp")
+
+
+def _pillow():
+    try:
+        from PIL import Image
+    except ImportError:
+        raise SystemExit("Reading and writing mask images needs Pillow: pip install pillow")
+    return Image
+
+
+def classify(pixels, palette=PALETTE, tolerance=COLOR_TOLERANCE):
+    """Return a uint8 label image: the palette index of every pixel, or UNMATCHED.
+
+    pixels is an (H, W, 3+) uint8 or float array. A pixel matches a color when
+    every channel is within tolerance, like compare_colors.
+    """
+    pixels = np.asarray(pixels)
+
+    def within(channel, value):
+        if pixels.dtype == np.uint8:
+            # Integer bounds equivalent to |pixel - value * 255| < tolerance * 255, no float temporaries
+            low = math.floor(value * 255 - tolerance * 255) + 1
+            high = math.ceil(value * 255 + tolerance * 255) - 1
+            data = pixels[..., channel]
+            return (data >= max(low, 0)) & (data <= min(high, 255))
+        return np.abs(pixels[..., channel] - value) < tolerance
+
+    # One mask per distinct (channel, value) pair; palette colors are ANDs of three of them
+    channel_masks = {}
+    for _, color in palette:
+        for channel, value in enumerate(color):
+            key = (channel, value)
+            if key not in channel_masks:
+                channel_masks[key] = within(channel, value)
+
+    labels = np.full(pixels.shape[:2], UNMATCHED, dtype=np.uint8)
+    for index, (_, color) in enumerate(palette):
+        match = channel_masks[(0, color[0])] & channel_masks[(1, color[1])] & channel_masks[(2, color[2])]
+        labels[match] = index
+    return labels
+
+
+def frame_outputs(path, output_dir, fmt):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if fmt == "npz":
+        return [os.path.join(output_dir, stem + ".npz")]
+    return [os.path.join(output_dir, name, stem + ".png") for name, _ in PALETTE]
+
+
+def split_frame(path, output_dir, fmt="png"):
+    """Split one frame on disk; returns (path, {color name: covered pixel count})."""
+    Image = _pillow()
+    with Image.open(path) as image:
+        pixels = np.asarray(image.convert("RGB"))
+    labels = classify(pixels)
+    coverage = {}
+    masks = {}
+    for index, (name, _) in enumerate(PALETTE):
+        mask = labels == index
+        coverage[name] = int(np.count_nonzero(mask))
+        masks[name] = mask
+
+    outputs = frame_outputs(path, output_dir, fmt)
+    if fmt == "npz":
+        packed = {name: np.packbits(mask, axis=-1) for name, mask in masks.items()}
+        np.savez_compressed(outputs[0], shape=np.array(labels.shape), **packed)
+    else:
+        for output, (name, _) in zip(outputs, PALETTE):
+            Image.fromarray(masks[name].astype(np.uint8) * 255).convert("1", dither=0).save(output, optimize=True)
+    return path, coverage
+
+
+def load_npz_mask(path, color_name):
+    """Unpack one color's mask from an npz written by split_frame."""
+    with np.load(path) as data:
+        height, width = data["shape"]
+        return np.unpackbits(data[color_name], axis=-1, count=width).astype(bool)
+
+
+def iter_frames(source):
+    """Yield the image paths of a sequence given a directory or a glob pattern, in order."""
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)
+                 if name.lower().endswith(IMAGE_EXTENSIONS)]
+    else:
+        paths = glob.glob(source)
+    yield from sorted(paths)
+
+
+def split_sequence(paths, output_dir, fmt="png", workers=None, max_pending=None, overwrite=False):
+    """Split frames in a process pool, yielding (path, coverage) as frames finish.
+
+    At most max_pending frames are queued at once to bound memory use. Frames whose
+    outputs all exist are skipped unless overwrite is set.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if fmt == "png":
+        for name, _ in PALETTE:
+            os.makedirs(os.path.join(output_dir, name), exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for path in paths:
+            if not overwrite and all(os.path.exists(out) for out in frame_outputs(path, output_dir, fmt)):
+                continue
+            if len(pending) >= max_pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(split_frame, path, output_dir, fmt))
+        for future in concurrent.futures.as_completed(pending):
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split rendered palette frames into per-color binary masks")
+    parser.add_argument("source", help="directory of frames or a glob pattern such as 'renders/mask_*.png'")
+    parser.add_argument("--output", required=True, help="directory for the masks")
+    parser.add_argument("--format", choices=("png", "npz"), default="png")
+    parser.add_argument("--workers", type=int, help="processes to use (default: all cores)")
+    parser.add_argument("--overwrite", action="store_true", help="redo frames whose masks already exist")
+    args = parser.parse_args(argv)
+
+    count = 0
+    for path, coverage in split_sequence(iter_frames(args.source), args.output, args.format,
+                                         args.workers, overwrite=args.overwrite):
+        count += 1
+        covered = ", ".join(f"{name} {pixels}" for name, pixels in coverage.items() if pixels)
+        print(f"{os.path.basename(path)}: {covered or 'no palette pixels'}", flush=True)
+    print(f"Split {count} frame(s) into {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,20 @@
 import bpy
-import random
-from bpy_extras.object_utils import world_to_camera_view
-import mathutils
+import bmesh
+from bpy.app.handlers import persistent
+import collections
+import cProfile
+import functools
+import hashlib
+import heapq
+import io
+import json
+import math
+import numpy as np
+import os
+import pstats
+import re
+import time
+import traceback
 
 bl_info = {
     "name": "Random Duplicate Objects with Extended Features",
@@ -15,184 +28,2224 @@ bl_info = {
     "tracker_url": "https://github.com/KewkLW/blender_helper_of_masks_thing",
 }
 
+def camera_view_projection(scene, camera, depsgraph=None):
+    """Return the camera's 4x4 view-projection matrix for the scene's render settings."""
+    render = scene.render
+    projection = camera.calc_matrix_camera(
+        depsgraph or bpy.context.evaluated_depsgraph_get(),
+        x=render.resolution_x,
+        y=render.resolution_y,
+        scale_x=render.pixel_aspect_x,
+        scale_y=render.pixel_aspect_y,
+    )
+    return np.array(projection) @ np.array(camera.matrix_world.inverted())
+
+def gather_bounds(objects):
+    """Return (world matrices (N, 4, 4), local bound box corners (N, 8, 3)) for the objects."""
+    matrices = np.array([obj.matrix_world for obj in objects], dtype=np.float64).reshape(-1, 4, 4)
+    corners = np.array([obj.bound_box for obj in objects], dtype=np.float64).reshape(-1, 8, 3)
+    return matrices, corners
+
+def project_bounds(matrices, corners, view_projection):
+    """Project bound boxes into the camera in one batch.
+
+    Returns (visible, screen_min, screen_max). Screen coordinates use the same
+    0..1 frame space as world_to_camera_view. Boxes crossing the camera plane
+    are treated as visible and span the whole frame.
+    """
+    count = len(matrices)
+    homogeneous = np.concatenate([corners, np.ones((count, 8, 1))], axis=2)
+    clip = np.einsum('nij,ncj->nci', np.matmul(view_projection, matrices), homogeneous)
+    w = clip[..., 3]
+    in_front = w > 1e-6
+    all_in_front = in_front.all(axis=1)
+    any_in_front = in_front.any(axis=1)
+
+    ndc = clip[..., :3] / np.where(in_front, w, 1.0)[..., None]
+    ndc_min = np.where(in_front[..., None], ndc, np.inf).min(axis=1)
+    ndc_max = np.where(in_front[..., None], ndc, -np.inf).max(axis=1)
+    overlaps = ((ndc_min <= 1.0) & (ndc_max >= -1.0)).all(axis=1)
+
+    visible = np.where(all_in_front, overlaps, any_in_front)
+    straddling = any_in_front & ~all_in_front
+    ndc_min[straddling, :2] = -1.0
+    ndc_max[straddling, :2] = 1.0
+    screen_min = np.clip((ndc_min[:, :2] + 1.0) * 0.5, 0.0, 1.0)
+    screen_max = np.clip((ndc_max[:, :2] + 1.0) * 0.5, 0.0, 1.0)
+    return visible, screen_min, screen_max
+
+def visible_objects(objects, camera, scene):
+    """Return the set of names of objects whose bounds fall inside the camera frustum."""
+    objects = list(objects)
+    if not objects:
+        return set()
+    matrices, corners = gather_bounds(objects)
+    visible, _, _ = project_bounds(matrices, corners, camera_view_projection(scene, camera))
+    return {obj.name for obj, is_visible in zip(objects, visible) if is_visible}
+
 def is_object_visible(obj, camera, scene):
     """Check if the object is visible in the camera's view."""
-    for corner in obj.bound_box:
-        world_corner = obj.matrix_world @ mathutils.Vector(corner)
-        co_ndc = world_to_camera_view(scene, camera, world_corner)
-        if 0.0 <= co_ndc.x <= 1.0 and 0.0 <= co_ndc.y <= 1.0 and 0.0 <= co_ndc.z <= 1.0:
-            return True
-    return False
+    return obj.name in visible_objects([obj], camera, scene)
+
+# (camera, object matrices, bounds) hash -> visibility mask
+_visibility_cache = {}
+
+def visibility_over_frames(scene, camera, objects, frames):
+    """Return {frame: visibility mask aligned with objects}, reusing results for unchanged frames."""
+    objects = list(objects)
+    names_key = hashlib.blake2b("\0".join(obj.name for obj in objects).encode(), digest_size=16).digest()
+    current_frame = scene.frame_current
+    results = {}
+    try:
+        for frame in frames:
+            scene.frame_set(frame)
+            view_projection = camera_view_projection(scene, camera)
+            matrices, corners = gather_bounds(objects)
+            key = hashlib.blake2b(names_key + view_projection.tobytes() + matrices.tobytes() + corners.tobytes(),
+                                  digest_size=16).digest()
+            visible = _visibility_cache.get(key)
+            if visible is None:
+                if len(_visibility_cache) > 4096:
+                    _visibility_cache.clear()
+                visible = project_bounds(matrices, corners, view_projection)[0]
+                _visibility_cache[key] = visible
+            results[frame] = visible
+    finally:
+        scene.frame_set(current_frame)
+    return results
+
+# RGB CMY K W palette used for ComfyUI masks
+MASK_COLORS = (
+    ("Red", (1.0, 0.0, 0.0, 1.0)),
+    ("Green", (0.0, 1.0, 0.0, 1.0)),
+    ("Blue", (0.0, 0.0, 1.0, 1.0)),
+    ("Cyan", (0.0, 1.0, 1.0, 1.0)),
+    ("Magenta", (1.0, 0.0, 1.0, 1.0)),
+    ("Yellow", (1.0, 1.0, 0.0, 1.0)),
+    ("Black", (0.0, 0.0, 0.0, 1.0)),
+    ("White", (1.0, 1.0, 1.0, 1.0))
+)
+
+# Custom property marking a pooled material, holding its (r, g, b, a, strength) key
+POOL_KEY_PROP = "mask_pool_key"
+
+# Pool key -> material name; validated on every lookup so undo and file loads can't leave it stale
+_material_pool = {}
+
+LEGACY_MATERIAL_PATTERN = re.compile(r"^(?P<color_name>.+)Material(\.\d+)?$")
+
+def material_pool_key(color, strength=1.0):
+    return tuple(round(float(c), 4) for c in color[:4]) + (round(float(strength), 4),)
+
+def _pooled_material(key):
+    name = _material_pool.get(key)
+    material = bpy.data.materials.get(name) if name is not None else None
+    if material is not None and tuple(material.get(POOL_KEY_PROP, ())) == key:
+        return material
+    return None
+
+def rebuild_material_pool():
+    _material_pool.clear()
+    for material in bpy.data.materials:
+        key = material.get(POOL_KEY_PROP)
+        if key is not None:
+            _material_pool.setdefault(tuple(key), material.name)
+
+def build_emission_material(material, color, strength=1.0):
+    material.use_nodes = True
+    material.diffuse_color = color
+    nodes = material.node_tree.nodes
+    links = material.node_tree.links
+
+    # Clear default nodes
+    for node in list(nodes):
+        nodes.remove(node)
+
+    # Create emission shader
+    emission = nodes.new(type='ShaderNodeEmission')
+    emission.location = (0, 0)
+    emission.inputs['Color'].default_value = color
+    emission.inputs['Strength'].default_value = strength
+
+    # Create material output
+    material_output = nodes.new(type='ShaderNodeOutputMaterial')
+    material_output.location = (200, 0)
+
+    # Link emission to material output
+    links.new(emission.outputs['Emission'], material_output.inputs['Surface'])
+    return material
+
+def get_emission_material(color, color_name, strength=1.0):
+    """Return the shared emission material for (color, strength), creating it on first use."""
+    key = material_pool_key(color, strength)
+    material = _pooled_material(key)
+    if material is None:
+        rebuild_material_pool()
+        material = _pooled_material(key)
+    if material is None:
+        material = build_emission_material(bpy.data.materials.new(name=f"{color_name}Material"), color, strength)
+        material[POOL_KEY_PROP] = key
+        _material_pool[key] = material.name
+    return material
+
+def assign_material(obj, material):
+    shared = obj.data.users > 1
+    if len(obj.data.materials) == 0:
+        # An empty slot on a shared mesh, so the other users don't pick up the color
+        obj.data.materials.append(None if shared else material)
+    if shared:
+        # Linked duplicates share one mesh, so keep the material on the object slot
+        obj.material_slots[0].link = 'OBJECT'
+        obj.material_slots[0].material = material
+    else:
+        obj.data.materials[0] = material
 
 def add_material_with_emission(obj, color, color_name):
     if obj.type == 'MESH':
-        material = bpy.data.materials.new(name=f"{color_name}Material")
-        material.use_nodes = True
-        nodes = material.node_tree.nodes
-        links = material.node_tree.links
-        
-        # Clear default nodes
-        for node in nodes:
-            nodes.remove(node)
-        
-        # Create emission shader
-        emission = nodes.new(type='ShaderNodeEmission')
-        emission.location = (0, 0)
-        emission.inputs['Color'].default_value = color
-        emission.inputs['Strength'].default_value = 1
-        
-        # Create material output
-        material_output = nodes.new(type='ShaderNodeOutputMaterial')
-        material_output.location = (200, 0)
-        
-        # Link emission to material output
-        links.new(emission.outputs['Emission'], material_output.inputs['Surface'])
-        
-        # Assign the material to the object
-        if len(obj.data.materials) > 0:
-            obj.data.materials[0] = material
-        else:
-            obj.data.materials.append(material)
-        
-        print(f"Added {color_name} material with emission to {obj.name}")
+        assign_material(obj, get_emission_material(color, color_name))
+
+def single_emission_node(material):
+    """Return the emission node of a plain emission -> output material, or None."""
+    if not material.use_nodes or material.node_tree is None:
+        return None
+    nodes = material.node_tree.nodes
+    if len(nodes) != 2:
+        return None
+    emission = next((node for node in nodes if node.type == 'EMISSION'), None)
+    if emission is None or not any(node.type == 'OUTPUT_MATERIAL' for node in nodes):
+        return None
+    return emission
+
+OBJECT_COLOR_MATERIAL = "MaskObjectColorMaterial"
+
+def get_object_color_material():
+    """Shared emission material that takes its color from each object's Object Color."""
+    material = bpy.data.materials.get(OBJECT_COLOR_MATERIAL)
+    if material is not None:
+        return material
+    material = bpy.data.materials.new(name=OBJECT_COLOR_MATERIAL)
+    material.use_nodes = True
+    nodes = material.node_tree.nodes
+    for node in list(nodes):
+        nodes.remove(node)
+    object_info = nodes.new(type='ShaderNodeObjectInfo')
+    object_info.location = (-200, 0)
+    emission = nodes.new(type='ShaderNodeEmission')
+    emission.location = (0, 0)
+    material_output = nodes.new(type='ShaderNodeOutputMaterial')
+    material_output.location = (200, 0)
+    material.node_tree.links.new(object_info.outputs['Color'], emission.inputs['Color'])
+    material.node_tree.links.new(emission.outputs['Emission'], material_output.inputs['Surface'])
+    return material
+
+def uses_object_color(obj):
+    return any(slot.material is not None and slot.material.name == OBJECT_COLOR_MATERIAL
+               for slot in obj.material_slots)
+
+def apply_mask_color(obj, color, color_name, mode='MATERIAL'):
+    """Give a mesh a palette color, either as a pooled material or as its animatable Object Color.
+
+    Object Color changes are keyed separately, for every object at once, by key_mask_colors.
+    """
+    if obj.type != 'MESH':
+        return
+    if mode == 'OBJECT':
+        if not uses_object_color(obj):
+            assign_material(obj, get_object_color_material())
+        obj.color = color
+    else:
+        add_material_with_emission(obj, color, color_name)
+
+def key_mask_colors(objects, frame=None):
+    """Keyframe the Object Color of the objects on the Object Color material, creating each color F-curve once."""
+    keyed = [obj for obj in objects if obj.type == 'MESH' and uses_object_color(obj)]
+    if keyed:
+        frame = bpy.context.scene.frame_current if frame is None else frame
+        key_objects(keyed, "color", [tuple(obj.color) for obj in keyed], frame, group="")
+
+def get_group_collection(context, group_name):
+    """Return the collection named group_name, creating and linking it to the scene if needed."""
+    if not group_name:
+        return context.collection
+    collection = bpy.data.collections.get(group_name)
+    if collection is None:
+        collection = bpy.data.collections.new(group_name)
+    if collection not in context.scene.collection.children_recursive:
+        context.scene.collection.children.link(collection)
+    return collection
+
+def axis_ranges(props):
+    # Disabled axes get a range of 0
+    return np.array([
+        props.x_range if props.use_x_range else 0.0,
+        props.y_range if props.use_y_range else 0.0,
+        props.z_range if props.use_z_range else 0.0,
+    ])
+
+def random_offsets(props, count, rng=np.random):
+    # Draw all offsets in one batch; disabled axes stay at 0
+    return rng.uniform(-1.0, 1.0, size=(count, 3)) * axis_ranges(props)
+
+def placement_rng(props):
+    """Random generator for a layout; seed 0 gives a new layout on every run."""
+    return np.random.default_rng(props.placement_seed or None)
+
+def bounding_radii(objects, scales=None):
+    """Radius of a sphere around each object's origin that holds its scaled bound box.
 
-class OBJECT_OT_random_duplicate(bpy.types.Operator):
+    scales overrides the objects' own scale, e.g. np.ones((N, 3)) for the unscaled radius.
+    """
+    _, corners = gather_bounds(objects)
+    if scales is None:
+        scales = np.array([obj.scale for obj in objects], dtype=np.float64).reshape(-1, 3)
+    return np.linalg.norm(corners * np.abs(scales)[:, None, :], axis=2).max(axis=1, initial=0.0)
+
+class SpatialHash:
+    """Sphere centers bucketed by size on uniform grids.
+
+    Spheres up to half the base cell across go on the base grid, and every
+    doubling of the radius above that gets a grid with twice the cell. A
+    lookup only scans the cells each grid's largest sphere could reach from
+    the query, so a few big spheres don't make every small lookup scan big
+    cells full of small ones, and each lookup stays about O(1).
+    """
+
+    def __init__(self, cell):
+        self.cell = max(cell, 1e-6)
+        # level -> (cell size, {cell key: [indices]})
+        self.levels = {}
+        self.positions = []
+        self.radii = []
+
+    def insert(self, position, radius, extent=None):
+        """Add a sphere and return its index; extent is the largest its radius may grow to later."""
+        extent = radius if extent is None else extent
+        level = max(0, math.frexp(2.0 * extent / self.cell)[1])
+        if level not in self.levels:
+            self.levels[level] = (self.cell * 2 ** level, {})
+        cell, grid = self.levels[level]
+        key = tuple(math.floor(value / cell) for value in position)
+        grid.setdefault(key, []).append(len(self.positions))
+        self.positions.append(tuple(position))
+        self.radii.append(radius)
+        return len(self.positions) - 1
+
+    def nearby(self, position, radius):
+        """Yield the index of every sphere that may overlap a sphere of radius at position."""
+        px, py, pz = position
+        for cell, grid in self.levels.values():
+            reach = radius + 0.5 * cell
+            x0, y0, z0 = math.floor((px - reach) / cell), math.floor((py - reach) / cell), math.floor((pz - reach) / cell)
+            x1, y1, z1 = math.floor((px + reach) / cell), math.floor((py + reach) / cell), math.floor((pz + reach) / cell)
+            if (x1 - x0 + 1) * (y1 - y0 + 1) * (z1 - z0 + 1) > len(grid):
+                # A big query over a grid of small spheres: cheaper to walk the filled cells
+                for (x, y, z), indices in grid.items():
+                    if x0 <= x <= x1 and y0 <= y <= y1 and z0 <= z <= z1:
+                        yield from indices
+                continue
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    for z in range(z0, z1 + 1):
+                        indices = grid.get((x, y, z))
+                        if indices:
+                            yield from indices
+
+    def fits(self, position, radius):
+        px, py, pz = position
+        positions, radii = self.positions, self.radii
+        for index in self.nearby(position, radius):
+            ox, oy, oz = positions[index]
+            limit = radius + radii[index]
+            if (px - ox) * (px - ox) + (py - oy) * (py - oy) + (pz - oz) * (pz - oz) < limit * limit:
+                return False
+        return True
+
+def poisson_disk_positions(lows, highs, radii, rng, attempts=30, obstacles=()):
+    """Pick a point inside lows[i]..highs[i] for every radii[i] so that no two spheres overlap.
+
+    Dart throwing over a SpatialHash: each sphere tries up to `attempts` random
+    points and only checks its neighbouring cells, so the cost is linear in the
+    number of spheres. obstacles is a sequence of (position, radius) to keep
+    clear of. Returns (positions (N, 3), number of spheres left overlapping
+    because their box was full).
+    """
+    radii = np.asarray(radii, dtype=np.float64)
+    obstacles = list(obstacles)
+    # Cells sized for a typical sphere; bigger ones go on coarser grids
+    all_radii = np.concatenate([radii, [radius for _, radius in obstacles]])
+    spatial_hash = SpatialHash(2.0 * float(np.median(all_radii)) if len(all_radii) else 0.0)
+    for position, radius in obstacles:
+        spatial_hash.insert(position, radius)
+
+    # First darts for everyone in one batch; only rejected spheres draw more
+    lows = np.broadcast_to(np.asarray(lows, dtype=np.float64), (len(radii), 3))
+    highs = np.broadcast_to(np.asarray(highs, dtype=np.float64), (len(radii), 3))
+    first = rng.uniform(lows, highs).tolist()
+    positions = np.empty((len(radii), 3))
+    overlapping = 0
+    for index, radius in enumerate(radii.tolist()):
+        position = first[index]
+        if not spatial_hash.fits(position, radius):
+            candidates = rng.uniform(lows[index], highs[index], size=(attempts - 1, 3)).tolist()
+            position = next((candidate for candidate in candidates if spatial_hash.fits(candidate, radius)), None)
+            if position is None:
+                position = candidates[-1] if candidates else first[index]
+                overlapping += 1
+        spatial_hash.insert(position, radius)
+        positions[index] = position
+    return positions, overlapping
+
+def fit_scales(positions, base_radii, scales, min_scale=0.0, margin=0.0):
+    """Cap each uniform scale so the scaled bounding spheres stay clear of each other.
+
+    Objects are fitted in order; ones not fitted yet are assumed to be at
+    min_scale, so an early object can never crowd out a later one. Returns the
+    capped scales and how many had to be reduced.
+    """
+    base_radii = np.asarray(base_radii, dtype=np.float64)
+    scales = np.asarray(scales, dtype=np.float64).copy()
+    pad = margin * 0.5
+    smallest = base_radii * min_scale + pad
+    # A sphere never grows past its target (or min_scale when that's larger), so file it under that size
+    extents = np.maximum(base_radii * scales + pad, smallest)
+    spatial_hash = SpatialHash(2.0 * float(np.median(extents)) if len(extents) else 0.0)
+    for position, radius, extent in zip(np.asarray(positions).tolist(), smallest.tolist(), extents.tolist()):
+        spatial_hash.insert(position, radius, extent)
+
+    positions, radii = spatial_hash.positions, spatial_hash.radii
+    targets = (base_radii * scales + pad).tolist()
+    reduced = 0
+    for index, base in enumerate(base_radii.tolist()):
+        target = limit = targets[index]
+        px, py, pz = positions[index]
+        for other in spatial_hash.nearby(positions[index], target):
+            if other == index:
+                continue
+            ox, oy, oz = positions[other]
+            reach = limit + radii[other]
+            squared = (px - ox) * (px - ox) + (py - oy) * (py - oy) + (pz - oz) * (pz - oz)
+            if squared < reach * reach:
+                limit = math.sqrt(squared) - radii[other]
+        if base > 0.0 and limit < target:
+            scales[index] = max((limit - pad) / base, min_scale)
+            reduced += 1
+        radii[index] = base * scales[index] + pad
+    return scales, reduced
+
+DUPLICATE_SOURCE_PROP = "mask_duplicate_source"
+
+def duplicate_locations(props, origins, radii, rng, obstacles=()):
+    """Return (one random location around each origin, overlap count) for the placement mode."""
+    ranges = axis_ranges(props)
+    if props.placement_mode == 'POISSON':
+        return poisson_disk_positions(origins - ranges, origins + ranges, radii, rng, obstacles=obstacles)
+    return origins + random_offsets(props, len(origins), rng), 0
+
+def create_duplicates(obj, collection, locations, linked=False):
+    """Copy obj once per location into collection, tagging every copy with its source."""
+    duplicates = []
+    for location in locations:
+        obj_copy = obj.copy()
+        if not linked and obj_copy.data is not None:
+            obj_copy.data = obj_copy.data.copy()
+        obj_copy[DUPLICATE_SOURCE_PROP] = obj
+        collection.objects.link(obj_copy)
+        obj_copy.location = location
+        duplicates.append(obj_copy)
+    return duplicates
+
+def untag_duplicate(obj):
+    """Drop the source tag a copy of a duplicate inherits, so Re-roll doesn't treat it as one."""
+    if DUPLICATE_SOURCE_PROP in obj:
+        del obj[DUPLICATE_SOURCE_PROP]
+
+def duplicate_pools(collection):
+    """Return {source object: [duplicates]} for the tagged members of a group collection."""
+    pools = {}
+    for obj in collection.objects:
+        source = obj.get(DUPLICATE_SOURCE_PROP)
+        if isinstance(source, bpy.types.Object) and source.name in bpy.data.objects:
+            pools.setdefault(source, []).append(obj)
+    return pools
+
+def remove_duplicates(objects):
+    """Delete the objects and any object data only they were using."""
+    data = {obj.data for obj in objects if obj.data is not None}
+    bpy.data.batch_remove(objects)
+    orphans = [item for item in data if item.users == 0]
+    if orphans:
+        bpy.data.batch_remove(orphans)
+
+# Seconds of work a modal chunked operator does per timer tick
+MODAL_TIME_BUDGET = 0.05
+
+def run_steps(steps):
+    """Run a step generator to the end and return its result."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+class ChunkedOperator:
+    """Mixin for operators whose work is a generator of small steps.
+
+    steps(context) yields (done, total) after every unit of work and returns the
+    operator result. execute runs it in one go. invoke runs it on a timer in
+    slices of MODAL_TIME_BUDGET seconds with progress in the status bar once
+    work_size(context) reaches modal_threshold. Esc then undoes the finished units
+    through the callables handed to record(). With Operator Timing on, a modal
+    run is timed from invoke until end_modal.
+    """
+    modal_threshold = 1000
+    journal = None
+    # Open Operator Timing entry of a modal run, from invoke until end_modal
+    _timing = None
+
+    def record(self, undo):
+        if self.journal is not None:
+            self.journal.append(undo)
+
+    def execute(self, context):
+        self.journal = None
+        return run_steps(self.steps(context))
+
+    def invoke(self, context, event):
+        if context.window is None or self.work_size(context) < self.modal_threshold:
+            return self.execute(context)
+        self.journal = []
+        self._steps = self.steps(context)
+        self._timing = start_timing(type(self), context) if type(self) in _timed_operators else None
+        if self._timing is not None:
+            self._timing["entry"]["modal"] = True
+        window_manager = context.window_manager
+        self._timer = window_manager.event_timer_add(0.01, window=context.window)
+        window_manager.modal_handler_add(self)
+        window_manager.progress_begin(0, 100)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC' and event.value == 'PRESS':
+            self._steps.close()
+            self.rollback()
+            self.end_modal(context, {'CANCELLED'})
+            self.report({'WARNING'}, f"{self.bl_label} cancelled, changes rolled back")
+            return {'CANCELLED'}
+        if event.type != 'TIMER':
+            # Keep the viewport and navigation usable while working
+            return {'PASS_THROUGH'}
+
+        profile = self._timing["profile"] if self._timing is not None else None
+        deadline = time.perf_counter() + MODAL_TIME_BUDGET
+        if profile is not None:
+            profile.enable()
+        try:
+            try:
+                while time.perf_counter() < deadline:
+                    done, total = next(self._steps)
+            finally:
+                if profile is not None:
+                    profile.disable()
+        except StopIteration as stop:
+            self.end_modal(context, stop.value)
+            return stop.value
+        except ReferenceError:
+            # Something we were working on was deleted in the meantime
+            self.rollback()
+            self.end_modal(context, {'CANCELLED'})
+            self.report({'ERROR'}, f"{self.bl_label} stopped because its data was removed, changes rolled back")
+            return {'CANCELLED'}
+        except Exception as error:
+            traceback.print_exc()
+            self.rollback()
+            self.end_modal(context, {'CANCELLED'})
+            self.report({'ERROR'}, f"{self.bl_label} failed: {error}, changes rolled back")
+            return {'CANCELLED'}
+        percent = int(100 * done / max(total, 1))
+        context.window_manager.progress_update(percent)
+        context.workspace.status_text_set(f"{self.bl_label}: {done} / {total} ({percent}%), Esc to cancel")
+        return {'RUNNING_MODAL'}
+
+    def rollback(self):
+        for undo in reversed(self.journal or ()):
+            try:
+                undo()
+            except ReferenceError:
+                pass
+        self.journal = None
+
+    def end_modal(self, context, result):
+        window_manager = context.window_manager
+        window_manager.event_timer_remove(self._timer)
+        window_manager.progress_end()
+        context.workspace.status_text_set(None)
+        if self._timing is not None:
+            finish_timing(self._timing, result)
+            self._timing = None
+
+class OBJECT_OT_random_duplicate(ChunkedOperator, bpy.types.Operator):
     bl_idname = "object.random_duplicate"
     bl_label = "Random Duplicate"
+    bl_description = "Duplicate selected objects at random offsets into the group collection"
     bl_options = {'REGISTER', 'UNDO'}
+    modal_threshold = 500
 
-    def execute(self, context):
+    def work_size(self, context):
+        return len(context.selected_objects) * context.scene.random_duplicate_props.num_duplicates
+
+    def steps(self, context):
         props = context.scene.random_duplicate_props
         selected_objects = context.selected_objects
         num_duplicates = props.num_duplicates
+        if not selected_objects:
+            self.report({'WARNING'}, "No objects selected")
+            return {'CANCELLED'}
+        new_collection = bool(props.group_name) and bpy.data.collections.get(props.group_name) is None
+        collection = get_group_collection(context, props.group_name)
+        if new_collection:
+            self.record(functools.partial(bpy.data.collections.remove, collection))
 
-        for obj in selected_objects:
-            for _ in range(num_duplicates):
-                obj_copy = obj.copy()
-                obj_copy.data = obj_copy.data.copy()
-                context.collection.objects.link(obj_copy)
+        rng = placement_rng(props)
+        sources = np.array([obj.location for obj in selected_objects], dtype=np.float64).reshape(-1, 3)
+        radii = bounding_radii(selected_objects) + props.placement_margin * 0.5
+        locations, overlapping = duplicate_locations(
+            props, np.repeat(sources, num_duplicates, axis=0), np.repeat(radii, num_duplicates), rng,
+            obstacles=zip(sources.tolist(), radii.tolist()))
 
-                random_x = random.uniform(-props.x_range, props.x_range) if props.use_x_range else 0
-                random_y = random.uniform(-props.y_range, props.y_range) if props.use_y_range else 0
-                random_z = random.uniform(-props.z_range, props.z_range) if props.use_z_range else 0
-                obj_copy.location += mathutils.Vector((random_x, random_y, random_z))
+        locations = locations.reshape(len(selected_objects), num_duplicates, 3)
+        created = []
+        self.record(lambda: remove_duplicates(created))
+        total = len(selected_objects) * num_duplicates
+        for obj, obj_locations in zip(selected_objects, locations.tolist()):
+            for location in obj_locations:
+                created.extend(create_duplicates(obj, collection, [location], props.duplicate_mode == 'LINKED'))
+                yield len(created), total
 
-        self.report({'INFO'}, f"Duplicated {len(selected_objects)} object(s) {num_duplicates} times")
+        self.report({'INFO'}, f"Duplicated {len(selected_objects)} object(s) {num_duplicates} times into '{collection.name}'")
+        if overlapping:
+            self.report({'WARNING'}, f"{overlapping} duplicate(s) did not fit without overlapping, increase the ranges")
         return {'FINISHED'}
 
-class ANIM_OT_remove_past_keyframes(bpy.types.Operator):
-    bl_idname = "anim.remove_past_keyframes"
-    bl_label = "Remove Past Keyframes"
-    bl_description = "Remove all keyframes before the current frame for the selected object"
+class OBJECT_OT_reroll_duplicates(bpy.types.Operator):
+    bl_idname = "object.reroll_duplicates"
+    bl_label = "Re-roll"
+    bl_description = ("Give the group's duplicates a new random layout in place, adding or removing members "
+                      "so every source has Number of Duplicates copies")
     bl_options = {'REGISTER', 'UNDO'}
 
+    relayout: bpy.props.BoolProperty(
+        name="New Layout",
+        description="Move the existing duplicates too. Off only places duplicates added to reach the count",
+        default=True
+    )
+    reroll_scale: bpy.props.BoolProperty(
+        name="Scale",
+        description="Also draw a new scale between Minimum and Maximum Scale",
+        default=False
+    )
+    reroll_colors: bpy.props.BoolProperty(
+        name="Colors",
+        description="Also give every moved duplicate a random palette color",
+        default=False
+    )
+
     def execute(self, context):
-        obj = context.active_object
-        if obj is None or obj.animation_data is None or obj.animation_data.action is None:
-            self.report({'ERROR'}, "No active object with animation data selected")
+        props = context.scene.random_duplicate_props
+        collection = bpy.data.collections.get(props.group_name)
+        pools = duplicate_pools(collection) if collection else {}
+        if not pools:
+            self.report({'WARNING'}, f"No Random Duplicate copies in '{props.group_name}'")
             return {'CANCELLED'}
 
-        current_frame = context.scene.frame_current
-        action = obj.animation_data.action
-        total_removed = 0
+        count = props.num_duplicates
+        added = removed = 0
+        moving, origins, obstacles = [], [], []
+        for source, members in pools.items():
+            if len(members) > count:
+                remove_duplicates(members[count:])
+                removed += len(members) - count
+                members = members[:count]
+            new_members = create_duplicates(source, collection, [source.location] * (count - len(members)),
+                                            props.duplicate_mode == 'LINKED')
+            added += len(new_members)
+            targets = members + new_members if self.relayout else new_members
+            keep = [source] if self.relayout else [source] + members
+            obstacles.extend(zip([tuple(obj.location) for obj in keep], bounding_radii(keep).tolist()))
+            moving.extend(targets)
+            origins.extend([source.location] * len(targets))
 
-        for fcurve in action.fcurves:
-            keyframes_to_keep = [kf for kf in fcurve.keyframe_points if kf.co.x >= current_frame]
-            total_removed += len(fcurve.keyframe_points) - len(keyframes_to_keep)
-            fcurve.keyframe_points.clear()
-            for kf in keyframes_to_keep:
-                fcurve.keyframe_points.insert(frame=kf.co.x, value=kf.co.y)
-            fcurve.update()
+        rng = placement_rng(props)
+        pad = props.placement_margin * 0.5
+        obstacles = [(position, radius + pad) for position, radius in obstacles]
+        origins = np.array(origins, dtype=np.float64).reshape(-1, 3)
+        locations, overlapping = duplicate_locations(props, origins, bounding_radii(moving) + pad, rng, obstacles)
+        for obj, location in zip(moving, locations.tolist()):
+            obj.location = location
+
+        if self.reroll_scale and moving:
+            scales = rng.uniform(props.scale_min, props.scale_max, len(moving))
+            if props.placement_mode == 'POISSON':
+                base_radii = bounding_radii(moving, np.ones((len(moving), 3)))
+                scales, _ = fit_scales(locations, base_radii, scales, props.scale_min, props.placement_margin)
+            for obj, scale in zip(moving, scales.tolist()):
+                obj.scale = (scale, scale, scale)
+
+        if self.reroll_colors:
+            for obj, index in zip(moving, rng.integers(len(MASK_COLORS), size=len(moving)).tolist()):
+                color_name, color = MASK_COLORS[index]
+                apply_mask_color(obj, color, color_name, props.color_mode)
+            if props.color_mode == 'OBJECT' and props.color_keyframe:
+                key_mask_colors(moving)
+
+        self.report({'INFO'}, f"Re-rolled {len(moving)} duplicate(s) in '{collection.name}' (+{added} / -{removed})")
+        if overlapping:
+            self.report({'WARNING'}, f"{overlapping} duplicate(s) did not fit without overlapping, increase the ranges")
+        return {'FINISHED'}
+
+# Keyframe point properties copied in bulk when trimming, with their width and dtype
+KEYFRAME_ARRAYS = (
+    ("co", 2, np.float32),
+    ("handle_left", 2, np.float32),
+    ("handle_right", 2, np.float32),
+    ("handle_left_type", 1, np.int32),
+    ("handle_right_type", 1, np.int32),
+    ("interpolation", 1, np.int32),
+    ("easing", 1, np.int32),
+    ("type", 1, np.int32),
+    ("amplitude", 1, np.float32),
+    ("back", 1, np.float32),
+    ("period", 1, np.float32),
+)
+# KeyframePoint.handle_left_type / handle_right_type enum value for foreach_set
+HANDLE_AUTO_CLAMPED = 4
+
+def read_keyframes(fcurve):
+    """Read every keyframe point of an F-curve into a dict of numpy arrays."""
+    points = fcurve.keyframe_points
+    count = len(points)
+    arrays = {}
+    for attr, width, dtype in KEYFRAME_ARRAYS:
+        data = np.empty(count * width, dtype=dtype)
+        points.foreach_get(attr, data)
+        arrays[attr] = data.reshape(count, width) if width > 1 else data
+    return arrays
+
+def write_keyframes(fcurve, arrays):
+    """Replace the keyframe points of an F-curve with the given arrays in one pass."""
+    points = fcurve.keyframe_points
+    points.clear()
+    points.add(len(arrays["co"]))
+    for attr, width, dtype in KEYFRAME_ARRAYS:
+        points.foreach_set(attr, np.ascontiguousarray(arrays[attr], dtype=dtype).ravel())
+    fcurve.update()
+
+def insert_key(fcurve, frame, value):
+    """Set or add the key at frame through the bulk arrays, moving its handles along with it."""
+    points = fcurve.keyframe_points
+    co, left, right = (read_bulk(points, attr, 2, np.float32).reshape(-1, 2)
+                       for attr in ("co", "handle_left", "handle_right"))
+    existing = np.flatnonzero(co[:, 0] == frame)
+    if len(existing):
+        index = existing[0]
+        shift = value - co[index, 1]
+        co[index, 1] = value
+        left[index, 1] += shift
+        right[index, 1] += shift
+    else:
+        points.add(1)
+        co = np.vstack([co, (frame, value)])
+        left = np.vstack([left, (frame - 1.0, value)])
+        right = np.vstack([right, (frame + 1.0, value)])
+    for attr, data in (("co", co), ("handle_left", left), ("handle_right", right)):
+        points.foreach_set(attr, np.ascontiguousarray(data, dtype=np.float32).ravel())
+    # Sorts the new key into place and recalculates auto handles
+    fcurve.update()
+
+def key_objects(objects, data_path, values, frame, group="Object Transforms"):
+    """Key each object's data_path to its row of values on frame, like keyframe_insert but through insert_key."""
+    for obj, row in zip(objects, np.asarray(values, dtype=np.float64).reshape(len(objects), -1).tolist()):
+        animation_data = obj.animation_data or obj.animation_data_create()
+        if animation_data.action is None:
+            animation_data.action = bpy.data.actions.new(name=f"{obj.name}Action")
+        fcurves = animation_data.action.fcurves
+        for index, value in enumerate(row):
+            fcurve = fcurves.find(data_path, index=index)
+            if fcurve is None:
+                fcurve = fcurves.new(data_path, index=index, action_group=group)
+            insert_key(fcurve, frame, value)
+
+def trim_fcurve(fcurve, frame_start=None, frame_end=None, arrays=None):
+    """Remove the keys of an F-curve outside [frame_start, frame_end] and return how many were removed.
+
+    Handles, interpolation and easing of the kept keys are preserved. arrays can
+    pass in an earlier read_keyframes(fcurve) to skip reading it again.
+    """
+    if arrays is None:
+        arrays = read_keyframes(fcurve)
+    frames = arrays["co"][:, 0]
+    keep = np.ones(len(frames), dtype=bool)
+    if frame_start is not None:
+        keep &= frames >= frame_start
+    if frame_end is not None:
+        keep &= frames <= frame_end
+    removed = int(len(keep) - np.count_nonzero(keep))
+    if removed:
+        write_keyframes(fcurve, {attr: data[keep] for attr, data in arrays.items()})
+    return removed
+
+def collect_actions(objects):
+    """Return the unique actions driving the objects, their data, shape keys and materials."""
+    actions = {}
+
+    def add(id_data):
+        animation_data = getattr(id_data, "animation_data", None) if id_data is not None else None
+        if animation_data is not None and animation_data.action is not None:
+            actions.setdefault(animation_data.action.as_pointer(), animation_data.action)
+
+    for obj in objects:
+        add(obj)
+        add(obj.data)
+        add(getattr(obj.data, "shape_keys", None))
+        for slot in obj.material_slots:
+            if slot.material is not None:
+                add(slot.material)
+                add(slot.material.node_tree)
+    return list(actions.values())
+
+def keyframe_targets(context):
+    return context.selected_objects or ([context.active_object] if context.active_object else [])
+
+def count_keyframes(actions):
+    return sum(len(fcurve.keyframe_points) for action in actions for fcurve in action.fcurves)
+
+def trim_keyframe_steps(operator, context, frame_start=None, frame_end=None):
+    """Trim the actions of the selected (or active) objects one F-curve at a time.
 
+    Yields (keys processed, total keys) and returns (keys removed, actions touched).
+    Trimmed curves are recorded on the operator so a cancelled run can put them back.
+    """
+    actions = collect_actions(keyframe_targets(context))
+    total = count_keyframes(actions)
+    done = total_removed = 0
+    for action in actions:
+        for fcurve in action.fcurves:
+            arrays = read_keyframes(fcurve)
+            removed = trim_fcurve(fcurve, frame_start, frame_end, arrays)
+            if removed:
+                operator.record(functools.partial(write_keyframes, fcurve, arrays))
+            total_removed += removed
+            done += len(arrays["co"])
+            yield done, total
         action.update_tag()
+    return total_removed, len(actions)
+
+class ANIM_OT_remove_past_keyframes(ChunkedOperator, bpy.types.Operator):
+    bl_idname = "anim.remove_past_keyframes"
+    bl_label = "Remove Past Keyframes"
+    bl_description = "Remove all keyframes before the current frame for the selected objects, their materials and shape keys"
+    bl_options = {'REGISTER', 'UNDO'}
+    modal_threshold = 200000
+
+    def work_size(self, context):
+        return count_keyframes(collect_actions(keyframe_targets(context)))
+
+    def steps(self, context):
+        current_frame = context.scene.frame_current
+        total_removed, action_count = yield from trim_keyframe_steps(self, context, frame_start=current_frame)
+        if action_count == 0:
+            self.report({'ERROR'}, "No selected objects with animation data")
+            return {'CANCELLED'}
+
         context.scene.frame_set(current_frame)
-        self.report({'INFO'}, f"Removed {total_removed} past keyframes for {obj.name}")
+        self.report({'INFO'}, f"Removed {total_removed} past keyframes from {action_count} action(s)")
         return {'FINISHED'}
 
-class ANIM_OT_remove_future_keyframes(bpy.types.Operator):
+class ANIM_OT_remove_future_keyframes(ChunkedOperator, bpy.types.Operator):
     bl_idname = "anim.remove_future_keyframes"
     bl_label = "Remove Future Keyframes"
-    bl_description = "Remove all keyframes after the current frame for the selected object"
+    bl_description = "Remove all keyframes after the current frame for the selected objects, their materials and shape keys"
     bl_options = {'REGISTER', 'UNDO'}
+    modal_threshold = 200000
+
+    def work_size(self, context):
+        return count_keyframes(collect_actions(keyframe_targets(context)))
+
+    def steps(self, context):
+        current_frame = context.scene.frame_current
+        total_removed, action_count = yield from trim_keyframe_steps(self, context, frame_end=current_frame)
+        if action_count == 0:
+            self.report({'ERROR'}, "No selected objects with animation data")
+            return {'CANCELLED'}
+
+        context.scene.frame_set(current_frame)
+        self.report({'INFO'}, f"Removed {total_removed} future keyframes from {action_count} action(s)")
+        return {'FINISHED'}
+
+def parse_frames(text):
+    return sorted({int(value) for value in re.findall(r"-?\d+", text)})
+
+def handoff_curves(action, frames):
+    """read_keyframes of every F-curve of action, with a key added on each transition frame that has none.
+
+    The added keys hold the curve's evaluated value there and copy the interpolation of
+    the key before them, so the curves on both sides of a handoff meet on that frame.
+    """
+    frames = np.asarray(frames, dtype=np.float32)
+    curves = []
+    for fcurve in action.fcurves:
+        arrays = read_keyframes(fcurve)
+        keyed = arrays["co"][:, 0]
+        missing = frames[~np.isin(frames, keyed)] if len(keyed) else frames[:0]
+        if len(missing):
+            source = np.maximum(np.searchsorted(keyed, missing) - 1, 0)
+            added = {attr: data[source] for attr, data in arrays.items()}
+            added["co"] = np.column_stack([missing, [fcurve.evaluate(frame) for frame in missing.tolist()]])
+            added["handle_left"] = added["co"] - (1.0, 0.0)
+            added["handle_right"] = added["co"] + (1.0, 0.0)
+            added["handle_left_type"] = added["handle_right_type"] = np.full(len(missing), HANDLE_AUTO_CLAMPED)
+            added["type"] = np.zeros(len(missing), dtype=np.int32)
+            order = np.argsort(np.concatenate([keyed, missing]), kind="stable")
+            arrays = {attr: np.concatenate([data, added[attr].astype(data.dtype)])[order]
+                      for attr, data in arrays.items()}
+        curves.append(arrays)
+    return curves
+
+def write_action_window(action, curves, frame_start=None, frame_end=None):
+    """Write the keys of curves (in F-curve order) inside [frame_start, frame_end] into action."""
+    for fcurve, arrays in zip(action.fcurves, curves):
+        frames = arrays["co"][:, 0]
+        first = 0 if frame_start is None else int(np.searchsorted(frames, frame_start, side='left'))
+        last = len(frames) if frame_end is None else int(np.searchsorted(frames, frame_end, side='right'))
+        write_keyframes(fcurve, {attr: data[first:last] for attr, data in arrays.items()})
+    return action
+
+def key_visibility_window(action, frame_start=None, frame_end=None):
+    """Key hide_viewport and hide_render so the action's users show from frame_start until just before frame_end (None = open)."""
+    keys = {}
+    if frame_start is not None:
+        keys.update({frame_start - 1: 1.0, frame_start: 0.0})
+    if frame_end is not None:
+        keys.update({frame_end - 1: 0.0, frame_end: 1.0})
+    if not keys:
+        return
+    fcurves = action.fcurves
+    co = np.array(sorted(keys.items()), dtype=np.float32).ravel()
+    for data_path in ("hide_viewport", "hide_render"):
+        fcurve = fcurves.find(data_path) or fcurves.new(data_path)
+        fcurve.keyframe_points.clear()
+        fcurve.keyframe_points.add(len(keys))
+        fcurve.keyframe_points.foreach_set("co", co)
+        fcurve.update()
+
+class ANIM_OT_keyframe_handoff(bpy.types.Operator):
+    bl_idname = "anim.keyframe_handoff"
+    bl_label = "Keyframe Handoff"
+    bl_description = ("At every transition frame hand each selected object's animation over to a new copy "
+                      "that shares its mesh, keeps the keys from that frame on and gets the next palette color")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    frames: bpy.props.StringProperty(
+        name="Frames",
+        description="Transition frames, e.g. '48, 96, 150'. Empty uses the current frame"
+    )
+    use_markers: bpy.props.BoolProperty(
+        name="Use Markers",
+        description="Hand off at every timeline marker instead",
+        default=False
+    )
+    recolor: bpy.props.BoolProperty(
+        name="Next Color",
+        description="Give every new object the next palette color after its predecessor's",
+        default=True
+    )
+    key_visibility: bpy.props.BoolProperty(
+        name="Key Visibility",
+        description="Key hide_viewport and hide_render so only one object of each chain shows on any frame",
+        default=True
+    )
+
+    def invoke(self, context, event):
+        if not self.frames:
+            self.frames = str(context.scene.frame_current)
+        return context.window_manager.invoke_props_dialog(self)
+
+    def transition_frames(self, context):
+        if self.use_markers:
+            return sorted({marker.frame for marker in context.scene.timeline_markers})
+        return parse_frames(self.frames) or [context.scene.frame_current]
+
+    def segment_action(self, action, curves, start, end, color_mode, name):
+        """Action for the objects of one segment, or None when they need none."""
+        if action is None:
+            if not self.key_visibility:
+                return None
+            segment = bpy.data.actions.new(name=f"{name}Action")
+        else:
+            segment = write_action_window(action.copy(), curves, start, end)
+            if self.recolor and color_mode == 'OBJECT':
+                # Animated object colors would override the new one
+                fcurves = segment.fcurves
+                for fcurve in [fcurve for fcurve in fcurves if fcurve.data_path == "color"]:
+                    fcurves.remove(fcurve)
+        if self.key_visibility:
+            key_visibility_window(segment, start, end)
+        return segment
+
+    def execute(self, context):
+        props = context.scene.random_duplicate_props
+        frames = self.transition_frames(context)
+        objects = list(context.selected_objects)
+        if not objects or not frames:
+            self.report({'WARNING'}, "Need selected objects and at least one transition frame")
+            return {'CANCELLED'}
+
+        # (start, end) of the original and of every successor; both sides keep the key on the transition frame
+        segments = list(zip([None] + frames, frames + [None]))
+        # Objects sharing an action are handed off together, and their successors share one action per segment
+        groups = {}
+        for obj in objects:
+            action = obj.animation_data.action if obj.animation_data else None
+            groups.setdefault(action.as_pointer() if action is not None else None, (action, []))[1].append(obj)
+
+        created = []
+        for action, members in groups.values():
+            curves = handoff_curves(action, frames) if action is not None else []
+            successor_actions = [self.segment_action(action, curves, start, end, props.color_mode, members[0].name)
+                                 for start, end in segments[1:]]
+            if action is not None:
+                if action.users > len(members):
+                    # Also used by objects that aren't handed off
+                    action = action.copy()
+                write_action_window(action, curves, frame_end=frames[0])
+            elif self.key_visibility:
+                action = bpy.data.actions.new(name=f"{members[0].name}Action")
+            if action is not None and self.key_visibility:
+                key_visibility_window(action, frame_end=frames[0])
+
+            for obj in members:
+                if action is not None:
+                    obj.animation_data_create().action = action
+                # -1 when uncolored, so the first successor gets Red
+                base_color = object_palette_index(obj)
+                for step, successor_action in enumerate(successor_actions, 1):
+                    successor = obj.copy()
+                    # A successor isn't one of the Random Duplicate copies Re-roll manages
+                    untag_duplicate(successor)
+                    for collection in obj.users_collection:
+                        collection.objects.link(successor)
+                    if successor_action is not None:
+                        successor.animation_data_create().action = successor_action
+                    if self.recolor:
+                        color_name, color = MASK_COLORS[(base_color + step) % len(MASK_COLORS)]
+                        apply_mask_color(successor, color, color_name, props.color_mode)
+                    created.append(successor)
+
+        self.report({'INFO'}, f"Handed off {len(objects)} object(s) at {len(frames)} frame(s), created {len(created)} object(s)")
+        return {'FINISHED'}
+
+# KeyframePoint.interpolation enum value for foreach_set
+KEYFRAME_LINEAR = 1
+
+def smoothstep(t):
+    t = np.clip(t, 0.0, 1.0)
+    return t * t * (3.0 - 2.0 * t)
+
+def value_noise(rng, shape, frames, period):
+    """Smooth random curves in -1..1, shape + (len(frames),), with a new random value every period frames."""
+    steps = (frames - frames[0]) / max(period, 1e-6)
+    knot = np.floor(steps).astype(np.int64)
+    blend = smoothstep(steps - knot)
+    knots = rng.uniform(-1.0, 1.0, size=tuple(shape) + (int(knot[-1]) + 2,))
+    return knots[..., knot] * (1.0 - blend) + knots[..., knot + 1] * blend
+
+def scatter_ease(frames):
+    """Weight of the scattered start on every frame, 1 on the first frame easing to 0 on the last."""
+    return 1.0 - smoothstep((frames - frames[0]) / max(frames[-1] - frames[0], 1e-6))
+
+def motion_curves(motion, rng, shape, frames, period):
+    """Random trajectories in -1..1 for every frame, shape + (len(frames),).
+
+    NOISE drifts smoothly, JITTER jumps to a new value on every key and
+    SCATTER starts at a random value and eases to 0 on the last frame.
+    """
+    if motion == 'JITTER':
+        return rng.uniform(-1.0, 1.0, size=tuple(shape) + (len(frames),))
+    if motion == 'SCATTER':
+        return rng.uniform(-1.0, 1.0, size=tuple(shape) + (1,)) * scatter_ease(frames)
+    return value_noise(rng, shape, frames, period)
+
+def linear_key_mask(frames, values, tolerance):
+    """Mask of the keys to keep so that linear interpolation stays within tolerance of values.
+
+    values is (curves, frames). Keys where a curve bends are kept, then the
+    worst dropped key of every stretch that strays too far from the straight
+    line between its kept neighbours is restored until none does.
+    """
+    count, length = values.shape
+    keep = np.ones(values.shape, dtype=bool)
+    if length > 2:
+        chord = (values[:, :-2] + values[:, 2:]) * 0.5
+        keep[:, 1:-1] = np.abs(values[:, 1:-1] - chord) > tolerance
+    positions = np.arange(length)
+    # Only curves that still had a stretch off the line get checked again
+    active = np.arange(count)
+    while len(active):
+        kept, curves = keep[active], values[active]
+        rows = np.arange(len(active))[:, None]
+        previous = np.maximum.accumulate(np.where(kept, positions, 0), axis=1)
+        following = np.minimum.accumulate(np.where(kept, positions, length - 1)[:, ::-1], axis=1)[:, ::-1]
+        start, end = frames[previous], frames[following]
+        blend = (frames - start) / np.where(end > start, end - start, 1.0)
+        line = curves[rows, previous] * (1.0 - blend) + curves[rows, following] * blend
+        error = np.where(kept, 0.0, np.abs(curves - line))
+        bad_rows, bad_columns = np.nonzero(error > tolerance)
+        # One key per stretch, the one furthest off the line
+        stretch = bad_rows * length + previous[bad_rows, bad_columns]
+        order = np.lexsort((-error[bad_rows, bad_columns], stretch))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = stretch[order][1:] != stretch[order][:-1]
+        keep[active[bad_rows[order][first]], bad_columns[order][first]] = True
+        active = active[np.unique(bad_rows)]
+    return keep
+
+def bake_fcurve(action, data_path, index, frames, values):
+    """Replace one F-curve's keys with linear keys at frames, written in bulk."""
+    fcurve = action.fcurves.find(data_path, index=index)
+    if fcurve is None:
+        fcurve = action.fcurves.new(data_path, index=index, action_group="Object Transforms")
+    points = fcurve.keyframe_points
+    points.clear()
+    points.add(len(frames))
+    points.foreach_set("co", np.column_stack([frames, values]).astype(np.float32).ravel())
+    points.foreach_set("interpolation", np.full(len(frames), KEYFRAME_LINEAR, dtype=np.int32))
+    fcurve.update()
+
+def own_action(obj):
+    """The object's action, created or copied first so no other user is affected."""
+    animation_data = obj.animation_data or obj.animation_data_create()
+    action = animation_data.action
+    if action is None:
+        action = animation_data.action = bpy.data.actions.new(name=f"{obj.name}Action")
+    elif action.users > 1:
+        action = animation_data.action = action.copy()
+    return action
+
+class ANIM_OT_bake_random_motion(bpy.types.Operator):
+    bl_idname = "anim.bake_random_motion"
+    bl_label = "Bake Random Motion"
+    bl_description = ("Key random drifting, jittering or scatter-to-origin motion on the selected objects over the "
+                      "scene frame range, using the location ranges, scale limits and seed from Random Duplicate")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    motion: bpy.props.EnumProperty(
+        name="Motion",
+        items=[
+            ('NOISE', "Drift", "Smooth random wandering around the current transform"),
+            ('JITTER', "Jitter", "A new random offset on every key"),
+            ('SCATTER', "Scatter to Origin", "Start at a random spot and settle on the original location by the last frame"),
+        ],
+        default='NOISE'
+    )
+    use_location: bpy.props.BoolProperty(
+        name="Location",
+        description="Animate location within the X/Y/Z ranges",
+        default=True
+    )
+    use_scale: bpy.props.BoolProperty(
+        name="Scale",
+        description="Animate a uniform scale factor between Min and Max Scale",
+        default=False
+    )
+    period: bpy.props.FloatProperty(
+        name="Period",
+        description="Frames between new random targets in Drift",
+        default=24.0,
+        min=1.0
+    )
+    frame_step: bpy.props.IntProperty(
+        name="Step",
+        description="Frames between keys",
+        default=1,
+        min=1
+    )
+    reduce_keys: bpy.props.BoolProperty(
+        name="Reduce Keys",
+        description="Drop keys that lie on a straight line between their neighbours",
+        default=True
+    )
+    tolerance: bpy.props.FloatProperty(
+        name="Tolerance",
+        description="How far a dropped key may be from the line that replaces it",
+        default=0.001,
+        min=0.0,
+        precision=4
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        props = context.scene.random_duplicate_props
+        scene = context.scene
+        objects = [obj for obj in context.selected_objects if not is_island_object(obj)]
+        if not objects or not (self.use_location or self.use_scale):
+            self.report({'WARNING'}, "Need selected objects and Location or Scale turned on")
+            return {'CANCELLED'}
+
+        frames = np.arange(scene.frame_start, scene.frame_end + 1, self.frame_step, dtype=np.float64)
+        if frames[-1] != scene.frame_end:
+            frames = np.append(frames, float(scene.frame_end))
+        rng = placement_rng(props)
+
+        # (data path, axis, (objects, frames) values) for every curve to bake
+        channels = []
+        if self.use_location:
+            if self.motion == 'SCATTER':
+                bases = np.array([obj.get("original_location", obj.location) for obj in objects],
+                                 dtype=np.float64).reshape(-1, 3)
+            else:
+                bases = np.array([obj.location for obj in objects], dtype=np.float64).reshape(-1, 3)
+            offsets = motion_curves(self.motion, rng, (len(objects), 3), frames, self.period)
+            ranges = axis_ranges(props)
+            for axis in range(3):
+                if ranges[axis] > 0.0:
+                    channels.append(("location", axis, bases[:, axis, None] + offsets[:, axis] * ranges[axis]))
+        if self.use_scale:
+            scales = np.array([obj.scale for obj in objects], dtype=np.float64).reshape(-1, 3)
+            unit = motion_curves(self.motion, rng, (len(objects),), frames, self.period)
+            half_range = 0.5 * (props.scale_max - props.scale_min)
+            if self.motion == 'SCATTER':
+                # Ease from a random factor in [Min, Max] Scale back to the current scale
+                start = props.scale_min + (unit[:, :1] + 1.0) * half_range
+                factors = 1.0 + (start - 1.0) * scatter_ease(frames)
+            else:
+                factors = props.scale_min + (unit + 1.0) * half_range
+            # A Min Scale of 0 would collapse the object, and its rotation with it
+            factors = np.maximum(factors, 1e-3)
+            for axis in range(3):
+                channels.append(("scale", axis, scales[:, axis, None] * factors))
+
+        keys = 0
+        keeps = [linear_key_mask(frames, values, self.tolerance) if self.reduce_keys else None
+                 for _, _, values in channels]
+        for row, obj in enumerate(objects):
+            action = own_action(obj)
+            for (data_path, axis, values), keep in zip(channels, keeps):
+                if keep is None:
+                    bake_fcurve(action, data_path, axis, frames, values[row])
+                    keys += len(frames)
+                else:
+                    bake_fcurve(action, data_path, axis, frames[keep[row]], values[row, keep[row]])
+                    keys += int(keep[row].sum())
+
+        total = len(objects) * len(channels) * len(frames)
+        self.report({'INFO'}, f"Baked {keys} key(s) on {len(objects)} object(s)"
+                              + (f" ({total - keys} dropped as linear)" if self.reduce_keys else ""))
+        return {'FINISHED'}
+
+def read_mesh_faces(mesh):
+    """Read the face corners of a mesh in bulk.
+
+    Returns (corner positions, loop starts, loop totals, material indices, smooth flags, {uv name: uvs}).
+    """
+    vertex_co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", vertex_co)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+
+    face_count = len(mesh.polygons)
+    loop_starts = np.empty(face_count, dtype=np.int32)
+    loop_totals = np.empty(face_count, dtype=np.int32)
+    material_indices = np.empty(face_count, dtype=np.int32)
+    smooth = np.empty(face_count, dtype=bool)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    mesh.polygons.foreach_get("material_index", material_indices)
+    mesh.polygons.foreach_get("use_smooth", smooth)
+
+    uvs = {}
+    for uv_layer in mesh.uv_layers:
+        data = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", data)
+        uvs[uv_layer.name] = data.reshape(-1, 2)
+
+    corners = vertex_co.reshape(-1, 3)[loop_vertices]
+    return corners, loop_starts, loop_totals, material_indices, smooth, uvs
+
+def faces_of_loops(loop_starts, loop_count):
+    """Map every loop index to the index of the face it belongs to."""
+    order = np.argsort(loop_starts, kind='stable')
+    return order[np.searchsorted(loop_starts[order], np.arange(loop_count), side='right') - 1]
+
+def iter_face_objects(obj):
+    """Yield one new object per face of a mesh object, origins at each face median.
+
+    The source object is left in place for the caller to remove.
+    """
+    mesh = obj.data
+    corners, loop_starts, loop_totals, material_indices, smooth, uvs = read_mesh_faces(mesh)
+    if len(loop_starts) == 0:
+        return
+
+    # Face medians and origin-relative corners for every face in one pass
+    face_of_loop = faces_of_loops(loop_starts, len(corners))
+    medians = np.stack([np.bincount(face_of_loop, weights=corners[:, axis], minlength=len(loop_starts))
+                        for axis in range(3)], axis=1) / loop_totals[:, None]
+    local_corners = (corners - medians[face_of_loop]).tolist()
+
+    # Each face's origin expressed in the source's parent space becomes the new object's location
+    basis = np.array(obj.matrix_basis)
+    locations = (medians @ basis[:3, :3].T + basis[:3, 3]).tolist()
+
+    materials = list(mesh.materials)
+    collections = list(obj.users_collection)
+    uv_items = list(uvs.items())
+    for index, (loop_start, loop_total) in enumerate(zip(loop_starts.tolist(), loop_totals.tolist())):
+        face_mesh = bpy.data.meshes.new(f"{mesh.name}_{index}")
+        face_mesh.from_pydata(local_corners[loop_start:loop_start + loop_total], [], [range(loop_total)])
+        for material in materials:
+            face_mesh.materials.append(material)
+        polygon = face_mesh.polygons[0]
+        polygon.material_index = int(material_indices[index])
+        polygon.use_smooth = bool(smooth[index])
+        for uv_name, uv_data in uv_items:
+            face_mesh.uv_layers.new(name=uv_name).data.foreach_set(
+                "uv", uv_data[loop_start:loop_start + loop_total].ravel())
+
+        face_obj = obj.copy()
+        untag_duplicate(face_obj)
+        face_obj.name = f"{obj.name}_{index}"
+        face_obj.data = face_mesh
+        face_obj.location = locations[index]
+        face_obj["original_location"] = locations[index]
+        for collection in collections:
+            collection.objects.link(face_obj)
+        yield face_obj
+
+# Point attributes of a face-island mesh: name -> (attribute type, width, foreach field)
+ISLAND_ID_ATTR = "island_id"
+ISLAND_CENTER_ATTR = "island_center"
+ISLAND_OFFSET_ATTR = "island_offset"
+ISLAND_ROTATION_ATTR = "island_rotation"
+ISLAND_SCALE_ATTR = "island_scale"
+ISLAND_COLOR_ATTR = "island_color"
+ISLAND_ATTRIBUTES = {
+    ISLAND_ID_ATTR: ('INT', 1, "value"),
+    ISLAND_CENTER_ATTR: ('FLOAT_VECTOR', 3, "vector"),
+    ISLAND_OFFSET_ATTR: ('FLOAT_VECTOR', 3, "vector"),
+    ISLAND_ROTATION_ATTR: ('FLOAT_VECTOR', 3, "vector"),
+    ISLAND_SCALE_ATTR: ('FLOAT', 1, "value"),
+    ISLAND_COLOR_ATTR: ('FLOAT_COLOR', 4, "color"),
+}
+ISLAND_NODE_GROUP = "MaskIslandTransform"
+ISLAND_MODIFIER = "Mask Islands"
+ISLAND_MATERIAL = "MaskIslandMaterial"
+
+def is_island_object(obj):
+    return obj.type == 'MESH' and ISLAND_ID_ATTR in obj.data.attributes
+
+def read_island_attribute(mesh, name):
+    attr_type, width, field = ISLAND_ATTRIBUTES[name]
+    attribute = mesh.attributes[name]
+    data = np.empty(len(attribute.data) * width, dtype=np.int32 if attr_type == 'INT' else np.float32)
+    attribute.data.foreach_get(field, data)
+    return data.reshape(-1, width) if width > 1 else data
+
+def write_island_attribute(mesh, name, values):
+    attr_type, width, field = ISLAND_ATTRIBUTES[name]
+    attribute = mesh.attributes.get(name)
+    if attribute is None:
+        attribute = mesh.attributes.new(name, attr_type, 'POINT')
+    attribute.data.foreach_set(field, np.ascontiguousarray(values, dtype=np.int32 if attr_type == 'INT' else np.float32).ravel())
+    mesh.update()
+
+class IslandArrays:
+    """Per-island view of a face-island mesh.
+
+    Island rows are read from the first point of each island and written back
+    by broadcasting them to every point of the island.
+    """
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.ids = read_island_attribute(mesh, ISLAND_ID_ATTR)
+        self.valid = self.ids >= 0
+        self.island_ids, first = np.unique(self.ids[self.valid], return_index=True)
+        self.first_points = np.flatnonzero(self.valid)[first]
+        self.rows = np.searchsorted(self.island_ids, self.ids[self.valid])
+        self.count = len(self.island_ids)
+
+    def get(self, name):
+        return read_island_attribute(self.mesh, name)[self.first_points]
+
+    def set(self, name, island_values):
+        values = read_island_attribute(self.mesh, name)
+        values[self.valid] = np.asarray(island_values, dtype=values.dtype)[self.rows]
+        write_island_attribute(self.mesh, name, values)
+
+def _attribute_output(node):
+    # Named Attribute has one output per data type before 4.0; use the visible one
+    return next(socket for socket in node.outputs if socket.enabled)
+
+def get_island_node_group():
+    """Geometry Nodes group that moves every island by its offset/rotation/scale attributes."""
+    group = bpy.data.node_groups.get(ISLAND_NODE_GROUP)
+    if group is not None:
+        return group
+    group = bpy.data.node_groups.new(ISLAND_NODE_GROUP, 'GeometryNodeTree')
+    if hasattr(group, "interface"):
+        group.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+        group.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    else:
+        group.inputs.new('NodeSocketGeometry', "Geometry")
+        group.outputs.new('NodeSocketGeometry', "Geometry")
+    nodes = group.nodes
+    links = group.links
+
+    def named_attribute(name, data_type, x, y):
+        node = nodes.new('GeometryNodeInputNamedAttribute')
+        node.data_type = data_type
+        node.inputs['Name'].default_value = name
+        node.location = (x, y)
+        return _attribute_output(node)
+
+    def vector_math(operation, x, y):
+        node = nodes.new('ShaderNodeVectorMath')
+        node.operation = operation
+        node.location = (x, y)
+        return node
+
+    group_input = nodes.new('NodeGroupInput')
+    group_input.location = (-800, 200)
+    position = nodes.new('GeometryNodeInputPosition')
+    position.location = (-800, 0)
+    center = named_attribute(ISLAND_CENTER_ATTR, 'FLOAT_VECTOR', -800, -150)
+    scale = named_attribute(ISLAND_SCALE_ATTR, 'FLOAT', -800, -300)
+    rotation = named_attribute(ISLAND_ROTATION_ATTR, 'FLOAT_VECTOR', -800, -450)
+    offset = named_attribute(ISLAND_OFFSET_ATTR, 'FLOAT_VECTOR', -800, -600)
+
+    # center + rotate(scale * (position - center)) + offset
+    relative = vector_math('SUBTRACT', -550, 0)
+    links.new(position.outputs['Position'], relative.inputs[0])
+    links.new(center, relative.inputs[1])
+    scaled = vector_math('SCALE', -350, 0)
+    links.new(relative.outputs['Vector'], scaled.inputs[0])
+    links.new(scale, scaled.inputs['Scale'])
+    restored = vector_math('ADD', -150, 0)
+    links.new(scaled.outputs['Vector'], restored.inputs[0])
+    links.new(center, restored.inputs[1])
+    rotate = nodes.new('ShaderNodeVectorRotate')
+    rotate.rotation_type = 'EULER_XYZ'
+    rotate.location = (50, 0)
+    links.new(restored.outputs['Vector'], rotate.inputs['Vector'])
+    links.new(center, rotate.inputs['Center'])
+    links.new(rotation, rotate.inputs['Rotation'])
+    moved = vector_math('ADD', 250, 0)
+    links.new(rotate.outputs['Vector'], moved.inputs[0])
+    links.new(offset, moved.inputs[1])
+
+    set_position = nodes.new('GeometryNodeSetPosition')
+    set_position.location = (450, 200)
+    links.new(group_input.outputs[0], set_position.inputs['Geometry'])
+    links.new(moved.outputs['Vector'], set_position.inputs['Position'])
+    group_output = nodes.new('NodeGroupOutput')
+    group_output.location = (650, 200)
+    links.new(set_position.outputs['Geometry'], group_output.inputs[0])
+    return group
+
+def get_island_material():
+    """Emission material that reads each island's color from the island_color attribute."""
+    material = bpy.data.materials.get(ISLAND_MATERIAL)
+    if material is not None:
+        return material
+    material = bpy.data.materials.new(name=ISLAND_MATERIAL)
+    material.use_nodes = True
+    nodes = material.node_tree.nodes
+    for node in list(nodes):
+        nodes.remove(node)
+    attribute = nodes.new(type='ShaderNodeAttribute')
+    attribute.attribute_name = ISLAND_COLOR_ATTR
+    attribute.location = (-200, 0)
+    emission = nodes.new(type='ShaderNodeEmission')
+    emission.location = (0, 0)
+    material_output = nodes.new(type='ShaderNodeOutputMaterial')
+    material_output.location = (200, 0)
+    material.node_tree.links.new(attribute.outputs['Color'], emission.inputs['Color'])
+    material.node_tree.links.new(emission.outputs['Emission'], material_output.inputs['Surface'])
+    return material
+
+def material_color(material):
+    if material is None:
+        return (1.0, 1.0, 1.0, 1.0)
+    emission = single_emission_node(material)
+    if emission is not None:
+        return tuple(emission.inputs['Color'].default_value)
+    return tuple(material.diffuse_color)
+
+def split_object_islands(obj):
+    """Split every face of a mesh into its own island, keeping a single object.
+
+    Each island gets an id plus offset/rotation/scale/color point attributes that the
+    island Geometry Nodes modifier and material evaluate. Returns the island count.
+    """
+    if obj.data.users > 1:
+        obj.data = obj.data.copy()
+    mesh = obj.data
+
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bmesh.ops.split_edges(bm, edges=bm.edges[:])
+    bm.to_mesh(mesh)
+    bm.free()
+
+    face_count = len(mesh.polygons)
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    positions = positions.reshape(-1, 3)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    loop_starts = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    material_indices = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_indices)
+
+    # Loose vertices keep id -1 and are left alone by the island tools
+    ids = np.full(len(positions), -1, dtype=np.int32)
+    ids[loop_vertices] = faces_of_loops(loop_starts, len(loop_vertices))
+    valid = ids >= 0
+    counts = np.bincount(ids[valid], minlength=face_count)
+    centers = positions.copy()
+    island_centers = np.stack([np.bincount(ids[valid], weights=positions[valid, axis], minlength=face_count)
+                               for axis in range(3)], axis=1) / np.maximum(counts, 1)[:, None]
+    centers[valid] = island_centers[ids[valid]]
+
+    # Start each island with the color of the material its face used
+    slot_colors = np.array([material_color(m) for m in mesh.materials] or [(1.0, 1.0, 1.0, 1.0)], dtype=np.float32)
+    face_colors = slot_colors[np.clip(material_indices, 0, len(slot_colors) - 1)]
+    colors = np.ones((len(positions), 4), dtype=np.float32)
+    colors[valid] = face_colors[ids[valid]]
+
+    write_island_attribute(mesh, ISLAND_ID_ATTR, ids)
+    write_island_attribute(mesh, ISLAND_CENTER_ATTR, centers)
+    write_island_attribute(mesh, ISLAND_OFFSET_ATTR, np.zeros_like(positions))
+    write_island_attribute(mesh, ISLAND_ROTATION_ATTR, np.zeros_like(positions))
+    write_island_attribute(mesh, ISLAND_SCALE_ATTR, np.ones(len(positions), dtype=np.float32))
+    write_island_attribute(mesh, ISLAND_COLOR_ATTR, colors)
+
+    mesh.materials.clear()
+    mesh.materials.append(get_island_material())
+    mesh.polygons.foreach_set("material_index", np.zeros(face_count, dtype=np.int32))
+
+    modifier = obj.modifiers.get(ISLAND_MODIFIER) or obj.modifiers.new(ISLAND_MODIFIER, 'NODES')
+    modifier.node_group = get_island_node_group()
+    mesh.update()
+    return face_count
+
+def set_island_colors(obj, colors):
+    """Write one RGBA color per island (or a single color for all of them)."""
+    islands = IslandArrays(obj.data)
+    colors = np.broadcast_to(np.asarray(colors, dtype=np.float32), (islands.count, 4))
+    islands.set(ISLAND_COLOR_ATTR, colors)
+    if get_island_material().name not in obj.data.materials:
+        assign_material(obj, get_island_material())
+    return islands.count
+
+def randomize_island_locations(obj, props, rng=np.random):
+    islands = IslandArrays(obj.data)
+    targets = random_offsets(props, islands.count, rng)
+    enabled = np.array([props.use_x_range, props.use_y_range, props.use_z_range])
+    offsets = np.where(enabled, targets - islands.get(ISLAND_CENTER_ATTR), islands.get(ISLAND_OFFSET_ATTR))
+    islands.set(ISLAND_OFFSET_ATTR, offsets)
+    return islands.count
+
+def apply_island_offsets(obj):
+    """Bake the island offsets into the rest positions, making the current layout the new origin."""
+    mesh = obj.data
+    offsets = read_island_attribute(mesh, ISLAND_OFFSET_ATTR)
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    mesh.vertices.foreach_set("co", (positions.reshape(-1, 3) + offsets).ravel())
+    write_island_attribute(mesh, ISLAND_CENTER_ATTR, read_island_attribute(mesh, ISLAND_CENTER_ATTR) + offsets)
+    write_island_attribute(mesh, ISLAND_OFFSET_ATTR, np.zeros_like(offsets))
+
+class OBJECT_OT_split_faces(ChunkedOperator, bpy.types.Operator):
+    bl_idname = "object.split_faces"
+    bl_label = "Split Faces"
+    bl_description = "Split selected meshes into one object per face, origin at the face median, and record original location"
+    bl_options = {'REGISTER', 'UNDO'}
+    modal_threshold = 500
+
+    def work_size(self, context):
+        if context.scene.random_duplicate_props.split_mode == 'ISLANDS':
+            # One bulk operation per mesh, nothing to cut into chunks, so always run directly
+            return 0
+        return sum(len(obj.data.polygons) for obj in context.selected_objects if obj.type == 'MESH')
+
+    def steps(self, context):
+        if context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        start = time.perf_counter()
+        sources = [obj for obj in context.selected_objects if obj.type == 'MESH']
+        if context.scene.random_duplicate_props.split_mode == 'ISLANDS':
+            island_count = sum(split_object_islands(obj) for obj in sources)
+            elapsed = time.perf_counter() - start
+            self.report({'INFO'}, f"Split {len(sources)} mesh(es) into {island_count} face island(s) in {elapsed:.2f}s")
+            return {'FINISHED'}
+
+        total = sum(len(obj.data.polygons) for obj in sources)
+        new_objects = []
+        self.record(lambda: remove_duplicates(new_objects))
+        for obj in sources:
+            for face_obj in iter_face_objects(obj):
+                new_objects.append(face_obj)
+                yield len(new_objects), total
+
+        for obj in sources:
+            mesh = obj.data
+            bpy.data.objects.remove(obj)
+            if mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+        for obj in new_objects:
+            obj.select_set(True)
+        if new_objects:
+            context.view_layer.objects.active = new_objects[0]
+
+        elapsed = time.perf_counter() - start
+        self.report({'INFO'}, f"Split {len(sources)} mesh(es) into {len(new_objects)} object(s) and recorded original locations in {elapsed:.2f}s")
+        return {'FINISHED'}
+
+class OBJECT_OT_move_to_origin(bpy.types.Operator):
+    bl_idname = "object.move_to_origin"
+    bl_label = "Move to Origin"
+    bl_description = "Move selected objects back to their original locations"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        moved_count = 0
+        for obj in context.selected_objects:
+            if is_island_object(obj):
+                islands = IslandArrays(obj.data)
+                islands.set(ISLAND_OFFSET_ATTR, np.zeros((islands.count, 3)))
+                moved_count += islands.count
+            elif "original_location" in obj:
+                obj.location = obj["original_location"]
+                moved_count += 1
+        
+        if moved_count > 0:
+            self.report({'INFO'}, f"Moved {moved_count} object(s) to their original locations")
+        else:
+            self.report({'WARNING'}, "No objects with recorded original locations were selected")
+        return {'FINISHED'}
+
+class OBJECT_OT_set_origin(bpy.types.Operator):
+    bl_idname = "object.set_new_origin"
+    bl_label = "Set Origin"
+    bl_description = "Set the current location as the new origin for selected objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        for obj in context.selected_objects:
+            if is_island_object(obj):
+                apply_island_offsets(obj)
+            else:
+                obj["original_location"] = obj.location.copy()
+        
+        self.report({'INFO'}, f"Set new origin for {len(context.selected_objects)} object(s)")
+        return {'FINISHED'}
+
+
+# Scene custom property holding named transform snapshots: {name: {"names": [object names],
+# "rotation_modes": [rotation mode per object], "transforms": flat float array, 10 values per object}}
+SNAPSHOTS_PROP = "mask_snapshots"
+# Rotation property of each rotation mode; every Euler order uses rotation_euler
+ROTATION_PATHS = {'QUATERNION': "rotation_quaternion", 'AXIS_ANGLE': "rotation_axis_angle"}
+ROTATION_MODES = ('QUATERNION', 'XYZ', 'XZY', 'YXZ', 'YZX', 'ZXY', 'ZYX', 'AXIS_ANGLE')
+
+def rotation_path(mode):
+    return ROTATION_PATHS.get(mode, "rotation_euler")
+
+def read_object_transforms(objects):
+    """Return an (n, 10) array of location, rotation in each object's rotation mode and scale.
+
+    Euler rotations are padded to 4 values so every mode fits the same columns.
+    """
+    rows = []
+    for obj in objects:
+        rotation = tuple(getattr(obj, rotation_path(obj.rotation_mode)))
+        rows.append((*obj.location, *rotation, *(0.0,) * (4 - len(rotation)), *obj.scale))
+    return np.array(rows, dtype=np.float64).reshape(-1, 10)
+
+def write_object_transforms(objects, transforms, rotation_modes=None):
+    """Write rows of read_object_transforms back, switching to rotation_modes first when given."""
+    for index, (obj, row) in enumerate(zip(objects, transforms.tolist())):
+        if rotation_modes is not None:
+            obj.rotation_mode = rotation_modes[index]
+        path = rotation_path(obj.rotation_mode)
+        obj.location = row[0:3]
+        setattr(obj, path, row[3:6] if path == "rotation_euler" else row[3:7])
+        obj.scale = row[7:10]
+
+def key_object_transforms(objects, transforms, frame):
+    """Keyframe rows of read_object_transforms on frame, each rotation in its object's own mode."""
+    key_objects(objects, "location", transforms[:, 0:3], frame)
+    paths = [rotation_path(obj.rotation_mode) for obj in objects]
+    for path in set(paths):
+        rows = [index for index, other in enumerate(paths) if other == path]
+        width = 3 if path == "rotation_euler" else 4
+        key_objects([objects[index] for index in rows], path, transforms[rows, 3:3 + width], frame)
+    key_objects(objects, "scale", transforms[:, 7:10], frame)
+
+def snapshot_members(context, props):
+    if props.snapshot_scope == 'COLLECTION':
+        collection = bpy.data.collections.get(props.group_name)
+        return list(collection.all_objects) if collection else []
+    return list(context.selected_objects)
+
+def capture_snapshot(scene, name, objects):
+    snapshots = scene.get(SNAPSHOTS_PROP)
+    if snapshots is None:
+        scene[SNAPSHOTS_PROP] = {}
+        snapshots = scene[SNAPSHOTS_PROP]
+    snapshots[name] = {
+        "names": [obj.name for obj in objects],
+        "rotation_modes": [obj.rotation_mode for obj in objects],
+        "transforms": read_object_transforms(objects).ravel(),
+    }
+
+def load_snapshot(scene, name):
+    """Return (objects, (n, 10) transforms, rotation modes) for the members of a snapshot that still exist."""
+    snapshot = scene.get(SNAPSHOTS_PROP, {}).get(name)
+    if snapshot is None:
+        return [], np.empty((0, 10)), []
+    names = list(snapshot["names"])
+    if "rotation_modes" in snapshot:
+        transforms = np.asarray(snapshot["transforms"], dtype=np.float64).reshape(-1, 10)
+        modes = list(snapshot["rotation_modes"])
+    else:
+        # Older snapshots only stored rotation_euler, 9 values per object
+        transforms = np.insert(np.asarray(snapshot["transforms"], dtype=np.float64).reshape(-1, 9), 6, 0.0, axis=1)
+        modes = ['XYZ'] * len(names)
+    objects = [bpy.data.objects.get(member) for member in names]
+    present = [index for index, obj in enumerate(objects) if obj is not None]
+    return [objects[index] for index in present], transforms[present], [modes[index] for index in present]
+
+def blend_transforms(current, targets, rotation_modes, factor):
+    """Move rows of read_object_transforms towards targets; quaternions take the short way and stay unit length."""
+    blended = current + (targets - current) * factor
+    quaternion = np.array([mode == 'QUATERNION' for mode in rotation_modes], dtype=bool)
+    if quaternion.any():
+        start, end = current[quaternion, 3:7], targets[quaternion, 3:7]
+        end = np.where((start * end).sum(axis=1, keepdims=True) < 0.0, -end, end)
+        rotation = start + (end - start) * factor
+        length = np.linalg.norm(rotation, axis=1, keepdims=True)
+        blended[quaternion, 3:7] = np.where(length > 1e-9, rotation / np.maximum(length, 1e-9), end)
+    return blended
+
+class OBJECT_OT_capture_snapshot(bpy.types.Operator):
+    bl_idname = "object.capture_snapshot"
+    bl_label = "Capture Snapshot"
+    bl_description = "Store location, rotation and scale of the selection (or group collection) under a name"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        props = context.scene.random_duplicate_props
+        objects = snapshot_members(context, props)
+        if not objects or not props.snapshot_name:
+            self.report({'WARNING'}, "Need a snapshot name and some objects to capture")
+            return {'CANCELLED'}
+
+        capture_snapshot(context.scene, props.snapshot_name, objects)
+        self.report({'INFO'}, f"Captured snapshot '{props.snapshot_name}' of {len(objects)} object(s)")
+        return {'FINISHED'}
+
+class OBJECT_OT_restore_snapshot(bpy.types.Operator):
+    bl_idname = "object.restore_snapshot"
+    bl_label = "Restore Snapshot"
+    bl_description = "Blend the snapshot members towards their stored transforms, optionally keyframing the result"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    snapshot_name: bpy.props.StringProperty(name="Snapshot")
+
+    def execute(self, context):
+        props = context.scene.random_duplicate_props
+        objects, targets, modes = load_snapshot(context.scene, self.snapshot_name)
+        if not objects:
+            self.report({'WARNING'}, f"Snapshot '{self.snapshot_name}' has no remaining objects")
+            return {'CANCELLED'}
+
+        # Switching the mode converts the current rotation, so both sides are in the stored mode
+        for obj, mode in zip(objects, modes):
+            obj.rotation_mode = mode
+        transforms = blend_transforms(read_object_transforms(objects), targets, modes, props.snapshot_blend)
+        write_object_transforms(objects, transforms)
+        if props.snapshot_keyframe:
+            key_object_transforms(objects, transforms, context.scene.frame_current)
+
+        self.report({'INFO'}, f"Restored snapshot '{self.snapshot_name}' on {len(objects)} object(s)")
+        return {'FINISHED'}
+
+class OBJECT_OT_remove_snapshot(bpy.types.Operator):
+    bl_idname = "object.remove_snapshot"
+    bl_label = "Remove Snapshot"
+    bl_description = "Delete a stored transform snapshot"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    snapshot_name: bpy.props.StringProperty(name="Snapshot")
+
+    def execute(self, context):
+        snapshots = context.scene.get(SNAPSHOTS_PROP)
+        if snapshots is not None and self.snapshot_name in snapshots:
+            del snapshots[self.snapshot_name]
+        return {'FINISHED'}
+
+# A layout is a JSON manifest (names, meshes, collection) plus one .npy file per column next to it:
+# <stem>.<column>.npy, so the columns can be memory-mapped and read only where needed
+LAYOUT_VERSION = 2
+LAYOUT_COLUMNS = (
+    "transforms", "rotation_mode", "matrix_world", "original_location", "color", "mesh",
+    "mesh_bounds", "mesh_vertices", "mesh_vertex_start", "mesh_face_sizes", "mesh_face_start", "mesh_loops", "mesh_loop_start",
+)
+
+def layout_column_path(filepath, column):
+    return f"{os.path.splitext(filepath)[0]}.{column}.npy"
+
+def read_mesh_geometry(mesh):
+    """Return (vertex positions (V, 3), face sizes, face corner vertex indices in face order)."""
+    vertices = read_bulk(mesh.vertices, "co", 3, np.float32).reshape(-1, 3)
+    loops = read_bulk(mesh.loops, "vertex_index", 1, np.int32)
+    starts = read_bulk(mesh.polygons, "loop_start", 1, np.int32)
+    sizes = read_bulk(mesh.polygons, "loop_total", 1, np.int32)
+    # Loops aren't guaranteed to be stored in face order
+    corners = np.repeat(starts - (np.cumsum(sizes) - sizes), sizes) + np.arange(int(sizes.sum()))
+    return vertices, sizes, loops[corners]
+
+def geometry_hash(vertices, sizes, loops):
+    """Hex digest of mesh geometry as returned by read_mesh_geometry."""
+    digest = hashlib.blake2b(np.array([len(vertices), len(sizes), len(loops)], dtype=np.int64).tobytes(),
+                             digest_size=16)
+    for array in (vertices, sizes, loops):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+def write_layout(filepath, collection_name, objects):
+    """Write the objects' transforms, origins, palette colors and meshes as a layout."""
+    meshes = {}
+    for obj in objects:
+        if obj.type == 'MESH':
+            meshes.setdefault(obj.data, len(meshes))
+    geometry = [read_mesh_geometry(mesh) for mesh in meshes]
+
+    def starts(arrays):
+        return np.concatenate([[0], np.cumsum([len(array) for array in arrays])]).astype(np.int64)
+
+    columns = {
+        "transforms": read_object_transforms(objects).astype(np.float32),
+        "rotation_mode": np.array([ROTATION_MODES.index(obj.rotation_mode) for obj in objects], dtype=np.int8),
+        "matrix_world": np.array([obj.matrix_world for obj in objects], dtype=np.float32).reshape(-1, 4, 4),
+        "original_location": np.array([obj.get("original_location", (np.nan,) * 3) for obj in objects],
+                                      dtype=np.float32).reshape(-1, 3),
+        "color": np.array([object_palette_index(obj) for obj in objects], dtype=np.int8),
+        "mesh": np.array([meshes[obj.data] if obj.type == 'MESH' else -1 for obj in objects], dtype=np.int32),
+        "mesh_bounds": np.array([(v.min(axis=0), v.max(axis=0)) if len(v) else np.zeros((2, 3))
+                                 for v, _, _ in geometry], dtype=np.float32).reshape(-1, 2, 3),
+        "mesh_vertices": np.concatenate([v for v, _, _ in geometry] + [np.empty((0, 3), np.float32)]),
+        "mesh_vertex_start": starts([v for v, _, _ in geometry]),
+        "mesh_face_sizes": np.concatenate([f for _, f, _ in geometry] + [np.empty(0, np.int32)]),
+        "mesh_face_start": starts([f for _, f, _ in geometry]),
+        "mesh_loops": np.concatenate([l for _, _, l in geometry] + [np.empty(0, np.int32)]),
+        "mesh_loop_start": starts([l for _, _, l in geometry]),
+    }
+    for column, array in columns.items():
+        np.save(layout_column_path(filepath, column), array)
+    manifest = {
+        "version": LAYOUT_VERSION,
+        "collection": collection_name,
+        "objects": [obj.name for obj in objects],
+        "meshes": [mesh.name for mesh in meshes],
+        "mesh_hashes": [geometry_hash(*arrays) for arrays in geometry],
+        "palette": [name for name, _ in MASK_COLORS],
+    }
+    with open(filepath, "w", encoding="utf-8") as out:
+        json.dump(manifest, out)
+
+def read_layout(filepath):
+    """Return (manifest, {column: memory-mapped array}) for a layout written by write_layout."""
+    with open(filepath, encoding="utf-8") as stream:
+        manifest = json.load(stream)
+    if manifest.get("version") != LAYOUT_VERSION:
+        raise ValueError(f"Unsupported layout version {manifest.get('version')}")
+    columns = {column: np.load(layout_column_path(filepath, column), mmap_mode='r') for column in LAYOUT_COLUMNS}
+    return manifest, columns
+
+def layout_mesh(manifest, columns, index):
+    """The mesh for a layout mesh index: the existing one of that name if its geometry hash matches, else a new one."""
+    name = manifest["meshes"][index]
+    v0, v1 = columns["mesh_vertex_start"][index:index + 2]
+    f0, f1 = columns["mesh_face_start"][index:index + 2]
+    mesh = bpy.data.meshes.get(name)
+    hashes = manifest.get("mesh_hashes")
+    if (mesh is not None and hashes is not None and len(mesh.vertices) == v1 - v0 and len(mesh.polygons) == f1 - f0
+            and geometry_hash(*read_mesh_geometry(mesh)) == hashes[index]):
+        return mesh
+    l0, l1 = columns["mesh_loop_start"][index:index + 2]
+    sizes = np.asarray(columns["mesh_face_sizes"][f0:f1])
+    loops = np.asarray(columns["mesh_loops"][l0:l1]).tolist()
+    bounds = np.concatenate([[0], np.cumsum(sizes)]).tolist()
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(np.asarray(columns["mesh_vertices"][v0:v1]).tolist(), [],
+                     [loops[start:end] for start, end in zip(bounds[:-1], bounds[1:])])
+    mesh.update()
+    return mesh
+
+def layout_camera_rows(scene, camera, frame, columns):
+    """Indices of the layout objects whose mesh bounds are in the camera's view on frame."""
+    current_frame = scene.frame_current
+    try:
+        scene.frame_set(frame)
+        view_projection = camera_view_projection(scene, camera)
+    finally:
+        scene.frame_set(current_frame)
+    mesh = np.asarray(columns["mesh"])
+    # Objects without a mesh get a point box at their origin
+    boxes = np.zeros((len(mesh), 2, 3))
+    has_mesh = mesh >= 0
+    boxes[has_mesh] = columns["mesh_bounds"][mesh[has_mesh]]
+    corners = np.stack([boxes[:, [x, y, z], [0, 1, 2]] for x in (0, 1) for y in (0, 1) for z in (0, 1)], axis=1)
+    matrices = np.asarray(columns["matrix_world"], dtype=np.float64)
+    return np.flatnonzero(project_bounds(matrices, corners, view_projection)[0])
+
+class OBJECT_OT_export_layout(bpy.types.Operator):
+    bl_idname = "object.export_layout"
+    bl_label = "Export Layout"
+    bl_description = ("Write the transforms, original locations, palette colors and meshes of the selection "
+                      "(or group collection) to a layout file that can be loaded into other shots")
+    bl_options = {'REGISTER'}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = bpy.path.abspath("//layout.json") if bpy.data.filepath else "layout.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        props = context.scene.random_duplicate_props
+        objects = snapshot_members(context, props)
+        if not objects:
+            self.report({'WARNING'}, "No objects to export")
+            return {'CANCELLED'}
+
+        start = time.perf_counter()
+        filepath = bpy.path.ensure_ext(bpy.path.abspath(self.filepath), ".json")
+        collection_name = props.group_name if props.snapshot_scope == 'COLLECTION' else ""
+        write_layout(filepath, collection_name, objects)
+        elapsed = time.perf_counter() - start
+        self.report({'INFO'}, f"Wrote layout of {len(objects)} object(s) to {filepath} in {elapsed:.2f}s")
+        return {'FINISHED'}
+
+class OBJECT_OT_import_layout(bpy.types.Operator):
+    bl_idname = "object.import_layout"
+    bl_label = "Import Layout"
+    bl_description = ("Create or update the objects of a layout file, sharing one mesh per stored mesh. "
+                      "Can load only the objects in a region or in the camera's view")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    load: bpy.props.EnumProperty(
+        name="Load",
+        items=[
+            ('ALL', "Everything", "Load every object in the layout"),
+            ('REGION', "Region", "Only objects whose world location is inside the region box"),
+            ('CAMERA', "Camera View", "Only objects whose bounds are in the scene camera's view on the frame"),
+        ],
+        default='ALL'
+    )
+    region_min: bpy.props.FloatVectorProperty(name="Region Min", subtype='XYZ', default=(-10.0, -10.0, -10.0))
+    region_max: bpy.props.FloatVectorProperty(name="Region Max", subtype='XYZ', default=(10.0, 10.0, 10.0))
+    frame: bpy.props.IntProperty(name="Frame", description="Frame to check the camera view on")
+    apply_colors: bpy.props.BoolProperty(
+        name="Colors",
+        description="Give the objects their stored palette colors in the current color mode",
+        default=True
+    )
+
+    def invoke(self, context, event):
+        self.frame = context.scene.frame_current
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        scene = context.scene
+        props = scene.random_duplicate_props
+        start = time.perf_counter()
+        filepath = bpy.path.abspath(self.filepath)
+        try:
+            manifest, columns = read_layout(filepath)
+        except (OSError, ValueError, KeyError) as error:
+            self.report({'ERROR'}, f"Could not read layout: {error}")
+            return {'CANCELLED'}
+
+        names = manifest["objects"]
+        if self.load == 'REGION':
+            locations = np.asarray(columns["matrix_world"][:, :3, 3])
+            inside = (locations >= np.array(self.region_min)) & (locations <= np.array(self.region_max))
+            rows = np.flatnonzero(inside.all(axis=1))
+        elif self.load == 'CAMERA':
+            if scene.camera is None:
+                self.report({'ERROR'}, "Scene has no camera")
+                return {'CANCELLED'}
+            rows = layout_camera_rows(scene, scene.camera, self.frame, columns)
+        else:
+            rows = np.arange(len(names))
+
+        # Only the rows being loaded are read from the memory-mapped columns
+        mesh_indices = np.asarray(columns["mesh"][rows]).tolist()
+        meshes = {index: layout_mesh(manifest, columns, index) for index in set(mesh_indices) if index >= 0}
+        collection = get_group_collection(context, manifest["collection"])
+        objects = []
+        created = 0
+        for row, mesh_index in zip(rows.tolist(), mesh_indices):
+            obj = bpy.data.objects.get(names[row])
+            if obj is None:
+                obj = bpy.data.objects.new(names[row], meshes.get(mesh_index))
+                collection.objects.link(obj)
+                created += 1
+            objects.append(obj)
+
+        modes = [ROTATION_MODES[index] for index in np.asarray(columns["rotation_mode"][rows]).tolist()]
+        write_object_transforms(objects, np.asarray(columns["transforms"][rows], dtype=np.float64), modes)
+        original_locations = np.asarray(columns["original_location"][rows]).tolist()
+        colors = np.asarray(columns["color"][rows]).tolist()
+        for obj, original_location, color_index in zip(objects, original_locations, colors):
+            if not math.isnan(original_location[0]):
+                obj["original_location"] = original_location
+            if self.apply_colors and color_index >= 0:
+                color_name, color = MASK_COLORS[color_index]
+                apply_mask_color(obj, color, color_name, props.color_mode)
+
+        elapsed = time.perf_counter() - start
+        self.report({'INFO'}, f"Loaded {len(objects)} of {len(names)} object(s) ({created} created) "
+                              f"from {filepath} in {elapsed:.2f}s")
+        return {'FINISHED'}
+
+COLOR_TOLERANCE = 0.01
+
+def compare_colors(color1, color2, tolerance=COLOR_TOLERANCE):
+    return all(abs(c1 - c2) < tolerance for c1, c2 in zip(color1[:3], color2[:3]))
+
+def object_mask_colors(obj):
+    """Return the RGB colors of the emission and principled nodes in the object's materials.
+
+    Objects on the shared Object Color material report their own color, face-island
+    objects report the distinct colors of their island_color attribute, and inputs
+    driven by a link are skipped since their default value isn't what renders.
+    """
+    colors = []
+    for slot in obj.material_slots:
+        material = slot.material
+        if material is None:
+            continue
+        if material.name == OBJECT_COLOR_MATERIAL:
+            colors.append(tuple(obj.color)[:3])
+            continue
+        if material.name == ISLAND_MATERIAL:
+            if is_island_object(obj) and ISLAND_COLOR_ATTR in obj.data.attributes:
+                island_colors = read_island_attribute(obj.data, ISLAND_COLOR_ATTR)[:, :3]
+                colors.extend(map(tuple, np.unique(island_colors, axis=0).tolist()))
+            continue
+        if not material.use_nodes or material.node_tree is None:
+            continue
+        for node in material.node_tree.nodes:
+            if node.type == 'EMISSION':
+                socket = node.inputs['Color']
+            elif node.type == 'BSDF_PRINCIPLED':
+                socket = node.inputs['Base Color']
+            else:
+                continue
+            if not socket.is_linked:
+                colors.append(tuple(socket.default_value)[:3])
+    return colors
+
+def has_animated_color(obj):
+    """True when the object's color or one of its materials' node values is keyframed."""
+    action = obj.animation_data.action if obj.animation_data else None
+    if action is not None and action.fcurves.find("color") is not None:
+        return True
+    for slot in obj.material_slots:
+        tree = slot.material.node_tree if slot.material is not None else None
+        if tree is not None and tree.animation_data is not None and tree.animation_data.action is not None:
+            return True
+    return False
+
+class ColorIndex:
+    """Quantized color -> object index for the palette select buttons and counts.
+
+    Colors are bucketed into cells the size of COLOR_TOLERANCE, so every color
+    within tolerance of a query lives in the query's cell or one of its neighbours.
+    Objects, materials and meshes are keyed by session_uid so renames don't leave
+    stale entries; names are only a lookup cache. Per-palette object counts are
+    kept up to date as objects are added and removed, so the panel can draw them
+    without touching the index. Built on demand and kept current by the handlers below.
+    """
+
+    def __init__(self):
+        self.valid = False
+        self.cells = {}
+        self.object_colors = {}
+        self.object_palette = {}
+        self.names = {}
+        self.material_users = {}
+        self.mesh_users = {}
+        self.animated = set()
+        self.palette_counts = [0] * len(MASK_COLORS)
+        self.id_counts = (0, 0, 0)
+
+    @staticmethod
+    def cell(color):
+        return tuple(int(math.floor(c / COLOR_TOLERANCE)) for c in color[:3])
+
+    @staticmethod
+    def data_counts():
+        return len(bpy.data.objects), len(bpy.data.materials), len(bpy.data.meshes)
+
+    def invalidate(self):
+        self.valid = False
+        self.cells.clear()
+        self.object_colors.clear()
+        self.object_palette.clear()
+        self.names.clear()
+        self.material_users.clear()
+        self.mesh_users.clear()
+        self.animated.clear()
+        self.palette_counts = [0] * len(MASK_COLORS)
+
+    def ensure(self):
+        if not self.valid:
+            self.invalidate()
+            for obj in bpy.data.objects:
+                self.add(obj)
+            self.id_counts = self.data_counts()
+            self.valid = True
+
+    def add(self, obj):
+        if obj.type != 'MESH':
+            return
+        uid = obj.session_uid
+        colors = object_mask_colors(obj)
+        self.names[uid] = obj.name
+        self.object_colors[uid] = colors
+        for color in colors:
+            self.cells.setdefault(self.cell(color), set()).add(uid)
+        palette = {index for index in map(palette_index, colors) if index >= 0}
+        self.object_palette[uid] = palette
+        for index in palette:
+            self.palette_counts[index] += 1
+        for slot in obj.material_slots:
+            if slot.material is not None:
+                self.material_users.setdefault(slot.material.session_uid, set()).add(uid)
+        self.mesh_users.setdefault(obj.data.session_uid, set()).add(uid)
+        if has_animated_color(obj):
+            self.animated.add(uid)
 
-    def execute(self, context):
-        obj = context.active_object
-        if obj is None or obj.animation_data is None or obj.animation_data.action is None:
-            self.report({'ERROR'}, "No active object with animation data selected")
-            return {'CANCELLED'}
+    def remove(self, uid):
+        self.names.pop(uid, None)
+        self.animated.discard(uid)
+        for color in self.object_colors.pop(uid, ()):
+            members = self.cells.get(self.cell(color))
+            if members is not None:
+                members.discard(uid)
+        for index in self.object_palette.pop(uid, ()):
+            self.palette_counts[index] -= 1
 
-        current_frame = context.scene.frame_current
-        action = obj.animation_data.action
-        total_removed = 0
+    def refresh(self, obj):
+        self.remove(obj.session_uid)
+        self.add(obj)
 
-        for fcurve in action.fcurves:
-            keyframes_to_keep = [kf for kf in fcurve.keyframe_points if kf.co.x <= current_frame]
-            total_removed += len(fcurve.keyframe_points) - len(keyframes_to_keep)
-            fcurve.keyframe_points.clear()
-            for kf in keyframes_to_keep:
-                fcurve.keyframe_points.insert(frame=kf.co.x, value=kf.co.y)
-            fcurve.update()
+    def resolve(self, uids):
+        """Map uids to live objects, dropping the ones that no longer exist."""
+        objects = {}
+        stale = []
+        for uid in uids:
+            obj = bpy.data.objects.get(self.names.get(uid, ""))
+            if obj is not None and obj.session_uid == uid:
+                objects[uid] = obj
+            else:
+                stale.append(uid)
+        if stale:
+            # Renamed since they were indexed: one pass over the objects finds them all
+            by_uid = {obj.session_uid: obj for obj in bpy.data.objects}
+            for uid in stale:
+                obj = by_uid.get(uid)
+                if obj is None:
+                    self.remove(uid)
+                else:
+                    self.names[uid] = obj.name
+                    objects[uid] = obj
+        return objects
 
-        action.update_tag()
-        context.scene.frame_set(current_frame)
-        self.report({'INFO'}, f"Removed {total_removed} future keyframes for {obj.name}")
-        return {'FINISHED'}
+    def refresh_users(self, users):
+        for obj in self.resolve(list(users)).values():
+            self.refresh(obj)
 
-class OBJECT_OT_split_faces(bpy.types.Operator):
-    bl_idname = "object.split_faces"
-    bl_label = "Split Faces"
-    bl_description = "Split faces, separate by loose parts, set origin to geometry, and record original location"
-    bl_options = {'REGISTER', 'UNDO'}
+    def prune(self):
+        """Drop entries for objects, materials and meshes that were deleted."""
+        objects = {obj.session_uid for obj in bpy.data.objects}
+        for uid in [uid for uid in self.object_colors if uid not in objects]:
+            self.remove(uid)
+        for users, collection in ((self.material_users, bpy.data.materials), (self.mesh_users, bpy.data.meshes)):
+            live = {id_data.session_uid for id_data in collection}
+            for uid in [uid for uid in users if uid not in live]:
+                del users[uid]
+            for members in users.values():
+                members &= objects
+        self.id_counts = self.data_counts()
 
-    def execute(self, context):
-        if context.mode != 'EDIT':
-            bpy.ops.object.mode_set(mode='EDIT')
-        
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.edge_split(type='EDGE')
-        bpy.ops.object.mode_set(mode='OBJECT')
-        bpy.ops.mesh.separate(type='LOOSE')
-        
-        for obj in context.selected_objects:
-            context.view_layer.objects.active = obj
-            bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='MEDIAN')
-            obj["original_location"] = obj.location.copy()
-        
-        self.report({'INFO'}, f"Split faces and recorded original locations for {len(context.selected_objects)} object(s)")
-        return {'FINISHED'}
+    def objects_with_color(self, color, tolerance=COLOR_TOLERANCE):
+        self.ensure()
+        x, y, z = self.cell(color)
+        found = set()
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    for uid in self.cells.get((x + dx, y + dy, z + dz), ()):
+                        if any(compare_colors(c, color, tolerance) for c in self.object_colors.get(uid, ())):
+                            found.add(uid)
+        return list(self.resolve(found).values())
 
-class OBJECT_OT_move_to_origin(bpy.types.Operator):
-    bl_idname = "object.move_to_origin"
-    bl_label = "Move to Origin"
-    bl_description = "Move selected objects back to their original locations"
-    bl_options = {'REGISTER', 'UNDO'}
+_color_index = ColorIndex()
 
-    def execute(self, context):
-        moved_count = 0
-        for obj in context.selected_objects:
-            if "original_location" in obj:
-                obj.location = obj["original_location"]
-                moved_count += 1
-        
-        if moved_count > 0:
-            self.report({'INFO'}, f"Moved {moved_count} object(s) to their original locations")
-        else:
-            self.report({'WARNING'}, "No objects with recorded original locations were selected")
-        return {'FINISHED'}
+@persistent
+def update_color_index(scene, depsgraph):
+    if not _color_index.valid:
+        if scene.show_color_counts:
+            _color_index.ensure()
+        return
+    if _color_index.data_counts() != _color_index.id_counts:
+        # IDs were added or deleted; deletions don't show up in depsgraph.updates
+        _color_index.prune()
+    for update in depsgraph.updates:
+        id_data = update.id.original if hasattr(update.id, "original") else update.id
+        if isinstance(id_data, bpy.types.Object):
+            _color_index.refresh(id_data)
+        elif isinstance(id_data, bpy.types.Material):
+            _color_index.refresh_users(_color_index.material_users.get(id_data.session_uid, ()))
+        elif isinstance(id_data, bpy.types.Mesh):
+            _color_index.refresh_users(_color_index.mesh_users.get(id_data.session_uid, ()))
 
-class OBJECT_OT_set_origin(bpy.types.Operator):
-    bl_idname = "object.set_new_origin"
-    bl_label = "Set Origin"
-    bl_description = "Set the current location as the new origin for selected objects"
-    bl_options = {'REGISTER', 'UNDO'}
+@persistent
+def refresh_animated_colors(scene, depsgraph=None):
+    if _color_index.valid and _color_index.animated:
+        _color_index.refresh_users(set(_color_index.animated))
 
-    def execute(self, context):
-        for obj in context.selected_objects:
-            obj["original_location"] = obj.location.copy()
-        
-        self.report({'INFO'}, f"Set new origin for {len(context.selected_objects)} object(s)")
-        return {'FINISHED'}
+@persistent
+def invalidate_color_index(*args):
+    _color_index.invalidate()
 
+def update_show_color_counts(self, context):
+    if self.show_color_counts:
+        _color_index.ensure()
 
 class OBJECT_OT_add_material_with_emission(bpy.types.Operator):
     bl_idname = "object.add_material_with_emission"
@@ -215,14 +2268,11 @@ class OBJECT_OT_add_material_with_emission(bpy.types.Operator):
     def execute(self, context):
         selected_objects = context.selected_objects
         if not selected_objects:
-            # If no objects are selected, find and select objects with the specified color
-            for obj in context.view_layer.objects:
-                if obj.type == 'MESH' and obj.data.materials and self.is_object_visible(obj, context):
-                    for material in obj.data.materials:
-                        if self.check_material_color(material):
-                            obj.select_set(True)
-                            selected_objects.append(obj)
-                            break  # Stop checking other materials for this object
+            # If no objects are selected, look up objects with the specified color in the color index
+            for obj in _color_index.objects_with_color(self.color):
+                if context.view_layer.objects.get(obj.name) and self.is_object_visible(obj, context):
+                    obj.select_set(True)
+                    selected_objects.append(obj)
             
             if selected_objects:
                 context.view_layer.objects.active = selected_objects[0]
@@ -230,61 +2280,408 @@ class OBJECT_OT_add_material_with_emission(bpy.types.Operator):
             else:
                 self.report({'WARNING'}, f"No visible objects found with {self.color_name} material")
         else:
-            # Apply the material to selected objects as before
+            # Apply the color to selected objects as before
+            props = context.scene.random_duplicate_props
             for obj in selected_objects:
-                if obj.type == 'MESH':
-                    add_material_with_emission(obj, self.color, self.color_name)
+                if is_island_object(obj):
+                    set_island_colors(obj, self.color)
+                else:
+                    apply_mask_color(obj, self.color, self.color_name, props.color_mode)
+            if props.color_mode == 'OBJECT' and props.color_keyframe:
+                key_mask_colors([obj for obj in selected_objects if not is_island_object(obj)])
             self.report({'INFO'}, f"Applied {self.color_name} material to {len(selected_objects)} object(s)")
         
         return {'FINISHED'}
 
-    def check_material_color(self, material):
-        if material.use_nodes:
-            for node in material.node_tree.nodes:
-                if node.type == 'EMISSION':
-                    node_color = node.inputs['Color'].default_value
-                    if self.compare_colors(node_color, self.color):
-                        return True
-                elif node.type == 'BSDF_PRINCIPLED':
-                    node_color = node.inputs['Base Color'].default_value
-                    if self.compare_colors(node_color, self.color):
-                        return True
-        return False
-
-    def compare_colors(self, color1, color2, tolerance=0.01):
-        return all(abs(c1 - c2) < tolerance for c1, c2 in zip(color1[:3], color2[:3]))
-
     def is_object_visible(self, obj, context):
         # Check if the object is visible in the viewport and not hidden
         return obj.visible_get() and not obj.hide_viewport and not obj.hide_render
 
-class OBJECT_OT_add_random_material_with_emission(bpy.types.Operator):
+def has_keyframe(obj, data_path, frame):
+    action = obj.animation_data.action if obj.animation_data else None
+    fcurve = action.fcurves.find(data_path, index=0) if action else None
+    return fcurve is not None and any(point.co[0] == frame for point in fcurve.keyframe_points)
+
+def capture_mask_color(obj, frame):
+    """Remember everything a color button can change on a mesh object, for restore_mask_color."""
+    mesh = obj.data
+    slots = obj.material_slots
+    return {
+        "color": tuple(obj.color),
+        "keyed": has_keyframe(obj, "color", frame),
+        "frame": frame,
+        "material_count": len(mesh.materials),
+        "data_material": mesh.materials[0] if len(mesh.materials) else None,
+        "slot": (slots[0].link, slots[0].material) if slots else None,
+        "island_colors": read_island_attribute(mesh, ISLAND_COLOR_ATTR) if is_island_object(obj) else None,
+    }
+
+def restore_mask_color(obj, state):
+    mesh = obj.data
+    if state["island_colors"] is not None:
+        write_island_attribute(mesh, ISLAND_COLOR_ATTR, state["island_colors"])
+    if state["slot"] is not None:
+        link, material = state["slot"]
+        obj.material_slots[0].link = link
+        if link == 'OBJECT':
+            obj.material_slots[0].material = material
+    while len(mesh.materials) > state["material_count"]:
+        mesh.materials.pop()
+    if state["material_count"]:
+        mesh.materials[0] = state["data_material"]
+    obj.color = state["color"]
+    if state["keyed"]:
+        key_objects([obj], "color", [state["color"]], state["frame"], group="")
+    elif has_keyframe(obj, "color", state["frame"]):
+        obj.keyframe_delete(data_path="color", frame=state["frame"])
+
+SPATIAL_HASH_PRIMES = np.array([73856093, 19349663, 83492791], dtype=np.int64)
+
+def box_pairs(mins, maxs, tolerance=0.0):
+    """Return the (i, j) index pairs, i < j, of axis-aligned boxes that overlap or touch within tolerance.
+
+    Boxes go into every cell they cover on a uniform grid sized to the median
+    box, so only boxes sharing a cell are compared and the cost stays linear
+    for tiles of similar size. Works for 2D and 3D boxes.
+    """
+    count, dims = mins.shape
+    if count < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    mins = mins - tolerance * 0.5
+    maxs = maxs + tolerance * 0.5
+    cell = max(float(np.median((maxs - mins).max(axis=1))), 1e-6)
+    low = np.floor(mins / cell).astype(np.int64)
+    spans = np.floor(maxs / cell).astype(np.int64) - low + 1
+
+    # One (box, cell) row per cell a box covers
+    per_box = spans.prod(axis=1)
+    owners = np.repeat(np.arange(count), per_box)
+    steps = np.arange(len(owners)) - np.repeat(np.cumsum(per_box) - per_box, per_box)
+    cells = np.empty((len(owners), dims), dtype=np.int64)
+    for axis in reversed(range(dims)):
+        span = spans[owners, axis]
+        cells[:, axis] = low[owners, axis] + steps % span
+        steps //= span
+
+    # Sort rows by hashed cell and pair every row with the ones after it in the same bucket.
+    # Hash collisions only add candidates, which the overlap test below throws out.
+    cell_ids = (cells * SPATIAL_HASH_PRIMES[:dims]).sum(axis=1)
+    order = np.argsort(cell_ids, kind='stable')
+    owners = owners[order]
+    cell_ids = cell_ids[order]
+    cell_ends = np.searchsorted(cell_ids, cell_ids, side='right')
+    followers = cell_ends - np.arange(len(owners)) - 1
+    firsts = np.repeat(np.arange(len(owners)), followers)
+    seconds = firsts + 1 + np.arange(len(firsts)) - np.repeat(np.cumsum(followers) - followers, followers)
+    a, b = owners[firsts], owners[seconds]
+
+    touching = ((mins[a] <= maxs[b]) & (mins[b] <= maxs[a])).all(axis=1)
+    a, b = a[touching], b[touching]
+    # Boxes sharing several cells meet more than once
+    codes = np.unique(np.minimum(a, b) * count + np.maximum(a, b))
+    return np.column_stack([codes // count, codes % count])
+
+def touching_pairs(objects, scene=None, camera=None):
+    """Index pairs of objects whose world bound boxes touch.
+
+    With a camera, pairs whose bound boxes overlap in its view on the current
+    frame are added too, since those blend together in the rendered mask.
+    """
+    matrices, corners = gather_bounds(objects)
+    world = np.einsum('nij,ncj->nci', matrices[:, :3, :3], corners) + matrices[:, None, :3, 3]
+    mins, maxs = world.min(axis=1), world.max(axis=1)
+    # Split-face tiles share edges exactly, up to float error
+    extent = float(np.median((maxs - mins).max(axis=1))) if len(objects) else 0.0
+    pairs = box_pairs(mins, maxs, tolerance=extent * 1e-3)
+    if camera is not None:
+        visible, screen_min, screen_max = project_bounds(matrices, corners, camera_view_projection(scene, camera))
+        shown = np.flatnonzero(visible)
+        screen = shown[box_pairs(screen_min[shown], screen_max[shown])]
+        codes = np.unique(np.concatenate([pairs, screen]) @ np.array([len(objects), 1]))
+        pairs = np.column_stack([codes // len(objects), codes % len(objects)])
+    return pairs
+
+def color_graph(pairs, count, colors, rng, method='DSATUR'):
+    """Give every node a color index below colors, avoiding the colors of its neighbours.
+
+    DSATUR colors the node seeing the most distinct neighbour colors first;
+    GREEDY visits nodes in random order. A free color is picked at random so
+    the palette stays mixed, and when none is free the one least used by the
+    neighbours is taken. Returns (color indices, number of pairs sharing a color).
+    """
+    sources = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    targets = np.concatenate([pairs[:, 1], pairs[:, 0]])
+    neighbours = targets[np.argsort(sources, kind='stable')].tolist()
+    degrees = np.bincount(sources, minlength=count)
+    offsets = np.concatenate([[0], np.cumsum(degrees)]).tolist()
+    degrees = degrees.tolist()
+    picks = rng.integers(0, 1 << 30, size=count).tolist()
+
+    # Neighbour colors are tracked as bitmasks, so these tables cover every case
+    free_colors = [[color for color in range(colors) if not mask >> color & 1] for mask in range(1 << colors)]
+    saturation = [len(free_colors[0]) - len(free) for free in free_colors]
+    result = [-1] * count
+    seen = [0] * count
+
+    def assign(node, heap=None):
+        free = free_colors[seen[node]]
+        if free:
+            color = free[picks[node] % len(free)]
+        else:
+            used = [0] * colors
+            for other in neighbours[offsets[node]:offsets[node + 1]]:
+                used[result[other]] += 1
+            color = min(range(colors), key=lambda c: (used[c], (c - picks[node]) % colors))
+        result[node] = color
+        bit = 1 << color
+        for other in neighbours[offsets[node]:offsets[node + 1]]:
+            if seen[other] & bit:
+                continue
+            seen[other] |= bit
+            if heap is not None and result[other] < 0:
+                # The old heap entry goes stale and is skipped when popped
+                heapq.heappush(heap, (-saturation[seen[other]], -degrees[other], picks[other], other))
+
+    if method == 'GREEDY':
+        for node in rng.permutation(count).tolist():
+            assign(node)
+    else:
+        heap = [(0, -degrees[node], picks[node], node) for node in range(count)]
+        heapq.heapify(heap)
+        while heap:
+            negative, _, _, node = heapq.heappop(heap)
+            if result[node] < 0 and -negative == saturation[seen[node]]:
+                assign(node, heap)
+
+    result = np.array(result, dtype=np.int64)
+    return result, int((result[pairs[:, 0]] == result[pairs[:, 1]]).sum())
+
+def color_rng(props):
+    """Random generator for Random Color; seed 0 gives new colors on every run."""
+    return np.random.default_rng(props.color_seed or None)
+
+class OBJECT_OT_add_random_material_with_emission(ChunkedOperator, bpy.types.Operator):
     bl_idname = "object.add_random_material_with_emission"
     bl_label = "Random Color"
     bl_options = {'REGISTER', 'UNDO'}
+    modal_threshold = 2000
 
-    def execute(self, context):
-        colors = [
-            ("Red", (1.0, 0.0, 0.0, 1.0)),
-            ("Green", (0.0, 1.0, 0.0, 1.0)),
-            ("Blue", (0.0, 0.0, 1.0, 1.0)),
-            ("Cyan", (0.0, 1.0, 1.0, 1.0)),
-            ("Magenta", (1.0, 0.0, 1.0, 1.0)),
-            ("Yellow", (1.0, 1.0, 0.0, 1.0)),
-            ("Black", (0.0, 0.0, 0.0, 1.0)),
-            ("White", (1.0, 1.0, 1.0, 1.0))
-        ]
+    def work_size(self, context):
+        return len(context.selected_objects)
+
+    def steps(self, context):
+        colors = MASK_COLORS
+        props = context.scene.random_duplicate_props
         selected_objects = context.selected_objects
+        frame = context.scene.frame_current
+        rng = color_rng(props)
         if selected_objects:
-            for obj in selected_objects:
-                if obj.type == 'MESH':
-                    color_name, color = random.choice(colors)
-                    add_material_with_emission(obj, color, color_name)
-            self.report({'INFO'}, f"Applied random colors to {len(selected_objects)} object(s)")
+            choices = {}
+            conflicts = 0
+            if props.color_assignment != 'RANDOM':
+                camera = context.scene.camera if props.color_use_camera else None
+                if props.color_use_camera and camera is None:
+                    self.report({'WARNING'}, "No scene camera, using world bounds only")
+                tiles = [obj for obj in selected_objects if obj.type == 'MESH' and not is_island_object(obj)]
+                pairs = touching_pairs(tiles, context.scene, camera)
+                indices, conflicts = color_graph(pairs, len(tiles), len(colors), rng, props.color_assignment)
+                choices = dict(zip(tiles, indices.tolist()))
+            for done, obj in enumerate(selected_objects, 1):
+                if self.journal is not None and obj.type == 'MESH':
+                    self.record(functools.partial(restore_mask_color, obj, capture_mask_color(obj, frame)))
+                if is_island_object(obj):
+                    palette = np.array([color for _, color in colors], dtype=np.float32)
+                    islands = IslandArrays(obj.data)
+                    set_island_colors(obj, palette[rng.integers(len(palette), size=islands.count)])
+                else:
+                    color_name, color = colors[choices[obj] if obj in choices else int(rng.integers(len(colors)))]
+                    apply_mask_color(obj, color, color_name, props.color_mode)
+                yield done, len(selected_objects)
+            if props.color_mode == 'OBJECT' and props.color_keyframe:
+                key_mask_colors([obj for obj in selected_objects if not is_island_object(obj)], frame)
+            if conflicts:
+                self.report({'WARNING'}, f"Applied random colors to {len(selected_objects)} object(s), "
+                                         f"{conflicts} touching pair(s) had to share a color")
+            else:
+                self.report({'INFO'}, f"Applied random colors to {len(selected_objects)} object(s)")
         else:
             self.report({'WARNING'}, "No objects selected")
         return {'FINISHED'}
 
+class OBJECT_OT_purge_duplicate_materials(bpy.types.Operator):
+    bl_idname = "object.purge_duplicate_materials"
+    bl_label = "Clean Up Materials"
+    bl_description = "Merge duplicate *Material.NNN emission materials into the shared pooled materials and remove the leftovers"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        start = time.perf_counter()
+        count_before = len(bpy.data.materials)
+        rebuild_material_pool()
+
+        # Unsuffixed names first so "RedMaterial" wins over "RedMaterial.0042" as the canonical material
+        candidates = sorted(
+            (m for m in bpy.data.materials if POOL_KEY_PROP not in m and LEGACY_MATERIAL_PATTERN.match(m.name)),
+            key=lambda m: ("." in m.name, m.name),
+        )
+        replacement = {}
+        for material in candidates:
+            emission = single_emission_node(material)
+            if emission is None:
+                continue
+            key = material_pool_key(emission.inputs['Color'].default_value, emission.inputs['Strength'].default_value)
+            canonical = _pooled_material(key)
+            if canonical is None:
+                # Adopt the first legacy material of each color as the pooled one
+                material[POOL_KEY_PROP] = key
+                material.diffuse_color = key[:4]
+                _material_pool[key] = material.name
+                continue
+            replacement[material] = canonical
+
+        if replacement:
+            # One pass over the slots instead of a user_remap per material, which walks every datablock
+            for mesh in bpy.data.meshes:
+                for index, material in enumerate(mesh.materials):
+                    target = replacement.get(material)
+                    if target is not None:
+                        mesh.materials[index] = target
+            for obj in bpy.data.objects:
+                for slot in obj.material_slots:
+                    if slot.link == 'OBJECT':
+                        target = replacement.get(slot.material)
+                        if target is not None:
+                            slot.material = target
+            # Curves, text and the like still point at the duplicates
+            for material, users in bpy.data.user_map(subset=list(replacement)).items():
+                if users:
+                    material.user_remap(replacement[material])
+            bpy.data.batch_remove(list(replacement))
+        merged = len(replacement)
+
+        count_after = len(bpy.data.materials)
+        elapsed = time.perf_counter() - start
+        self.report({'INFO'}, f"Materials: {count_before} -> {count_after} ({merged} merged) in {elapsed:.2f}s")
+        return {'FINISHED'}
+
+# Generic attribute data type -> (foreach field, width, dtype) for hashing custom attributes
+ATTRIBUTE_FIELDS = {
+    'FLOAT': ("value", 1, np.float32),
+    'INT': ("value", 1, np.int32),
+    'INT8': ("value", 1, np.int32),
+    'BOOLEAN': ("value", 1, bool),
+    'FLOAT2': ("vector", 2, np.float32),
+    'INT32_2D': ("value", 2, np.int32),
+    'FLOAT_VECTOR': ("vector", 3, np.float32),
+    'FLOAT_COLOR': ("color", 4, np.float32),
+    'BYTE_COLOR': ("color", 4, np.float32),
+    'QUATERNION': ("value", 4, np.float32),
+}
+# Attributes already covered by the vertex/edge/face/UV arrays
+HASHED_BUILTIN_ATTRIBUTES = {"position", "material_index", "sharp_face"}
+
+def read_bulk(collection, field, width, dtype):
+    data = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(field, data)
+    return data
+
+def mesh_geometry_key(mesh):
+    """Hash a mesh's geometry, UVs, attributes and material list.
+
+    Returns (key, byte size of the hashed arrays), or None for meshes that
+    cannot be merged safely (shape keys, custom normals, unknown attribute types).
+    """
+    if mesh.shape_keys is not None or mesh.has_custom_normals:
+        return None
+    arrays = [
+        read_bulk(mesh.vertices, "co", 3, np.float32),
+        read_bulk(mesh.edges, "vertices", 2, np.int32),
+        read_bulk(mesh.loops, "vertex_index", 1, np.int32),
+        read_bulk(mesh.polygons, "loop_start", 1, np.int32),
+        read_bulk(mesh.polygons, "loop_total", 1, np.int32),
+        read_bulk(mesh.polygons, "material_index", 1, np.int32),
+        read_bulk(mesh.polygons, "use_smooth", 1, bool),
+    ]
+    names = [material.name if material else "" for material in mesh.materials]
+    uv_names = set()
+    for uv_layer in mesh.uv_layers:
+        uv_names.add(uv_layer.name)
+        names.append(uv_layer.name)
+        arrays.append(read_bulk(uv_layer.data, "uv", 2, np.float32))
+    for attribute in sorted(mesh.attributes, key=lambda a: a.name):
+        if attribute.name.startswith(".") or attribute.name in HASHED_BUILTIN_ATTRIBUTES or attribute.name in uv_names:
+            continue
+        if attribute.data_type not in ATTRIBUTE_FIELDS:
+            return None
+        field, width, dtype = ATTRIBUTE_FIELDS[attribute.data_type]
+        names.append(f"{attribute.name}:{attribute.domain}:{attribute.data_type}")
+        arrays.append(read_bulk(attribute.data, field, width, dtype))
+
+    digest = hashlib.blake2b("\0".join(names).encode(), digest_size=16)
+    for array in arrays:
+        # Lengths go in too so arrays can't bleed into each other
+        digest.update(len(array).to_bytes(8, "little"))
+        digest.update(array.tobytes())
+    return digest.digest(), sum(array.nbytes for array in arrays)
+
+def dedupe_meshes(meshes=None):
+    """Relink users of identical meshes to one canonical mesh and remove the copies.
+
+    Returns (number of meshes removed, approximate bytes of mesh data saved).
+    """
+    if meshes is None:
+        meshes = bpy.data.meshes
+    # Vertex weights live on the mesh but aren't exposed in bulk, so weighted meshes are left alone
+    weighted = {obj.data for obj in bpy.data.objects if obj.type == 'MESH' and len(obj.vertex_groups)}
+    # Unsuffixed names first so "Cube" wins over "Cube.0042" as the canonical mesh
+    candidates = sorted(
+        (m for m in meshes if m.library is None and not m.is_editmode and m not in weighted),
+        key=lambda m: ("." in m.name, m.name),
+    )
+
+    canonical = {}
+    replacement = {}
+    saved = 0
+    for mesh in candidates:
+        result = mesh_geometry_key(mesh)
+        if result is None:
+            continue
+        key, size = result
+        if key not in canonical:
+            canonical[key] = mesh
+            continue
+        replacement[mesh] = canonical[key]
+        saved += size
+    if not replacement:
+        return 0, 0
+
+    # One pass over the objects instead of a user_remap per mesh, which walks every datablock
+    for obj in bpy.data.objects:
+        target = replacement.get(obj.data)
+        if target is not None:
+            obj.data = target
+    for mesh, target in replacement.items():
+        if mesh.users:
+            mesh.user_remap(target)
+    bpy.data.batch_remove(list(replacement))
+    return len(replacement), saved
+
+class OBJECT_OT_dedupe_meshes(bpy.types.Operator):
+    bl_idname = "object.dedupe_meshes"
+    bl_label = "Merge Duplicate Meshes"
+    bl_description = "Find meshes with identical geometry, UVs and materials, point every object at one copy and remove the rest"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        start = time.perf_counter()
+        count_before = len(bpy.data.meshes)
+        merged, saved = dedupe_meshes()
+        count_after = len(bpy.data.meshes)
+        elapsed = time.perf_counter() - start
+        self.report({'INFO'}, f"Meshes: {count_before} -> {count_after} ({merged} merged, "
+                              f"{saved / (1024 * 1024):.1f} MB saved) in {elapsed:.2f}s")
+        return {'FINISHED'}
+
 class RENDER_OT_set_resolution(bpy.types.Operator):
     bl_idname = "render.set_resolution"
     bl_label = "Set Render Resolution"
@@ -312,6 +2709,425 @@ class RENDER_OT_fix_color(bpy.types.Operator):
         self.report({'INFO'}, "Set color view transform to 'Standard'")
         return {'FINISHED'}
 
+# Scene custom property holding the settings replaced by Mask Render Mode, keyed by data path
+MASK_RENDER_BACKUP_PROP = "mask_render_backup"
+
+# Settings shared by every mask profile: exact palette colors in lossless 8-bit PNGs
+MASK_RENDER_SETTINGS = (
+    ("render.use_motion_blur", False),
+    ("render.use_compositing", False),
+    ("render.use_sequencer", False),
+    ("render.film_transparent", False),
+    ("render.dither_intensity", 0.0),
+    ("render.filter_size", 0.0),
+    ("render.image_settings.file_format", 'PNG'),
+    ("render.image_settings.color_mode", 'RGB'),
+    ("render.image_settings.color_depth", '8'),
+    ("view_settings.view_transform", 'Standard'),
+    ("view_settings.look", 'None'),
+    ("view_settings.exposure", 0.0),
+    ("view_settings.gamma", 1.0),
+)
+
+MASK_RENDER_WORKBENCH_SETTINGS = (
+    ("render.engine", 'BLENDER_WORKBENCH'),
+    ("display.render_aa", 'OFF'),
+    ("display.shading.light", 'FLAT'),
+    ("display.shading.color_type", 'MATERIAL'),
+    ("display.shading.show_shadows", False),
+    ("display.shading.show_cavity", False),
+    ("display.shading.show_object_outline", False),
+    ("display.shading.show_specular_highlight", False),
+    ("display.shading.show_xray", False),
+    ("display.shading.use_dof", False),
+)
+
+MASK_RENDER_EEVEE_SETTINGS = (
+    ("eevee.taa_render_samples", 1),
+    ("eevee.use_bloom", False),
+    ("eevee.use_gtao", False),
+    ("eevee.use_ssr", False),
+    ("eevee.use_motion_blur", False),
+    ("eevee.use_shadows", False),
+    ("eevee.use_raytracing", False),
+)
+
+def eevee_engine_name():
+    engines = bpy.types.RenderSettings.bl_rna.properties['engine'].enum_items.keys()
+    return 'BLENDER_EEVEE_NEXT' if 'BLENDER_EEVEE_NEXT' in engines else 'BLENDER_EEVEE'
+
+def mask_render_settings(engine, color_type='MATERIAL'):
+    if engine == 'EEVEE':
+        return (("render.engine", eevee_engine_name()),) + MASK_RENDER_EEVEE_SETTINGS + MASK_RENDER_SETTINGS
+    # Workbench shows Object Color mode colors with the OBJECT color type
+    workbench = tuple((path, color_type if path == "display.shading.color_type" else value)
+                      for path, value in MASK_RENDER_WORKBENCH_SETTINGS)
+    return workbench + MASK_RENDER_SETTINGS
+
+def _resolve_setting(scene, path):
+    """Return (owner, attribute) for a scene-relative data path, or (None, attribute) if it doesn't exist here."""
+    *parts, attr = path.split(".")
+    owner = scene
+    for part in parts:
+        owner = getattr(owner, part, None)
+        if owner is None:
+            return None, attr
+    return (owner, attr) if hasattr(owner, attr) else (None, attr)
+
+def apply_mask_render_profile(scene, engine='WORKBENCH', color_type='MATERIAL'):
+    """Switch the scene to the mask profile, remembering the previous values the first time."""
+    backup = {}
+    for path, value in mask_render_settings(engine, color_type):
+        owner, attr = _resolve_setting(scene, path)
+        if owner is None:
+            # Setting doesn't exist in this Blender version
+            continue
+        previous = getattr(owner, attr)
+        try:
+            setattr(owner, attr, value)
+        except (TypeError, ValueError, AttributeError):
+            continue
+        backup[path] = previous
+    stored = scene.get(MASK_RENDER_BACKUP_PROP)
+    if stored is None:
+        scene[MASK_RENDER_BACKUP_PROP] = backup
+    else:
+        # Switching profiles keeps the artist's original values
+        for path, previous in backup.items():
+            if path not in stored:
+                stored[path] = previous
+    return len(backup)
+
+def restore_render_settings(scene):
+    backup = scene.get(MASK_RENDER_BACKUP_PROP)
+    if backup is None:
+        return 0
+    restored = 0
+    # Engine first so engine specific enums accept their old values
+    for path in sorted(backup.keys(), key=lambda path: path != "render.engine"):
+        owner, attr = _resolve_setting(scene, path)
+        if owner is None:
+            continue
+        try:
+            setattr(owner, attr, backup[path])
+            restored += 1
+        except (TypeError, ValueError, AttributeError):
+            pass
+    del scene[MASK_RENDER_BACKUP_PROP]
+    return restored
+
+def workbench_mismatches(objects, color_type):
+    """Return (face island objects, other objects) that Workbench would draw in the wrong color.
+
+    Workbench shades with the material viewport color (or the object color), never the
+    node tree, so island materials and emission materials whose viewport color doesn't
+    match their emission color only come out right in EEVEE.
+    """
+    islands, mismatched = [], []
+    for obj in objects:
+        materials = [slot.material for slot in obj.material_slots if slot.material is not None]
+        if any(material.name == ISLAND_MATERIAL for material in materials):
+            islands.append(obj)
+        elif color_type == 'MATERIAL' and any(not compare_colors(material_color(material), material.diffuse_color)
+                                              for material in materials):
+            mismatched.append(obj)
+    return islands, mismatched
+
+class RENDER_OT_mask_render_mode(bpy.types.Operator):
+    bl_idname = "render.mask_render_mode"
+    bl_label = "Mask Render Mode"
+    bl_description = "Switch to the cheapest render setup that outputs exact palette colors as lossless 8-bit PNGs"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    engine: bpy.props.EnumProperty(
+        name="Engine",
+        items=[
+            ('WORKBENCH', "Workbench", "Flat shaded Workbench, no anti-aliasing"),
+            ('EEVEE', "EEVEE", "EEVEE with a single sample and no filtering, for emission materials"),
+        ],
+        default='WORKBENCH'
+    )
+
+    def execute(self, context):
+        engine = self.engine
+        color_type = 'OBJECT' if context.scene.random_duplicate_props.color_mode == 'OBJECT' else 'MATERIAL'
+        fallback = None
+        if engine == 'WORKBENCH':
+            objects = [obj for obj in context.view_layer.objects if obj.type == 'MESH' and not obj.hide_render]
+            islands, mismatched = workbench_mismatches(objects, color_type)
+            if islands and len(islands) == len(objects):
+                # Only face islands visible: draw their island_color attribute directly
+                color_type = 'ATTRIBUTE'
+                for obj in islands:
+                    attribute = obj.data.color_attributes.get(ISLAND_COLOR_ATTR)
+                    if attribute is not None:
+                        obj.data.color_attributes.active_color = attribute
+            elif islands or mismatched:
+                engine = 'EEVEE'
+                fallback = len(islands) + len(mismatched)
+        changed = apply_mask_render_profile(context.scene, engine, color_type)
+        if fallback is not None:
+            self.report({'WARNING'}, f"Workbench can't show the colors of {fallback} object(s) (face islands or "
+                                     f"emission materials with a different viewport color), "
+                                     f"applied EEVEE mask render mode instead ({changed} settings)")
+        else:
+            self.report({'INFO'}, f"Applied {engine.title()} mask render mode ({changed} settings)")
+        return {'FINISHED'}
+
+class RENDER_OT_restore_render_settings(bpy.types.Operator):
+    bl_idname = "render.restore_render_settings"
+    bl_label = "Restore Render Settings"
+    bl_description = "Put back the render settings that were active before Mask Render Mode"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return MASK_RENDER_BACKUP_PROP in context.scene
+
+    def execute(self, context):
+        restored = restore_render_settings(context.scene)
+        self.report({'INFO'}, f"Restored {restored} render settings")
+        return {'FINISHED'}
+
+# Object custom property marking objects hidden from rendering by Hide Offscreen
+CULLED_PROP = "mask_offscreen_culled"
+
+class RENDER_OT_hide_offscreen(bpy.types.Operator):
+    bl_idname = "render.hide_offscreen"
+    bl_label = "Hide Offscreen"
+    bl_description = "Disable rendering for selected (or all) meshes that never enter the camera view"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    use_frame_range: bpy.props.BoolProperty(
+        name="Whole Frame Range",
+        description="Only hide objects that stay out of view for every frame of the scene range",
+        default=True
+    )
+
+    def execute(self, context):
+        scene = context.scene
+        camera = scene.camera
+        if camera is None:
+            self.report({'ERROR'}, "Scene has no camera")
+            return {'CANCELLED'}
+
+        objects = [obj for obj in (context.selected_objects or context.view_layer.objects)
+                   if obj.type == 'MESH' and (not obj.hide_render or obj.get(CULLED_PROP))]
+        frames = range(scene.frame_start, scene.frame_end + 1) if self.use_frame_range else [scene.frame_current]
+        masks = visibility_over_frames(scene, camera, objects, frames)
+        ever_visible = np.logical_or.reduce(list(masks.values())) if masks else np.zeros(len(objects), dtype=bool)
+
+        hidden = 0
+        for obj, is_visible in zip(objects, ever_visible.tolist()):
+            if is_visible:
+                if obj.get(CULLED_PROP):
+                    obj.hide_render = False
+                    del obj[CULLED_PROP]
+            else:
+                obj.hide_render = True
+                obj[CULLED_PROP] = True
+                hidden += 1
+
+        self.report({'INFO'}, f"Hid {hidden} of {len(objects)} object(s) outside the camera view")
+        return {'FINISHED'}
+
+class RENDER_OT_unhide_offscreen(bpy.types.Operator):
+    bl_idname = "render.unhide_offscreen"
+    bl_label = "Unhide Offscreen"
+    bl_description = "Re-enable rendering for objects hidden by Hide Offscreen"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        restored = 0
+        for obj in bpy.data.objects:
+            if obj.get(CULLED_PROP):
+                obj.hide_render = False
+                del obj[CULLED_PROP]
+                restored += 1
+        self.report({'INFO'}, f"Re-enabled rendering for {restored} object(s)")
+        return {'FINISHED'}
+
+def palette_index(color):
+    """Index of the MASK_COLORS entry matching color within COLOR_TOLERANCE, or -1."""
+    if color is None:
+        return -1
+    for index, (_, palette_color) in enumerate(MASK_COLORS):
+        if compare_colors(color, palette_color):
+            return index
+    return -1
+
+def object_palette_index(obj):
+    return next((index for index in map(palette_index, object_mask_colors(obj)) if index >= 0), -1)
+
+# Frame state hash -> metadata rows, shared between exports so unchanged frames aren't recomputed
+_metadata_cache = {}
+
+def frame_metadata(scene, camera, objects, colors, names_key):
+    """Project all objects for the current frame; returns (hash, rows dict of column arrays)."""
+    view_projection = camera_view_projection(scene, camera)
+    matrices, corners = gather_bounds(objects)
+    frame_hash = hashlib.blake2b(names_key + view_projection.tobytes() + matrices.tobytes() + corners.tobytes(),
+                                 digest_size=16).hexdigest()
+    rows = _metadata_cache.get(frame_hash)
+    if rows is None:
+        visible, screen_min, screen_max = project_bounds(matrices, corners, view_projection)
+        width = scene.render.resolution_x * scene.render.resolution_percentage / 100.0
+        height = scene.render.resolution_y * scene.render.resolution_percentage / 100.0
+        # Pixel boxes with a top-left origin: x0, y0, x1, y1
+        bbox = np.column_stack([
+            screen_min[:, 0] * width,
+            (1.0 - screen_max[:, 1]) * height,
+            screen_max[:, 0] * width,
+            (1.0 - screen_min[:, 1]) * height,
+        ])[visible]
+        rows = {
+            "object": np.flatnonzero(visible).astype(np.int32),
+            "color": colors[visible],
+            "bbox": bbox.astype(np.float32),
+            "area": ((bbox[:, 2] - bbox[:, 0]) * (bbox[:, 3] - bbox[:, 1])).astype(np.float32),
+        }
+        if len(_metadata_cache) > 4096:
+            _metadata_cache.clear()
+        _metadata_cache[frame_hash] = rows
+    return frame_hash, rows
+
+def load_metadata_cache(filepath, names):
+    """Seed the cache with the frames of a previous export of the same objects."""
+    if not os.path.exists(filepath):
+        return
+    if filepath.endswith(".npz"):
+        with np.load(filepath) as data:
+            if list(data["objects"]) != names:
+                return
+            for frame_hash, start, end in zip(data["frame_hash"], data["row_start"], data["row_end"]):
+                _metadata_cache[str(frame_hash)] = {column: data[column][start:end]
+                                                    for column in ("object", "color", "bbox", "area")}
+        return
+    index = {name: i for i, name in enumerate(names)}
+    with open(filepath) as stream:
+        for line in stream:
+            record = json.loads(line)
+            entries = record["objects"]
+            if any(entry["name"] not in index for entry in entries):
+                continue
+            _metadata_cache[record["hash"]] = {
+                "object": np.array([index[entry["name"]] for entry in entries], dtype=np.int32),
+                "color": np.array([entry["color"] for entry in entries], dtype=np.int32),
+                "bbox": np.array([entry["bbox"] for entry in entries], dtype=np.float32).reshape(-1, 4),
+                "area": np.array([entry["area"] for entry in entries], dtype=np.float32),
+            }
+
+def color_coverage(rows):
+    return np.bincount(rows["color"][rows["color"] >= 0], weights=rows["area"][rows["color"] >= 0],
+                       minlength=len(MASK_COLORS))
+
+def write_metadata_npz(filepath, names, frames, hashes, frame_rows):
+    counts = [len(rows["object"]) for rows in frame_rows]
+    row_end = np.cumsum(counts)
+
+    def column(name, shape):
+        return np.concatenate([rows[name] for rows in frame_rows]) if frame_rows else np.empty(shape)
+
+    np.savez_compressed(
+        filepath,
+        objects=np.array(names),
+        palette=np.array([name for name, _ in MASK_COLORS]),
+        frames=np.array(frames, dtype=np.int32),
+        frame_hash=np.array(hashes),
+        row_start=row_end - counts,
+        row_end=row_end,
+        frame=np.repeat(np.array(frames, dtype=np.int32), counts),
+        object=column("object", (0,)),
+        color=column("color", (0,)),
+        bbox=column("bbox", (0, 4)),
+        area=column("area", (0,)),
+        coverage=np.array([color_coverage(rows) for rows in frame_rows]).reshape(-1, len(MASK_COLORS)),
+    )
+
+def write_metadata_jsonl(filepath, names, frames, hashes, frame_rows):
+    palette = [name for name, _ in MASK_COLORS]
+    with open(filepath, "w") as stream:
+        for frame, frame_hash, rows in zip(frames, hashes, frame_rows):
+            coverage = color_coverage(rows)
+            record = {
+                "frame": frame,
+                "hash": frame_hash,
+                "objects": [
+                    {"name": names[obj], "color": int(color), "bbox": [round(v, 2) for v in bbox], "area": round(area, 2)}
+                    for obj, color, bbox, area in zip(rows["object"].tolist(), rows["color"].tolist(),
+                                                      rows["bbox"].tolist(), rows["area"].tolist())
+                ],
+                "coverage": {palette[i]: round(float(value), 2) for i, value in enumerate(coverage) if value},
+            }
+            stream.write(json.dumps(record) + "\n")
+
+class RENDER_OT_export_mask_metadata(bpy.types.Operator):
+    bl_idname = "render.export_mask_metadata"
+    bl_label = "Export Mask Metadata"
+    bl_description = "Write per-frame screen bounding boxes, palette colors and coverage of all renderable meshes"
+    bl_options = {'REGISTER'}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    file_format: bpy.props.EnumProperty(
+        name="Format",
+        items=[
+            ('NPZ', "NumPy (.npz)", "Columnar arrays: frame, object, color, bbox, area"),
+            ('JSONL', "JSON Lines (.jsonl)", "One JSON record per frame"),
+        ],
+        default='NPZ'
+    )
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = bpy.path.abspath("//mask_metadata.npz") if bpy.data.filepath else "mask_metadata.npz"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        scene = context.scene
+        camera = scene.camera
+        if camera is None:
+            self.report({'ERROR'}, "Scene has no camera")
+            return {'CANCELLED'}
+
+        extension = ".npz" if self.file_format == 'NPZ' else ".jsonl"
+        filepath = bpy.path.ensure_ext(bpy.path.abspath(self.filepath), extension)
+        start = time.perf_counter()
+        objects = [obj for obj in context.view_layer.objects if obj.type == 'MESH' and not obj.hide_render]
+        names = [obj.name for obj in objects]
+        names_key = hashlib.blake2b("\0".join(names).encode(), digest_size=16).digest()
+        colors = np.array([object_palette_index(obj) for obj in objects], dtype=np.int32)
+        # Object Color mode colors can be animated, so those are read again every frame
+        object_colored = [(index, obj) for index, obj in enumerate(objects) if uses_object_color(obj)]
+        render = scene.render
+        names_key += np.array(
+            [render.resolution_x, render.resolution_y, render.resolution_percentage], dtype=np.int32).tobytes()
+        load_metadata_cache(filepath, names)
+
+        frames = list(range(scene.frame_start, scene.frame_end + 1))
+        cached_before = len(_metadata_cache)
+        hashes, frame_rows = [], []
+        current_frame = scene.frame_current
+        try:
+            for frame in frames:
+                scene.frame_set(frame)
+                for index, obj in object_colored:
+                    colors[index] = palette_index(tuple(obj.color)[:3])
+                frame_hash, rows = frame_metadata(scene, camera, objects, colors, names_key + colors.tobytes())
+                hashes.append(frame_hash)
+                frame_rows.append(rows)
+        finally:
+            scene.frame_set(current_frame)
+        computed = len(_metadata_cache) - cached_before
+
+        if self.file_format == 'NPZ':
+            write_metadata_npz(filepath, names, frames, hashes, frame_rows)
+        else:
+            write_metadata_jsonl(filepath, names, frames, hashes, frame_rows)
+        elapsed = time.perf_counter() - start
+        self.report({'INFO'}, f"Wrote metadata for {len(frames)} frame(s) ({max(computed, 0)} recomputed) to {filepath} in {elapsed:.2f}s")
+        return {'FINISHED'}
+
 class OBJECT_OT_random_resize(bpy.types.Operator):
     bl_idname = "object.random_resize"
     bl_label = "Random Resize"
@@ -321,11 +3137,28 @@ class OBJECT_OT_random_resize(bpy.types.Operator):
         props = context.scene.random_duplicate_props
         selected_objects = context.selected_objects
         
+        rng = placement_rng(props)
+        objects = []
         for obj in selected_objects:
-            random_scale = random.uniform(props.scale_min, props.scale_max)
+            if is_island_object(obj):
+                islands = IslandArrays(obj.data)
+                islands.set(ISLAND_SCALE_ATTR, rng.uniform(props.scale_min, props.scale_max, islands.count))
+            else:
+                objects.append(obj)
+
+        scales = rng.uniform(props.scale_min, props.scale_max, len(objects))
+        reduced = 0
+        if props.placement_mode == 'POISSON' and objects:
+            # Keep the scaled bounds clear of each other at the objects' current spots
+            positions = [obj.matrix_world.translation for obj in objects]
+            base_radii = bounding_radii(objects, np.ones((len(objects), 3)))
+            scales, reduced = fit_scales(positions, base_radii, scales, props.scale_min, props.placement_margin)
+        for obj, random_scale in zip(objects, scales.tolist()):
             obj.scale = (random_scale, random_scale, random_scale)
         
         self.report({'INFO'}, f"Randomly resized {len(selected_objects)} object(s)")
+        if reduced:
+            self.report({'INFO'}, f"Scaled down {reduced} object(s) to keep them from overlapping")
         return {'FINISHED'}
 
 class OBJECT_OT_randomize_location(bpy.types.Operator):
@@ -337,14 +3170,32 @@ class OBJECT_OT_randomize_location(bpy.types.Operator):
         props = context.scene.random_duplicate_props
         selected_objects = context.selected_objects
         
+        rng = placement_rng(props)
+        objects = []
         for obj in selected_objects:
-            random_x = random.uniform(-props.x_range, props.x_range) if props.use_x_range else obj.location.x
-            random_y = random.uniform(-props.y_range, props.y_range) if props.use_y_range else obj.location.y
-            random_z = random.uniform(-props.z_range, props.z_range) if props.use_z_range else obj.location.z
-            
-            obj.location = (random_x, random_y, random_z)
+            if is_island_object(obj):
+                randomize_island_locations(obj, props, rng)
+            else:
+                objects.append(obj)
+
+        # Enabled axes are drawn from -range..range, disabled axes keep the current value
+        current = np.array([obj.location for obj in objects], dtype=np.float64).reshape(-1, 3)
+        enabled = np.array([props.use_x_range, props.use_y_range, props.use_z_range])
+        ranges = axis_ranges(props)
+        lows = np.where(enabled, -ranges, current)
+        highs = np.where(enabled, ranges, current)
+        overlapping = 0
+        if props.placement_mode == 'POISSON':
+            radii = bounding_radii(objects) + props.placement_margin * 0.5
+            locations, overlapping = poisson_disk_positions(lows, highs, radii, rng)
+        else:
+            locations = rng.uniform(lows, highs)
+        for obj, location in zip(objects, locations.tolist()):
+            obj.location = location
         
         self.report({'INFO'}, f"Randomized location for {len(selected_objects)} object(s)")
+        if overlapping:
+            self.report({'WARNING'}, f"{overlapping} object(s) did not fit without overlapping, increase the ranges")
         return {'FINISHED'}
 
 class OBJECT_OT_select_all_in_groups(bpy.types.Operator):
@@ -357,16 +3208,115 @@ class OBJECT_OT_select_all_in_groups(bpy.types.Operator):
         context.scene.select_all_in_groups = not context.scene.select_all_in_groups
         return {'FINISHED'}
 
-def select_group_objects(self, context):
-    if context.scene.select_all_in_groups:
-        if self.bl_space_type == 'OUTLINER':
-            active_object = context.active_object
-            if active_object and active_object.users_collection:
-                bpy.ops.object.select_all(action='DESELECT')
-                for obj in active_object.users_collection[0].objects:
-                    obj.select_set(True)
-                context.view_layer.objects.active = active_object
-    return None
+class CollectionIndex:
+    """Collection membership by session_uid, rebuilt lazily after collections change.
+
+    members maps a collection's session_uid to the session_uids of its objects.
+    Object names are only a lookup cache, so renamed objects stay in their group.
+    """
+
+    def __init__(self):
+        self.members = None
+        self.names = {}
+
+    def invalidate(self):
+        self.members = None
+        self.names.clear()
+
+    def ensure(self):
+        if self.members is not None:
+            return
+        self.members = {}
+        for collection in bpy.data.collections:
+            uids = []
+            for obj in collection.objects:
+                self.names[obj.session_uid] = obj.name
+                uids.append(obj.session_uid)
+            self.members[collection.session_uid] = uids
+
+    def objects_in(self, collection):
+        """The objects of collection, in collection order."""
+        self.ensure()
+        uids = self.members.get(collection.session_uid, [])
+        objects = []
+        for uid in uids:
+            obj = bpy.data.objects.get(self.names.get(uid, ""))
+            if obj is None or obj.session_uid != uid:
+                break
+            objects.append(obj)
+        else:
+            return objects
+        # Renamed since the index was built: one pass over the objects finds them all
+        by_uid = {obj.session_uid: obj for obj in bpy.data.objects}
+        objects = [by_uid[uid] for uid in uids if uid in by_uid]
+        for obj in objects:
+            self.names[obj.session_uid] = obj.name
+        return objects
+
+_collection_index = CollectionIndex()
+
+# Owner of the add-on's msgbus subscriptions, and the last active object we reacted to
+_msgbus_owner = object()
+_last_active_object = None
+
+def select_objects(view_layer, objects, active=None):
+    """Make exactly the given objects of the view layer selected, optionally setting the active one."""
+    global _last_active_object
+    for obj in view_layer.objects.selected:
+        obj.select_set(False)
+    layer_objects = view_layer.objects
+    for obj in objects:
+        if layer_objects.get(obj.name) is not None:
+            obj.select_set(True)
+    if active is not None:
+        # Remember it first so the msgbus notification doesn't reselect another group
+        _last_active_object = active.name
+        view_layer.objects.active = active
+
+def on_active_object_changed():
+    global _last_active_object
+    context = bpy.context
+    view_layer = context.view_layer
+    active = view_layer.objects.active if view_layer else None
+    name = active.name if active else None
+    if name == _last_active_object:
+        return
+    _last_active_object = name
+    if active is None or not context.scene.select_all_in_groups:
+        return
+    if not active.users_collection:
+        return
+    collection = active.users_collection[0]
+    if bpy.data.collections.get(collection.name) == collection:
+        select_objects(view_layer, _collection_index.objects_in(collection))
+    else:
+        # A scene's master collection, which the index doesn't cover
+        select_objects(view_layer, collection.objects)
+
+def subscribe_active_object():
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    bpy.msgbus.subscribe_rna(
+        key=(bpy.types.LayerObjects, "active"),
+        owner=_msgbus_owner,
+        args=(),
+        notify=on_active_object_changed,
+    )
+
+@persistent
+def resubscribe_active_object(*args):
+    # Loading a file drops every msgbus subscription
+    global _last_active_object
+    _last_active_object = None
+    subscribe_active_object()
+
+@persistent
+def update_collection_index(scene, depsgraph):
+    if depsgraph.id_type_updated('COLLECTION'):
+        _collection_index.invalidate()
+
+@persistent
+def invalidate_collection_index(*args):
+    _collection_index.invalidate()
 
 class OUTLINER_OT_select_group_objects(bpy.types.Operator):
     bl_idname = "outliner.select_group_objects"
@@ -377,20 +3327,166 @@ class OUTLINER_OT_select_group_objects(bpy.types.Operator):
     group_name: bpy.props.StringProperty()
 
     def execute(self, context):
-        if context.scene.select_all_in_groups:
-            collection = bpy.data.collections.get(self.group_name)
-            if collection:
-                bpy.ops.object.select_all(action='DESELECT')
-                for obj in collection.objects:
-                    obj.select_set(True)
-                if collection.objects:
-                    context.view_layer.objects.active = collection.objects[0]
+        collection = bpy.data.collections.get(self.group_name)
+        if context.scene.select_all_in_groups and collection is not None:
+            objects = _collection_index.objects_in(collection)
+            if objects:
+                view_layer = context.view_layer
+                select_objects(view_layer, objects, active=view_layer.objects.get(objects[0].name))
         return {'FINISHED'}
 
 def draw_outliner_group_menu(self, context):
     layout = self.layout
     layout.operator(OUTLINER_OT_select_group_objects.bl_idname, text="Select All Objects").group_name = context.collection.name
 
+# bpy.data collections whose size is compared before and after a timed operator
+TIMED_DATABLOCKS = ("objects", "meshes", "materials", "collections", "actions", "node_groups", "images")
+
+_timing_history = collections.deque(maxlen=50)
+# Operator class -> its own execute (None if inherited), while timing is enabled
+_timed_operators = {}
+# Entry collecting depsgraph updates; after execute returns it still gets the update the operator caused
+_timing_state = {"entry": None, "finished": False}
+
+def count_datablocks():
+    return {name: len(getattr(bpy.data, name)) for name in TIMED_DATABLOCKS}
+
+def start_timing(cls, context):
+    """Open a timing entry for an operator run; finish_timing closes it and adds it to the history."""
+    entry = {
+        "operator": cls.bl_idname,
+        "label": cls.bl_label,
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "selected": len(context.selected_objects) if hasattr(context, "selected_objects") else 0,
+        "objects_touched": 0,
+        "depsgraph_updates": 0,
+        "profile": None,
+    }
+    _timing_state["entry"], _timing_state["finished"] = entry, False
+    return {
+        "entry": entry,
+        "before": count_datablocks(),
+        "profile": cProfile.Profile() if context.window_manager.mask_timing_profile else None,
+        "start": time.perf_counter(),
+    }
+
+def finish_timing(timing, result=None):
+    entry = timing["entry"]
+    entry["seconds"] = time.perf_counter() - timing["start"]
+    _timing_state["finished"] = True
+    before, after = timing["before"], count_datablocks()
+    entry["datablocks"] = {name: after[name] - before[name] for name in TIMED_DATABLOCKS
+                           if after[name] != before[name]}
+    if timing["profile"] is not None:
+        stream = io.StringIO()
+        pstats.Stats(timing["profile"], stream=stream).sort_stats("cumulative").print_stats(20)
+        entry["profile"] = stream.getvalue()
+    if result is not None:
+        entry["result"] = sorted(result)
+    _timing_history.append(entry)
+
+def timed_execute(cls, execute):
+    @functools.wraps(execute)
+    def wrapper(self, context):
+        timing = start_timing(cls, context)
+        result = None
+        try:
+            profile = timing["profile"]
+            if profile is not None:
+                result = profile.runcall(execute, self, context)
+            else:
+                result = execute(self, context)
+        finally:
+            finish_timing(timing, result)
+        return result
+    return wrapper
+
+@persistent
+def record_depsgraph_update(scene, depsgraph):
+    entry = _timing_state["entry"]
+    if entry is None:
+        return
+    entry["depsgraph_updates"] += 1
+    entry["objects_touched"] += sum(1 for update in depsgraph.updates if isinstance(update.id, bpy.types.Object))
+    if _timing_state["finished"]:
+        # The first update after execute returned belongs to the operator, later ones don't
+        _timing_state["entry"] = None
+
+def enable_operator_timing():
+    for cls in classes:
+        if cls in _timed_operators or cls in (WM_OT_export_operator_timings, WM_OT_clear_operator_timings):
+            continue
+        if issubclass(cls, bpy.types.Operator) and hasattr(cls, "execute"):
+            _timed_operators[cls] = cls.__dict__.get("execute")
+            cls.execute = timed_execute(cls, cls.execute)
+    if record_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(record_depsgraph_update)
+
+def disable_operator_timing():
+    # Put the original methods back so disabled timing costs nothing
+    for cls, execute in _timed_operators.items():
+        if execute is None:
+            # Inherited from ChunkedOperator
+            del cls.execute
+        else:
+            cls.execute = execute
+    _timed_operators.clear()
+    _timing_state["entry"] = None
+    if record_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(record_depsgraph_update)
+
+def update_operator_timing(self, context):
+    if self.mask_timing:
+        enable_operator_timing()
+    else:
+        disable_operator_timing()
+
+@persistent
+def sync_operator_timing(*args):
+    # The toggle is saved with the window manager, the wrapped methods are not
+    window_manager = bpy.context.window_manager
+    if window_manager is not None:
+        update_operator_timing(window_manager, bpy.context)
+
+class WM_OT_export_operator_timings(bpy.types.Operator):
+    bl_idname = "wm.export_operator_timings"
+    bl_label = "Export Timings"
+    bl_description = "Write the recorded operator timings (and profiles) to a JSON file"
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+
+    @classmethod
+    def poll(cls, context):
+        return len(_timing_history) > 0
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = bpy.path.abspath("//operator_timings.json") if bpy.data.filepath else "operator_timings.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        filepath = bpy.path.ensure_ext(bpy.path.abspath(self.filepath), ".json")
+        record = {
+            "blender": bpy.app.version_string,
+            "addon_version": list(bl_info["version"]),
+            "blend_file": bpy.data.filepath,
+            "timings": list(_timing_history),
+        }
+        with open(filepath, "w", encoding="utf-8") as out:
+            json.dump(record, out, indent=2)
+        self.report({'INFO'}, f"Wrote {len(_timing_history)} timing(s) to {filepath}")
+        return {'FINISHED'}
+
+class WM_OT_clear_operator_timings(bpy.types.Operator):
+    bl_idname = "wm.clear_operator_timings"
+    bl_label = "Clear Timings"
+    bl_description = "Forget the recorded operator timings"
+
+    def execute(self, context):
+        _timing_history.clear()
+        return {'FINISHED'}
+
 class OBJECT_PT_random_duplicate_panel(bpy.types.Panel):
     bl_idname = "OBJECT_PT_random_duplicate_panel"
     bl_label = "Random Duplicate Objects"
@@ -428,8 +3524,18 @@ class OBJECT_PT_random_duplicate_panel(bpy.types.Panel):
             sub.enabled = props.use_z_range
             sub.prop(props, "z_range")
             
+            box.prop(props, "placement_mode")
+            row = box.row(align=True)
+            row.prop(props, "placement_seed")
+            sub = row.row(align=True)
+            sub.enabled = props.placement_mode == 'POISSON'
+            sub.prop(props, "placement_margin")
+            
             box.prop(props, "group_name")
-            box.operator("object.random_duplicate")
+            box.prop(props, "duplicate_mode")
+            row = box.row(align=True)
+            row.operator("object.random_duplicate")
+            row.operator("object.reroll_duplicates", icon='FILE_REFRESH')
         
         # Utils
         box = layout.box()
@@ -438,11 +3544,34 @@ class OBJECT_PT_random_duplicate_panel(bpy.types.Panel):
         row.label(text="Utils")
         if context.scene.show_utils:
             box.operator("object.randomize_location")
-            box.operator("object.split_faces")
+            row = box.row(align=True)
+            row.operator("object.split_faces")
+            row.prop(props, "split_mode", text="")
             box.operator("object.set_new_origin")
             box.operator("object.move_to_origin")
             box.prop(context.scene, "select_all_in_groups", text="Select All In Groups")
         
+        # Transform Snapshots
+        box = layout.box()
+        row = box.row()
+        row.prop(context.scene, "show_snapshots", icon="TRIA_DOWN" if context.scene.show_snapshots else "TRIA_RIGHT", icon_only=True, emboss=False)
+        row.label(text="Transform Snapshots")
+        if context.scene.show_snapshots:
+            row = box.row(align=True)
+            row.prop(props, "snapshot_name", text="")
+            row.prop(props, "snapshot_scope", text="")
+            box.operator("object.capture_snapshot")
+            row = box.row(align=True)
+            row.prop(props, "snapshot_blend", slider=True)
+            row.prop(props, "snapshot_keyframe", text="", icon='KEY_HLT')
+            for name in context.scene.get(SNAPSHOTS_PROP, {}).keys():
+                row = box.row(align=True)
+                row.operator("object.restore_snapshot", text=name, icon='RECOVER_LAST').snapshot_name = name
+                row.operator("object.remove_snapshot", text="", icon='X').snapshot_name = name
+            row = box.row(align=True)
+            row.operator("object.export_layout", icon='EXPORT')
+            row.operator("object.import_layout", icon='IMPORT')
+        
         # Random Object Size
         box = layout.box()
         row = box.row()
@@ -463,6 +3592,14 @@ class OBJECT_PT_random_duplicate_panel(bpy.types.Panel):
             row.operator("render.set_resolution", text="512x512").resolution = 512
             row.operator("render.set_resolution", text="1024x1024").resolution = 1024
             box.operator("render.fix_color", text="Fix Color")
+            row = box.row(align=True)
+            row.operator("render.mask_render_mode", text="Mask Mode (Workbench)").engine = 'WORKBENCH'
+            row.operator("render.mask_render_mode", text="Mask Mode (EEVEE)").engine = 'EEVEE'
+            box.operator("render.restore_render_settings", icon='LOOP_BACK')
+            row = box.row(align=True)
+            row.operator("render.hide_offscreen", icon='HIDE_ON')
+            row.operator("render.unhide_offscreen", icon='HIDE_OFF')
+            box.operator("render.export_mask_metadata", icon='EXPORT')
         
         # Set Material
         box = layout.box()
@@ -470,16 +3607,7 @@ class OBJECT_PT_random_duplicate_panel(bpy.types.Panel):
         row.prop(context.scene, "show_set_material", icon="TRIA_DOWN" if context.scene.show_set_material else "TRIA_RIGHT", icon_only=True, emboss=False)
         row.label(text="Set Material")
         if context.scene.show_set_material:
-            colors = [
-                ("Red", (1.0, 0.0, 0.0, 1.0)),
-                ("Green", (0.0, 1.0, 0.0, 1.0)),
-                ("Blue", (0.0, 0.0, 1.0, 1.0)),
-                ("Cyan", (0.0, 1.0, 1.0, 1.0)),
-                ("Magenta", (1.0, 0.0, 1.0, 1.0)),
-                ("Yellow", (1.0, 1.0, 0.0, 1.0)),
-                ("Black", (0.0, 0.0, 0.0, 1.0)),
-                ("White", (1.0, 1.0, 1.0, 1.0))
-            ]
+            colors = MASK_COLORS
             
             col = box.column(align=True)
             for i in range(0, len(colors), 3):
@@ -491,7 +3619,31 @@ class OBJECT_PT_random_duplicate_panel(bpy.types.Panel):
                         op.color = color_value
                         op.color_name = color_name
             
+            row = box.row(align=True)
+            row.prop(props, "color_mode", text="")
+            sub = row.row(align=True)
+            sub.enabled = props.color_mode == 'OBJECT'
+            sub.prop(props, "color_keyframe", text="", icon='KEY_HLT')
+            row = box.row(align=True)
+            row.prop(props, "color_assignment", text="")
+            row.prop(props, "color_seed", text="Seed")
+            sub = row.row(align=True)
+            sub.enabled = props.color_assignment != 'RANDOM'
+            sub.prop(props, "color_use_camera", text="", icon='CAMERA_DATA')
             box.operator("object.add_random_material_with_emission", text="Random Color", icon='COLOR')
+            box.operator("object.purge_duplicate_materials", icon='TRASH')
+            box.operator("object.dedupe_meshes", icon='MESH_DATA')
+            
+            row = box.row()
+            row.prop(context.scene, "show_color_counts", icon="TRIA_DOWN" if context.scene.show_color_counts else "TRIA_RIGHT", icon_only=True, emboss=False)
+            row.label(text="Objects per Color")
+            if context.scene.show_color_counts:
+                col = box.column(align=True)
+                counts = _color_index.palette_counts if _color_index.valid else None
+                for index, (color_name, color_value) in enumerate(colors):
+                    row = col.row()
+                    row.label(text=color_name)
+                    row.label(text=str(counts[index]) if counts is not None else "-")
         
         # Keyframe Management
         box = layout.box()
@@ -502,6 +3654,31 @@ class OBJECT_PT_random_duplicate_panel(bpy.types.Panel):
             row = box.row(align=True)
             row.operator("anim.remove_past_keyframes", text="Remove Past")
             row.operator("anim.remove_future_keyframes", text="Remove Future")
+            row = box.row(align=True)
+            row.operator("anim.keyframe_handoff", text="Handoff")
+            row.operator("anim.bake_random_motion", text="Bake Motion")
+        
+        # Operator Timing
+        box = layout.box()
+        row = box.row()
+        row.prop(context.scene, "show_timing", icon="TRIA_DOWN" if context.scene.show_timing else "TRIA_RIGHT", icon_only=True, emboss=False)
+        row.label(text="Operator Timing")
+        if context.scene.show_timing:
+            window_manager = context.window_manager
+            row = box.row(align=True)
+            row.prop(window_manager, "mask_timing")
+            sub = row.row(align=True)
+            sub.enabled = window_manager.mask_timing
+            sub.prop(window_manager, "mask_timing_profile")
+            col = box.column(align=True)
+            for entry in reversed(list(_timing_history)[-10:]):
+                row = col.row()
+                row.label(text=entry["label"])
+                row.label(text=f"{entry['seconds'] * 1000.0:.1f} ms")
+                row.label(text=f"{entry['objects_touched']} obj")
+            row = box.row(align=True)
+            row.operator("wm.export_operator_timings", icon='EXPORT')
+            row.operator("wm.clear_operator_timings", icon='X')
 
 class RandomDuplicateProperties(bpy.types.PropertyGroup):
     num_duplicates: bpy.props.IntProperty(
@@ -538,6 +3715,100 @@ class RandomDuplicateProperties(bpy.types.PropertyGroup):
         name="Group Name",
         default="RandomDuplicates"
     )
+    duplicate_mode: bpy.props.EnumProperty(
+        name="Mode",
+        items=[
+            ('COPY', "Full Copy", "Give every duplicate its own copy of the mesh"),
+            ('LINKED', "Linked Data", "Share one mesh between all duplicates"),
+        ],
+        default='COPY'
+    )
+    split_mode: bpy.props.EnumProperty(
+        name="Split Mode",
+        items=[
+            ('OBJECTS', "Objects", "Make one object per face"),
+            ('ISLANDS', "Face Islands", "Keep one mesh and drive every face through island attributes and Geometry Nodes"),
+        ],
+        default='OBJECTS'
+    )
+    placement_mode: bpy.props.EnumProperty(
+        name="Placement",
+        items=[
+            ('UNIFORM', "Uniform", "Independent random positions, objects may overlap"),
+            ('POISSON', "No Overlap", "Poisson-disk placement keeping the objects' bounds apart; Random Resize caps scales to match"),
+        ],
+        default='UNIFORM'
+    )
+    placement_seed: bpy.props.IntProperty(
+        name="Seed",
+        description="Seed for Random Duplicate, Randomize Location and Random Resize. 0 gives a new layout every time",
+        default=0,
+        min=0
+    )
+    placement_margin: bpy.props.FloatProperty(
+        name="Margin",
+        description="Extra gap kept between object bounds in No Overlap placement",
+        default=0.0,
+        min=0.0,
+        subtype='DISTANCE'
+    )
+    color_mode: bpy.props.EnumProperty(
+        name="Color Mode",
+        items=[
+            ('MATERIAL', "Material per Color", "Assign one shared emission material per palette color"),
+            ('OBJECT', "Object Color", "Use one shared emission material that reads each object's animatable Object Color"),
+        ],
+        default='MATERIAL'
+    )
+    color_keyframe: bpy.props.BoolProperty(
+        name="Keyframe Color",
+        description="In Object Color mode, keyframe the new color on the current frame",
+        default=False
+    )
+    color_assignment: bpy.props.EnumProperty(
+        name="Assignment",
+        items=[
+            ('RANDOM', "Random", "Pick every object's color independently"),
+            ('GREEDY', "Greedy", "Avoid the colors of touching objects, visiting objects in random order"),
+            ('DSATUR', "DSATUR", "Avoid the colors of touching objects, most constrained objects first. Slower, fewer clashes"),
+        ],
+        default='RANDOM'
+    )
+    color_seed: bpy.props.IntProperty(
+        name="Color Seed",
+        description="Seed for Random Color. 0 gives new colors every time",
+        default=0,
+        min=0
+    )
+    color_use_camera: bpy.props.BoolProperty(
+        name="Camera Overlap",
+        description="Also treat objects whose bounds overlap in the scene camera's view on the current frame as touching",
+        default=False
+    )
+    snapshot_name: bpy.props.StringProperty(
+        name="Snapshot Name",
+        default="start"
+    )
+    snapshot_scope: bpy.props.EnumProperty(
+        name="Snapshot Scope",
+        items=[
+            ('SELECTED', "Selected", "Capture the selected objects"),
+            ('COLLECTION', "Group", "Capture every object in the group collection"),
+        ],
+        default='SELECTED'
+    )
+    snapshot_blend: bpy.props.FloatProperty(
+        name="Blend",
+        description="How far to move towards the snapshot when restoring",
+        default=1.0,
+        min=0.0,
+        max=1.0
+    )
+    snapshot_keyframe: bpy.props.BoolProperty(
+        name="Keyframe",
+        description="Insert location, rotation and scale keyframes on the current frame when restoring",
+        default=False
+    )
     use_x_range: bpy.props.BoolProperty(
         name="Use X Range",
         default=True
@@ -558,22 +3829,42 @@ class RandomDuplicateProperties(bpy.types.PropertyGroup):
     show_set_material: bpy.props.BoolProperty(default=True)
     show_keyframe_management: bpy.props.BoolProperty(default=True)
     show_utils: bpy.props.BoolProperty(default=True)  
+    show_snapshots: bpy.props.BoolProperty(default=True)
+    show_color_counts: bpy.props.BoolProperty(default=False)
+    show_timing: bpy.props.BoolProperty(default=False)
 
 classes = (
     OBJECT_OT_random_duplicate,
+    OBJECT_OT_reroll_duplicates,
     OBJECT_OT_randomize_location,
     OBJECT_OT_split_faces, 
     OBJECT_OT_add_material_with_emission,
     OBJECT_OT_add_random_material_with_emission,
+    OBJECT_OT_purge_duplicate_materials,
+    OBJECT_OT_dedupe_meshes,
     OBJECT_OT_move_to_origin,
     OBJECT_OT_set_origin,
+    OBJECT_OT_capture_snapshot,
+    OBJECT_OT_restore_snapshot,
+    OBJECT_OT_remove_snapshot,
+    OBJECT_OT_export_layout,
+    OBJECT_OT_import_layout,
     RENDER_OT_set_resolution,
     RENDER_OT_fix_color,
+    RENDER_OT_mask_render_mode,
+    RENDER_OT_restore_render_settings,
+    RENDER_OT_hide_offscreen,
+    RENDER_OT_unhide_offscreen,
+    RENDER_OT_export_mask_metadata,
     ANIM_OT_remove_past_keyframes,
     ANIM_OT_remove_future_keyframes,
+    ANIM_OT_keyframe_handoff,
+    ANIM_OT_bake_random_motion,
     OBJECT_OT_random_resize,
     OBJECT_OT_select_all_in_groups,
     OUTLINER_OT_select_group_objects,
+    WM_OT_export_operator_timings,
+    WM_OT_clear_operator_timings,
     OBJECT_PT_random_duplicate_panel,
     RandomDuplicateProperties
 )
@@ -588,13 +3879,38 @@ def register():
     bpy.types.Scene.show_set_material = bpy.props.BoolProperty(default=True)
     bpy.types.Scene.show_keyframe_management = bpy.props.BoolProperty(default=True)
     bpy.types.Scene.show_utils = bpy.props.BoolProperty(default=True)
+    bpy.types.Scene.show_snapshots = bpy.props.BoolProperty(default=True)
+    bpy.types.Scene.show_color_counts = bpy.props.BoolProperty(default=False, update=update_show_color_counts)
+    bpy.types.Scene.show_timing = bpy.props.BoolProperty(default=False)
+    bpy.types.WindowManager.mask_timing = bpy.props.BoolProperty(
+        name="Time Operators",
+        description="Record wall time, objects touched, datablocks created and depsgraph updates of every add-on operator",
+        default=False,
+        update=update_operator_timing
+    )
+    bpy.types.WindowManager.mask_timing_profile = bpy.props.BoolProperty(
+        name="cProfile",
+        description="Also capture a cProfile of every timed operator (slows them down)",
+        default=False
+    )
     bpy.types.Scene.select_all_in_groups = bpy.props.BoolProperty(
         name="Select All In Groups",
         description="When enabled, clicking on a group in the outliner selects all objects in that group",
         default=False
     )
-    bpy.types.OUTLINER_HT_header.append(select_group_objects)
     bpy.types.OUTLINER_MT_collection.append(draw_outliner_group_menu)
+    subscribe_active_object()
+    bpy.app.handlers.load_post.append(resubscribe_active_object)
+    bpy.app.handlers.load_post.append(sync_operator_timing)
+    bpy.app.handlers.depsgraph_update_post.append(update_collection_index)
+    bpy.app.handlers.load_post.append(invalidate_collection_index)
+    bpy.app.handlers.undo_post.append(invalidate_collection_index)
+    bpy.app.handlers.redo_post.append(invalidate_collection_index)
+    bpy.app.handlers.depsgraph_update_post.append(update_color_index)
+    bpy.app.handlers.load_post.append(invalidate_color_index)
+    bpy.app.handlers.undo_post.append(invalidate_color_index)
+    bpy.app.handlers.redo_post.append(invalidate_color_index)
+    bpy.app.handlers.frame_change_post.append(refresh_animated_colors)
 
 def unregister():
     for cls in reversed(classes):
@@ -606,9 +3922,28 @@ def unregister():
     del bpy.types.Scene.show_set_material
     del bpy.types.Scene.show_keyframe_management
     del bpy.types.Scene.show_utils
+    del bpy.types.Scene.show_snapshots
+    del bpy.types.Scene.show_color_counts
+    del bpy.types.Scene.show_timing
+    disable_operator_timing()
+    del bpy.types.WindowManager.mask_timing
+    del bpy.types.WindowManager.mask_timing_profile
     del bpy.types.Scene.select_all_in_groups
-    bpy.types.OUTLINER_HT_header.remove(select_group_objects)
     bpy.types.OUTLINER_MT_collection.remove(draw_outliner_group_menu)
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    bpy.app.handlers.load_post.remove(resubscribe_active_object)
+    bpy.app.handlers.load_post.remove(sync_operator_timing)
+    bpy.app.handlers.depsgraph_update_post.remove(update_collection_index)
+    bpy.app.handlers.load_post.remove(invalidate_collection_index)
+    bpy.app.handlers.undo_post.remove(invalidate_collection_index)
+    bpy.app.handlers.redo_post.remove(invalidate_collection_index)
+    bpy.app.handlers.depsgraph_update_post.remove(update_color_index)
+    bpy.app.handlers.load_post.remove(invalidate_color_index)
+    bpy.app.handlers.undo_post.remove(invalidate_color_index)
+    bpy.app.handlers.redo_post.remove(invalidate_color_index)
+    bpy.app.handlers.frame_change_post.remove(refresh_animated_colors)
+    _color_index.invalidate()
+    _collection_index.invalidate()
 
 if __name__ == "__main__":
     register()
@@ -0,0 +1,268 @@
+"""Render a mask sequence with several background Blender processes in parallel.
+
+    python render_masks.py scene.blend --output //masks/mask_#### --jobs 4
+
+The frame range (the scene's own range unless --start/--end are given) is cut
+into chunks and every chunk is rendered by its own background Blender:
+
+    blender -b scene.blend -t THREADS -P render_masks.py -- --worker --frames 1-10 --output ...
+
+Workers switch the scene to the add-on's Mask Render Mode before rendering.
+Frames whose output file already exists are skipped, so an interrupted run can
+simply be started again. Failed chunks are retried and the output of every
+worker is merged into one progress log. With --split-masks the finished frames
+are run through mask_splitter.py afterwards.
+
+--worker-command replaces the Blender command line, which lets the launcher be
+exercised with any stand-in program, e.g.
+
+    python render_masks.py scene.blend --output out/mask_#### --start 1 --end 20 \\
+        --worker-command "python fake_worker.py --frames {frames} --output {output}"
+"""
+import argparse
+import concurrent.futures
+import os
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+
+DEFAULT_WORKER_COMMAND = (
+    "{blender} -b {blend} -t {threads} -P {script} -- "
+    "--worker --frames {frames} --output {output} --engine {engine}"
+)
+FRAME_DONE_MARKER = "MASK_FRAME_DONE"
+FRAME_RANGE_MARKER = "MASK_FRAME_RANGE"
+
+
+def format_frames(frames):
+    """Compact a sorted frame list into a range string: [1, 2, 3, 7] -> "1-3,7"."""
+    parts = []
+    frames = sorted(frames)
+    index = 0
+    while index < len(frames):
+        start = end = frames[index]
+        while index + 1 < len(frames) and frames[index + 1] == end + 1:
+            index += 1
+            end = frames[index]
+        parts.append(str(start) if start == end else f"{start}-{end}")
+        index += 1
+    return ",".join(parts)
+
+
+def parse_frames(text):
+    frames = []
+    for part in text.split(","):
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        frames.extend(range(int(start), int(end or start) + 1))
+    return frames
+
+
+def resolve_output(pattern, blend):
+    """Make a Blender output pattern absolute and make sure it has a frame placeholder."""
+    if pattern.startswith("//"):
+        pattern = os.path.join(os.path.dirname(os.path.abspath(blend)), pattern[2:])
+    if "#" not in os.path.basename(pattern):
+        pattern += "####"
+    return pattern
+
+
+def frame_path(pattern, frame, extension=".png"):
+    """Path Blender writes a frame to: the last run of '#' becomes the zero padded frame number."""
+    runs = list(re.finditer(r"#+", pattern))
+    run = runs[-1]
+    path = pattern[:run.start()] + str(frame).zfill(len(run.group())) + pattern[run.end():]
+    if extension and not path.lower().endswith(extension):
+        path += extension
+    return path
+
+
+def pending_frames(frames, pattern):
+    return [frame for frame in frames if not os.path.exists(frame_path(pattern, frame))]
+
+
+def chunk_frames(frames, chunk_size):
+    return [frames[i:i + chunk_size] for i in range(0, len(frames), chunk_size)]
+
+
+def build_command(template, **fields):
+    # Split first so paths containing spaces stay single arguments
+    return [token.format(**fields) for token in shlex.split(template)]
+
+
+class ProgressLog:
+    """Thread-safe merged log of every worker's output plus a frame counter."""
+
+    def __init__(self, path, total):
+        self.path = path
+        self.total = total
+        self.done = 0
+        self.lock = threading.Lock()
+        self.file = open(path, "a", encoding="utf-8") if path else None
+
+    def write(self, chunk_id, line):
+        with self.lock:
+            if line.startswith(FRAME_DONE_MARKER):
+                self.done += 1
+                status = f"[{self.done}/{self.total}] frame {line.split()[1]} done (chunk {chunk_id})"
+                print(status, flush=True)
+            if self.file:
+                self.file.write(f"{time.strftime('%H:%M:%S')} chunk {chunk_id} | {line}\n")
+                self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+
+def run_chunk(chunk_id, frames, args, pattern, log):
+    """Render one chunk, retrying the frames still missing after a failure. Returns the missing frames."""
+    remaining = frames
+    for attempt in range(args.retries + 1):
+        command = build_command(
+            args.worker_command,
+            blender=args.blender,
+            blend=os.path.abspath(args.blend),
+            threads=args.threads,
+            script=os.path.abspath(__file__),
+            frames=format_frames(remaining),
+            output=pattern,
+            engine=args.engine,
+        )
+        if attempt:
+            log.write(chunk_id, f"retry {attempt}/{args.retries} for frames {format_frames(remaining)}")
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, errors="replace")
+        for line in process.stdout:
+            log.write(chunk_id, line.rstrip())
+        returncode = process.wait()
+        remaining = pending_frames(remaining, pattern)
+        if not remaining:
+            return []
+        log.write(chunk_id, f"exit code {returncode}, {len(remaining)} frame(s) missing")
+    return remaining
+
+
+def query_frame_range(args):
+    command = build_command(args.worker_command, blender=args.blender, blend=os.path.abspath(args.blend), threads=1,
+                            script=os.path.abspath(__file__), frames="", output="", engine=args.engine)
+    command.append("--print-range")
+    output = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True).stdout
+    match = re.search(FRAME_RANGE_MARKER + r" (-?\d+) (-?\d+)", output)
+    if match is None:
+        raise SystemExit("Could not read the frame range from the .blend file, pass --start and --end")
+    return int(match.group(1)), int(match.group(2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a mask sequence with parallel background Blender processes")
+    parser.add_argument("blend", help=".blend file to render")
+    parser.add_argument("--output", required=True, help="output pattern, '#' marks the frame number (// is relative to the .blend)")
+    parser.add_argument("--start", type=int, help="first frame (default: the scene's frame_start)")
+    parser.add_argument("--end", type=int, help="last frame (default: the scene's frame_end)")
+    parser.add_argument("--threads", type=int, default=2, help="render threads per Blender process")
+    parser.add_argument("--jobs", type=int, help="Blender processes to run at once (default: cores / threads)")
+    parser.add_argument("--chunk-size", type=int, default=10, help="frames per worker invocation")
+    parser.add_argument("--retries", type=int, default=2, help="retries for a failed chunk")
+    parser.add_argument("--engine", choices=("WORKBENCH", "EEVEE", "NONE"), default="WORKBENCH",
+                        help="Mask Render Mode engine, NONE keeps the file's render settings")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    parser.add_argument("--worker-command", default=DEFAULT_WORKER_COMMAND,
+                        help="worker command template with {blender} {blend} {threads} {script} {frames} {output} {engine}")
+    parser.add_argument("--log", help="merged progress log (default: render_masks.log next to the output)")
+    parser.add_argument("--split-masks", metavar="DIR", help="split the rendered frames into per-color masks in DIR")
+    parser.add_argument("--split-format", choices=("png", "npz"), default="png", help="format of the split masks")
+    args = parser.parse_args(argv)
+
+    pattern = resolve_output(args.output, args.blend)
+    os.makedirs(os.path.dirname(pattern) or ".", exist_ok=True)
+    start, end = args.start, args.end
+    if start is None or end is None:
+        scene_start, scene_end = query_frame_range(args)
+        start = scene_start if start is None else start
+        end = scene_end if end is None else end
+
+    all_frames = list(range(start, end + 1))
+    frames = pending_frames(all_frames, pattern)
+    skipped = len(all_frames) - len(frames)
+    if skipped:
+        print(f"Skipping {skipped} frame(s) that already exist")
+    if not frames:
+        print("Nothing to render")
+        return split_masks(args, pattern, all_frames)
+
+    jobs = args.jobs or max(1, (os.cpu_count() or 1) // max(1, args.threads))
+    chunks = chunk_frames(frames, max(1, args.chunk_size))
+    log = ProgressLog(args.log or os.path.join(os.path.dirname(pattern) or ".", "render_masks.log"), len(frames))
+    print(f"Rendering {len(frames)} frame(s) in {len(chunks)} chunk(s) with {jobs} worker(s)")
+
+    failed = []
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(run_chunk, chunk_id, chunk, args, pattern, log)
+                       for chunk_id, chunk in enumerate(chunks, 1)]
+            for future in concurrent.futures.as_completed(futures):
+                failed.extend(future.result())
+    finally:
+        log.close()
+
+    if failed:
+        print(f"{len(failed)} frame(s) failed: {format_frames(failed)}", file=sys.stderr)
+        return 1
+    print("All frames rendered")
+    return split_masks(args, pattern, all_frames)
+
+
+def split_masks(args, pattern, frames):
+    if not args.split_masks:
+        return 0
+    import mask_splitter
+
+    paths = (frame_path(pattern, frame) for frame in frames)
+    count = sum(1 for _ in mask_splitter.split_sequence(paths, args.split_masks, args.split_format, args.jobs))
+    print(f"Split {count} frame(s) into masks in {args.split_masks}")
+    return 0
+
+
+def worker_main(argv):
+    """Runs inside background Blender: apply Mask Render Mode and render the requested frames."""
+    import bpy
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--worker", action="store_true")
+    parser.add_argument("--print-range", action="store_true")
+    parser.add_argument("--frames", default="")
+    parser.add_argument("--output", default="")
+    parser.add_argument("--engine", default="WORKBENCH")
+    args = parser.parse_args(argv)
+
+    scene = bpy.context.scene
+    if args.print_range:
+        print(f"{FRAME_RANGE_MARKER} {scene.frame_start} {scene.frame_end}", flush=True)
+        return
+
+    if args.engine != "NONE":
+        if not hasattr(bpy.types, "RENDER_OT_mask_render_mode"):
+            # Add-on not enabled in this Blender, load it from next to this script
+            sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+            import random_object_duplicate_plus
+            random_object_duplicate_plus.register()
+        bpy.ops.render.mask_render_mode(engine=args.engine)
+
+    scene.render.filepath = args.output
+    scene.render.use_file_extension = True
+    for frame in parse_frames(args.frames):
+        scene.frame_set(frame)
+        bpy.ops.render.render(write_still=True)
+        print(f"{FRAME_DONE_MARKER} {frame}", flush=True)
+
+
+if __name__ == "__main__":
+    if "--" in sys.argv and "--worker" in sys.argv[sys.argv.index("--") + 1:]:
+        worker_main(sys.argv[sys.argv.index("--") + 1:])
+    else:
+        sys.exit(main())
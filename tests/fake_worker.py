@@ -0,0 +1,52 @@
+"""Stand-in for the background Blender worker of render_masks.py.
+
+Writes a small file per frame to the same path Blender would and prints the
+same progress markers, so the launcher's retry, resume and log merging can be
+tested without Blender:
+
+    python fake_worker.py --frames 1-5 --output out/mask_#### [--fail-once FLAG] [--fail-always]
+
+--fail-once exits with an error after the first frame of the first invocation
+(the one that creates FLAG); later invocations render normally.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import render_masks  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", default="")
+    parser.add_argument("--output", default="")
+    parser.add_argument("--print-range", action="store_true")
+    parser.add_argument("--range", default="1-10", help="frame range reported by --print-range")
+    parser.add_argument("--fail-once", metavar="FLAG", help="fail after one frame unless FLAG exists, then create it")
+    parser.add_argument("--fail-always", action="store_true", help="fail after one frame every time")
+    args = parser.parse_args(argv)
+
+    if args.print_range:
+        start, _, end = args.range.partition("-")
+        print(f"{render_masks.FRAME_RANGE_MARKER} {start} {end}", flush=True)
+        return 0
+
+    fail = args.fail_always
+    if args.fail_once and not os.path.exists(args.fail_once):
+        open(args.fail_once, "w").close()
+        fail = True
+
+    for index, frame in enumerate(render_masks.parse_frames(args.frames)):
+        if fail and index == 1:
+            print(f"fake render crashed at frame {frame}", flush=True)
+            return 1
+        print(f"rendering frame {frame}", flush=True)
+        with open(render_masks.frame_path(args.output, frame), "w") as file:
+            file.write(f"frame {frame}\n")
+        print(f"{render_masks.FRAME_DONE_MARKER} {frame}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
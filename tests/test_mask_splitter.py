@@ -0,0 +1,157 @@
+"""Tests for mask_splitter.py: palette matching, mask files and the streaming pool.
+
+    python -m pytest tests
+"""
+import concurrent.futures
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import mask_splitter  # noqa: E402
+
+PALETTE_NAMES = [name for name, _ in mask_splitter.PALETTE]
+RED = PALETTE_NAMES.index("Red")
+BLACK = PALETTE_NAMES.index("Black")
+
+
+def compare_colors(color1, color2, tolerance=mask_splitter.COLOR_TOLERANCE):
+    # Same test as the add-on's compare_colors
+    return all(abs(c1 - c2) < tolerance for c1, c2 in zip(color1[:3], color2[:3]))
+
+
+def reference_labels(pixels):
+    labels = np.full(pixels.shape[:2], mask_splitter.UNMATCHED, dtype=np.uint8)
+    for y, x in np.ndindex(*pixels.shape[:2]):
+        for index, (_, color) in enumerate(mask_splitter.PALETTE):
+            if compare_colors(pixels[y, x], color):
+                labels[y, x] = index
+    return labels
+
+
+def test_uint8_matches_float_tolerance_for_every_value():
+    # Every 8-bit value on each channel, with the other two channels on 0 and on 255
+    values = np.arange(256, dtype=np.uint8)
+    rows = []
+    for channel in range(3):
+        for other in (0, 255):
+            row = np.full((256, 3), other, dtype=np.uint8)
+            row[:, channel] = values
+            rows.append(row)
+    pixels = np.stack(rows)
+    expected = reference_labels(pixels.astype(np.float64) / 255.0)
+    np.testing.assert_array_equal(mask_splitter.classify(pixels), expected)
+
+
+def test_uint8_tolerance_edges():
+    # 0.01 * 255 = 2.55: two steps off a palette value still match, three don't
+    pixels = np.array([[[253, 2, 2], [252, 0, 0], [255, 3, 0], [2, 2, 2], [3, 0, 0]]], dtype=np.uint8)
+    labels = mask_splitter.classify(pixels)
+    assert labels.tolist() == [[RED, mask_splitter.UNMATCHED, mask_splitter.UNMATCHED, BLACK,
+                                mask_splitter.UNMATCHED]]
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_float_tolerance_edges(dtype):
+    inside, outside = 0.0099, 0.0101
+    pixels = np.array([[[1.0 - inside, inside, 0.0], [1.0 - outside, 0.0, 0.0],
+                        [inside, inside, inside], [0.0, outside, 0.0]]], dtype=dtype)
+    labels = mask_splitter.classify(pixels)
+    assert labels.tolist() == [[RED, mask_splitter.UNMATCHED, BLACK, mask_splitter.UNMATCHED]]
+
+
+def test_alpha_channel_is_ignored():
+    pixels = np.array([[[255, 0, 0, 0], [0, 0, 0, 255]]], dtype=np.uint8)
+    assert mask_splitter.classify(pixels).tolist() == [[RED, BLACK]]
+
+
+@pytest.fixture
+def frame(tmp_path):
+    """A 5 x 13 frame with every palette color, a near miss and a non-palette color; returns (path, labels)."""
+    Image = pytest.importorskip("PIL.Image")
+    colors = np.array([[round(c * 255) for c in color] for _, color in mask_splitter.PALETTE] +
+                      [[250, 0, 0], [128, 64, 32]], dtype=np.uint8)
+    rng = np.random.default_rng(0)
+    pixels = colors[rng.integers(len(colors), size=(5, 13))]
+    path = str(tmp_path / "mask_0001.png")
+    Image.fromarray(pixels).save(path)
+    return path, reference_labels(pixels.astype(np.float64) / 255.0)
+
+
+def test_npz_round_trip(frame, tmp_path):
+    path, labels = frame
+    output = str(tmp_path / "npz")
+    os.makedirs(output)
+    _, coverage = mask_splitter.split_frame(path, output, "npz")
+    npz = os.path.join(output, "mask_0001.npz")
+    for index, name in enumerate(PALETTE_NAMES):
+        mask = mask_splitter.load_npz_mask(npz, name)
+        assert mask.shape == labels.shape
+        np.testing.assert_array_equal(mask, labels == index)
+        assert coverage[name] == np.count_nonzero(labels == index)
+
+
+def test_png_round_trip(frame, tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    path, labels = frame
+    output = str(tmp_path / "png")
+    for name in PALETTE_NAMES:
+        os.makedirs(os.path.join(output, name))
+    mask_splitter.split_frame(path, output, "png")
+    for index, name in enumerate(PALETTE_NAMES):
+        with Image.open(os.path.join(output, name, "mask_0001.png")) as image:
+            assert image.mode == "1"
+            mask = np.asarray(image.convert("L")) > 0
+        np.testing.assert_array_equal(mask, labels == index)
+
+
+class InlinePool:
+    """Stand-in for ProcessPoolExecutor that runs every frame as soon as it's submitted."""
+
+    def __init__(self, max_workers=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        future = concurrent.futures.Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def test_split_sequence_bounds_frames_in_flight(tmp_path, monkeypatch):
+    submitted = []
+    consumed = []
+    in_flight = []
+
+    def fake_split_frame(path, output_dir, fmt):
+        submitted.append(path)
+        in_flight.append(len(submitted) - len(consumed))
+        return path, {}
+
+    monkeypatch.setattr(mask_splitter, "split_frame", fake_split_frame)
+    monkeypatch.setattr(mask_splitter.concurrent.futures, "ProcessPoolExecutor", InlinePool)
+    paths = [f"mask_{frame:04d}.png" for frame in range(1, 21)]
+    for path, _ in mask_splitter.split_sequence(paths, str(tmp_path), "npz", workers=2, max_pending=3):
+        consumed.append(path)
+    assert sorted(consumed) == paths
+    assert max(in_flight) <= 3
+
+
+def test_split_sequence_skips_finished_frames(tmp_path, monkeypatch):
+    monkeypatch.setattr(mask_splitter, "split_frame", lambda path, output_dir, fmt: (path, {}))
+    monkeypatch.setattr(mask_splitter.concurrent.futures, "ProcessPoolExecutor", InlinePool)
+    (tmp_path / "mask_0002.npz").write_bytes(b"")
+    paths = ["mask_0001.png", "mask_0002.png", "mask_0003.png"]
+    done = [path for path, _ in mask_splitter.split_sequence(paths, str(tmp_path), "npz", workers=1)]
+    assert sorted(done) == ["mask_0001.png", "mask_0003.png"]
+    done = [path for path, _ in mask_splitter.split_sequence(paths, str(tmp_path), "npz", workers=1,
+                                                               overwrite=True)]
+    assert sorted(done) == paths
@@ -0,0 +1,103 @@
+"""Launcher tests for render_masks.py, driven by fake_worker.py instead of Blender.
+
+    python -m pytest tests
+"""
+import os
+import re
+import shlex
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import render_masks  # noqa: E402
+
+FAKE_WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_worker.py")
+
+
+def worker_command(*extra):
+    return " ".join([shlex.quote(sys.executable), shlex.quote(FAKE_WORKER),
+                     "--frames {frames} --output {output}", *map(shlex.quote, extra)])
+
+
+def run(tmp_path, *options, start=1, end=6, extra=()):
+    output = str(tmp_path / "out" / "mask_####")
+    log = tmp_path / "render.log"
+    argv = [str(tmp_path / "scene.blend"), "--output", output, "--start", str(start), "--end", str(end),
+            "--log", str(log), "--worker-command", worker_command(*extra), *options]
+    return render_masks.main(argv), output, log
+
+
+def rendered(output, start, end):
+    return [frame for frame in range(start, end + 1) if os.path.exists(render_masks.frame_path(output, frame))]
+
+
+def done_frames(log):
+    return [int(frame) for frame in re.findall(render_masks.FRAME_DONE_MARKER + r" (\d+)", log.read_text())]
+
+
+def test_failed_chunk_is_retried(tmp_path):
+    flag = tmp_path / "failed_once"
+    code, output, log = run(tmp_path, "--jobs", "1", "--chunk-size", "3", "--retries", "1",
+                            extra=("--fail-once", str(flag)))
+    assert code == 0
+    assert flag.exists()
+    assert rendered(output, 1, 6) == [1, 2, 3, 4, 5, 6]
+    text = log.read_text()
+    assert "fake render crashed at frame 2" in text
+    assert "retry 1/1 for frames 2-3" in text
+    # The retry only renders what the crash left missing
+    assert sorted(done_frames(log)) == [1, 2, 3, 4, 5, 6]
+
+
+def test_chunk_fails_after_retries(tmp_path, capsys):
+    code, output, log = run(tmp_path, "--jobs", "1", "--chunk-size", "3", "--retries", "1",
+                            extra=("--fail-always",))
+    assert code == 1
+    assert rendered(output, 1, 6) == [1, 2, 4, 5]
+    assert "2 frame(s) failed: 3,6" in capsys.readouterr().err
+
+
+def test_resume_skips_finished_frames(tmp_path, capsys):
+    output = str(tmp_path / "out" / "mask_####")
+    os.makedirs(os.path.dirname(output))
+    for frame in (1, 2, 3):
+        with open(render_masks.frame_path(output, frame), "w") as file:
+            file.write("existing\n")
+
+    code, output, log = run(tmp_path, "--jobs", "2", "--chunk-size", "2")
+    assert code == 0
+    assert "Skipping 3 frame(s) that already exist" in capsys.readouterr().out
+    assert sorted(done_frames(log)) == [4, 5, 6]
+    with open(render_masks.frame_path(output, 1)) as file:
+        assert file.read() == "existing\n"
+
+    code, output, log = run(tmp_path)
+    assert code == 0
+    assert "Nothing to render" in capsys.readouterr().out
+
+
+def test_worker_output_is_merged_into_one_log(tmp_path, capsys):
+    code, output, log = run(tmp_path, "--jobs", "3", "--chunk-size", "2", end=6)
+    assert code == 0
+    lines = log.read_text().splitlines()
+    chunks = {}
+    for line in lines:
+        match = re.match(r"\d\d:\d\d:\d\d chunk (\d+) \| (.*)", line)
+        assert match is not None, line
+        chunks.setdefault(int(match.group(1)), []).append(match.group(2))
+    assert sorted(chunks) == [1, 2, 3]
+    for chunk_id, frames in ((1, [1, 2]), (2, [3, 4]), (3, [5, 6])):
+        expected = []
+        for frame in frames:
+            expected += [f"rendering frame {frame}", f"{render_masks.FRAME_DONE_MARKER} {frame}"]
+        assert chunks[chunk_id] == expected
+    progress = [line for line in capsys.readouterr().out.splitlines() if line.startswith("[")]
+    assert sorted(int(line[1:line.index("/")]) for line in progress) == [1, 2, 3, 4, 5, 6]
+    assert all(line.split("]")[0].endswith("/6") for line in progress)
+
+
+def test_frame_range_comes_from_the_worker(tmp_path):
+    output = str(tmp_path / "out" / "mask_####")
+    argv = [str(tmp_path / "scene.blend"), "--output", output, "--log", str(tmp_path / "render.log"),
+            "--worker-command", worker_command("--range", "3-5")]
+    assert render_masks.main(argv) == 0
+    assert rendered(output, 1, 6) == [3, 4, 5]